@@ -60,6 +60,8 @@ from .writer import *
 from .signal import *
 
 from .cerebro import *
+from .optsearch import *
+from .profiler import *
 from .timer import *
 from .flt import *
 
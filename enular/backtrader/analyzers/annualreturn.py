@@ -23,6 +23,11 @@ from __future__ import (absolute_import, division, print_function,
 
 from collections import OrderedDict
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the dates are converted one by one
+
 from backtrader.utils.py3 import range
 from backtrader import Analyzer
 
@@ -58,11 +63,16 @@ class AnnualReturn(Analyzer):
         self.rets = list()
         self.ret = OrderedDict()
 
+        years = self._years()
         for i in range(len(self.data) - 1, -1, -1):
-            dt = self.data.datetime.date(-i)
+            if years is None:
+                year = self.data.datetime.date(-i).year
+            else:
+                year = years[-1 - i]
+
             value_cur = self.strategy.stats.broker.value[-i]
 
-            if dt.year > cur_year:
+            if year > cur_year:
                 if cur_year >= 0:
                     annualret = (value_end / value_start) - 1.0
                     self.rets.append(annualret)
@@ -74,7 +84,7 @@ class AnnualReturn(Analyzer):
                     # No value set whatsoever, use the currently loaded value
                     value_start = value_cur
 
-                cur_year = dt.year
+                cur_year = year
 
             # No matter what, the last value is always the last loaded value
             value_end = value_cur
@@ -85,5 +95,19 @@ class AnnualReturn(Analyzer):
             self.rets.append(annualret)
             self.ret[cur_year] = annualret
 
+    def _years(self):
+        # the years of all bars from the cached datetime64 view of the line
+        dtline = self.data.datetime
+        if np is None or dtline._tz is not None or not len(self.data):
+            return None
+
+        dts = dtline.datetime64()
+        if dts is None:
+            return None
+
+        end = dtline.idx + 1
+        dts = dts[end - len(self.data):end]
+        return (dts.astype('datetime64[Y]').astype(np.int64) + 1970).tolist()
+
     def get_analysis(self):
         return self.ret
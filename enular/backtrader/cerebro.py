@@ -23,24 +23,40 @@ from __future__ import (absolute_import, division, print_function,
 
 import datetime
 import collections
+import functools
+import gc
 import itertools
+import math
 import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # datas with different datetimes are synchronized bar by bar
 
 import backtrader as bt
 from .utils.py3 import (map, range, zip, with_metaclass, string_types,
-                        integer_types)
+                        integer_types, queue)
 
 from . import linebuffer
 from . import indicator
+from .feed import AbstractDataBase
 from .brokers import BackBroker
 from .metabase import MetaParams
 from . import observers
 from .writer import WriterFile
 from .utils import OrderedDict, tzparse, num2date, date2num
+from .lineseries import LineSeriesStub
 from .strategy import Strategy, SignalStrategy
 from .tradingcal import (TradingCalendarBase, TradingCalendar,
                          PandasMarketCalendar)
 from .timer import Timer
+from .profiler import Profiler
 
 # Defined here to make it pickable. Ideally it could be defined inside Cerebro
 
@@ -52,6 +68,134 @@ class OptReturn(object):
             setattr(self, k, v)
 
 
+class OptSpill(object):
+    '''Holds the results of an optimization in a file instead of in memory
+    (see the ``optspill`` parameter of ``Cerebro``)
+
+    Results are appended as they are delivered and iterating reads them back
+    from the file one at a time
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, 'wb')
+        self._len = 0
+
+    def append(self, runstrat):
+        pickle.dump(runstrat, self._f, pickle.HIGHEST_PROTOCOL)
+        self._len += 1
+
+    def close(self):
+        self._f.close()
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        if not self._f.closed:
+            self._f.flush()
+
+        with open(self.path, 'rb') as f:
+            for i in range(self._len):
+                yield pickle.load(f)
+
+
+class OptRank(object):
+    '''Ranks the results of an optimization by a value of an analyzer (see
+    the ``optrank`` parameter of ``Cerebro``)
+
+    Params:
+
+      - ``ancls``: the analyzer class which will be added to the strategies
+
+      - ``key`` (default: ``None``): the value to take from
+        ``get_analysis``. Either a callable receiving the analysis or a
+        dotted path like ``max.drawdown``. If ``None`` the default of the
+        analyzer (see ``keys``) is used
+
+      - ``minimize`` (default: ``None``): lower values are better. If
+        ``None`` the default of the analyzer is used (else ``False``)
+
+      - ``kwargs``: passed to the analyzer
+
+    The score of a run is the value, negated if ``minimize`` is ``True``, so
+    that higher is always better. Runs without a value (like a
+    ``SharpeRatio`` of ``None``) are ranked last
+    '''
+    # analyzer class name -> (default key, minimize)
+    keys = {
+        'SharpeRatio': ('sharperatio', False),
+        'Returns': ('rnorm100', False),
+        'DrawDown': ('max.drawdown', True),
+        'SQN': ('sqn', False),
+        'VWR': ('vwr', False),
+    }
+
+    _name = 'optrank'  # name of the analyzer in the strategies
+
+    def __init__(self, ancls, key=None, minimize=None, **kwargs):
+        self.ancls = ancls
+        self.kwargs = kwargs
+
+        dkey, dminimize = None, False
+        for cls in ancls.__mro__:
+            if cls.__name__ in self.keys:
+                dkey, dminimize = self.keys[cls.__name__]
+                break
+
+        self.key = key if key is not None else dkey
+        if self.key is None:
+            raise ValueError('No key to rank analyzer %s' % ancls.__name__)
+
+        self.minimize = minimize if minimize is not None else dminimize
+
+    def addanalyzer(self, strat):
+        strat._addanalyzer(self.ancls, _name=self._name, **self.kwargs)
+
+    def score(self, strat):
+        analysis = strat.analyzers.getbyname(self._name).get_analysis()
+        if callable(self.key):
+            value = self.key(analysis)
+        else:
+            value = analysis
+            for k in self.key.split('.'):
+                value = value[k]
+
+        if value is None or value != value:  # nan
+            return float('-inf')
+
+        return -value if self.minimize else value
+
+
+# The cerebro of an optimization subprocess. It is received once, when the
+# process starts, and the tasks only carry the strategies to run
+_poolcerebro = None
+
+
+def _poolinit(cerebro):
+    global _poolcerebro
+    _poolcerebro = cerebro
+
+    # a forked process has the parent's datas: return the values by copy if
+    # they travel back with the results
+    for data in cerebro.datas:
+        for line in data.lines:
+            line.unshare()
+
+
+def _poolrun(iterstrat):
+    # the cerebro outlives the run: a runstop of a strategy only ends its run
+    _poolcerebro._event_stop = False
+    return _poolcerebro(iterstrat)
+
+
+def _poolrunchunk(chunk, optlimit=None):
+    # runs a chunk of (index, iterstrat) and reports how long it took
+    tstart = time.time()
+    _poolcerebro._optlimit = optlimit
+    results = [(idx, _poolrun(iterstrat)) for idx, iterstrat in chunk]
+    return time.time() - tstart, results
+
+
 class Cerebro(with_metaclass(MetaParams, object)):
     '''Params:
 
@@ -155,6 +299,34 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
             - ``runonce`` will be deactivated
 
+      - ``onceblock`` (default: ``0``)
+
+        If greater than ``0`` and the datas can be preloaded and the
+        indicators calculated in ``runonce`` mode, the datas are loaded and
+        the indicators calculated in blocks of this number of bars, before
+        the strategies see the bars of the block.
+
+        Only the values which can still be looked at are kept in memory: the
+        lines keep the largest minimum period of all indicators and
+        strategies (plus ``oncelookback``) values before the current bar.
+        The memory needed is therefore bound by the size of the block and
+        the lookback and not by the length of the datas.
+
+        Data feeds reading from files read the bars of the next block in the
+        background while the current block is calculated (see ``prefetch``
+        in the data feeds)
+
+        As with ``exactbars`` plotting is not possible. Strategies which are
+        calculated in vectorized form (see ``_oncedone``) run on a next basis
+
+      - ``oncelookback`` (default: ``0``)
+
+        Values kept in addition to the minimum periods when calculating in
+        blocks (``onceblock``), for strategies or indicators looking further
+        back than their minimum period, for example with
+        ``self.data.close.get(size=100)`` in a strategy with a minimum period
+        of ``30``
+
       - ``objcache`` (default: ``False``)
 
         Experimental option to implement a cache of lines objects and reduce
@@ -170,6 +342,67 @@ class Cerebro(with_metaclass(MetaParams, object)):
         Corner cases may happen in which this drives a line object off its
         minimum period and breaks things and it is therefore disabled.
 
+      - ``npbuffers`` (default: ``False``)
+
+        Store the values of unbounded lines in preallocated and growable
+        ``numpy.ndarray`` buffers instead of ``array.array`` instances. The
+        ``array`` attribute of each line is then a zero-copy ``ndarray`` view
+        which indicators can operate on directly. Buffers are sized at once
+        when the length is known (preloaded datas, indicators in ``runonce``
+        mode) and grow geometrically otherwise.
+
+        Requires ``numpy``. It has no effect on lines using memory saving
+        schemes (see ``exactbars``)
+
+      - ``indmemo`` (default: ``0``)
+
+        Number of calculated indicators and lines operations to keep in a
+        least recently used memo. Values calculated in ``runonce`` mode are
+        reused by any later object with the same class, params, arguments and
+        input values, also across the strategies run during an optimization
+        and across calls to ``run``. Each optimization subprocess keeps its
+        own memo.
+
+        Indicators must be a function of their inputs and params for the
+        reuse to be correct. Hit rates can be checked with ``getmemostats``.
+        ``0`` deactivates the memo
+
+      - ``prune`` (default: ``False``)
+
+        Remove before running the indicators and lines operations whose
+        output is read by no one. The consumers are the indicators and
+        observers added directly to the strategy (which are always kept) and
+        whatever the strategy holds in its attributes. Anything they hold or
+        take as input is kept, and so on.
+
+        If not running in ``runonce`` mode (and if ``exactbars`` is not
+        already saving memory), the lines of the kept indicators which are
+        only read by the indicator itself will only keep the values needed
+        for the calculation.
+
+        Indicators which are only reached by other means (for example
+        through ``getattr`` with a computed name) would be removed, which is
+        why this is off by default
+
+      - ``nextplan`` (default: ``True``)
+
+        When not running in ``runonce`` mode the indicators of a strategy
+        are calculated following a flat list of steps built once before the
+        run, instead of each indicator recursively calling the calculation
+        of its own indicators for each bar. Indicators added during the run
+        cause the list to be rebuilt
+
+        ``False`` restores the recursive calls
+
+      - ``profiler`` (default: ``None``)
+
+        A ``Profiler`` instance (or ``True`` for a default one) which records
+        the calls and the time of the indicators, observers, analyzers,
+        strategies, broker, data feeds, filters and writers during the run.
+        The results are in ``cerebro.profiler`` (see ``Profiler``)
+
+        Without a profiler nothing is instrumented
+
       - ``writer`` (default: ``False``)
 
         If set to ``True`` a default WriterFile will be created which will
@@ -191,6 +424,12 @@ class Cerebro(with_metaclass(MetaParams, object)):
         The tests show an approximate ``20%`` speed-up moving from a sample
         execution in ``83`` seconds to ``66``
 
+        The preloaded values are written once to a temporary file which the
+        subprocesses map in memory (read-only) instead of receiving a copy.
+        This requires ``numpy``; without it the values are pickled to each
+        subprocess as usual. The subprocesses receive ``cerebro`` only once
+        and afterwards just the strategies (and params) to run
+
       - ``optreturn`` (default: ``True``)
 
         If ``True`` the optimization results will not be full ``Strategy``
@@ -209,6 +448,71 @@ class Cerebro(with_metaclass(MetaParams, object)):
         with ``optdatas`` the total gain increases to a total speed-up of
         ``32%`` in an optimization run.
 
+      - ``optanalysis`` (default: ``None``)
+
+        If not ``None`` and ``optreturn`` is ``True`` the optimization
+        results carry the output of the analyzers instead of the analyzers
+        themselves. ``analysis`` is a dictionary with the result of
+        ``get_analysis`` keyed by analyzer name. ``True`` keeps all
+        analyzers; an iterable of names keeps only those.
+
+        This reduces what has to be sent back from the subprocesses and kept
+        in memory
+
+      - ``optchunk`` (default: ``0``)
+
+        Number of parameter combinations sent at once to an optimization
+        subprocess. With ``0`` the size adapts to make each chunk take
+        about ``Cerebro.optchunktime`` seconds, which balances the load and
+        keeps the communication overhead low for fast runs
+
+      - ``optspill`` (default: ``None``)
+
+        Path of a file to which the optimization results are written as soon
+        as they are delivered, instead of keeping them in memory. ``run``
+        returns then an ``OptSpill`` instance, which reads them back when
+        iterated. The results are stored in the order in which they finish
+
+      - ``optrank`` (default: ``None``)
+
+        Analyzer by which the optimization results are ranked. Either an
+        ``OptRank`` instance or an analyzer class with a known default value
+        (``SharpeRatio``, ``Returns``, ``DrawDown``, ``SQN``, ``VWR``). The
+        analyzer is added to the strategies with the name ``optrank`` and
+        each result carries the attribute ``optscore`` (higher is better)
+
+      - ``opthalving`` (default: ``0``)
+
+        If greater than ``1`` and ``optrank`` is set, the optimization uses
+        successive halving: all parameter combinations are run over the
+        first ``optfraction`` of the data, only the best ``1/opthalving``
+        are run again over ``opthalving`` times more data and so on until
+        the full data is reached. The returned results are those of the last
+        round, sorted by the ranking of the previous one. The callbacks
+        receive the results of all rounds, which carry the run fraction of
+        the data as ``optfraction``
+
+        A fraction is only applied if the data can be preloaded (the
+        length is then known) and ``oldsync`` is ``False``
+
+      - ``optfraction`` (default: ``0.2``)
+
+        Fraction of the data (the bars of ``data0``) run by the first round
+        of ``opthalving``
+
+      - ``optsearch`` (default: ``None``)
+
+        An ``OptSearch`` instance (like ``RandomSearch`` or ``TPESearch``)
+        which chooses the parameters to run instead of the grid of
+        ``optstrategy``, whose values define then the search space (see
+        ``OptSearch``). The runs are scored with ``optrank``, which must be
+        set. Only one ``optstrategy`` can be searched and ``opthalving`` is
+        not applied
+
+        The search stops after the ``budget`` of runs or the ``timeout`` of
+        the search object. The results are returned in the order in which
+        they were run
+
       - ``oldsync`` (default: ``False``)
 
         Starting with release 1.9.0.99 the synchronization of multiple datas
@@ -275,9 +579,23 @@ class Cerebro(with_metaclass(MetaParams, object)):
         ('oldtrades', False),
         ('lookahead', 0),
         ('exactbars', False),
+        ('onceblock', 0),
+        ('oncelookback', 0),
         ('optdatas', True),
         ('optreturn', True),
+        ('optanalysis', None),
+        ('optchunk', 0),
+        ('optspill', None),
+        ('optrank', None),
+        ('opthalving', 0),
+        ('optfraction', 0.2),
+        ('optsearch', None),
         ('objcache', False),
+        ('npbuffers', False),
+        ('indmemo', 0),
+        ('prune', False),
+        ('nextplan', True),
+        ('profiler', None),
         ('live', False),
         ('writer', False),
         ('tradehistory', False),
@@ -288,6 +606,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
         ('quicknotify', False),
     )
 
+    # target duration in seconds of adaptive optimization chunks (optchunk)
+    optchunktime = 0.5
+
     def __init__(self):
         self._dolive = False
         self._doreplay = False
@@ -298,6 +619,8 @@ class Cerebro(with_metaclass(MetaParams, object)):
         self.datasbyname = collections.OrderedDict()
         self.strats = list()
         self.optcbs = list()  # holds a list of callbacks for opt strategies
+        self._optlimit = None  # fraction of the data to run (opthalving)
+        self._optstrats = list()  # optstrategy calls (for optsearch)
         self.observers = list()
         self.analyzers = list()
         self.indicators = list()
@@ -320,6 +643,10 @@ class Cerebro(with_metaclass(MetaParams, object)):
         self._pretimers = list()
         self._ohistory = list()
         self._fhistory = None
+        self.profiler = None
+        self._event_stop = False  # the running backtest stops
+        self._event_cancel = False  # no more optimization runs are started
+        self._runthread = None  # thread of the running backtest
 
     @staticmethod
     def iterize(iterable):
@@ -848,6 +1175,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
         optimizations when each of the strategies has been run
 
         The signature: cb(strategy)
+
+        Calling ``runstop`` from a callback cancels the rest of the
+        optimization. Runs not yet delivered are discarded
         '''
         self.optcbs.append(cb)
 
@@ -883,8 +1213,13 @@ class Cerebro(with_metaclass(MetaParams, object)):
           - cerebro.optstrategy(MyStrategy, period=15)
 
         and will create an internal pseudo-iterable if possible
+
+        If the parameter ``optsearch`` is set, the values define the space of
+        the search instead of a grid (see ``OptSearch``) and ``args`` are
+        passed unchanged
         '''
         self._dooptimize = True
+        self._optstrats.append((len(self.strats), strategy, args, kwargs))
         args = self.iterize(args)
         optargs = itertools.product(*args)
 
@@ -1019,8 +1354,14 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
     def runstop(self):
         '''If invoked from inside a strategy or anywhere else, including other
-        threads the execution will stop as soon as possible.'''
+        threads the execution will stop as soon as possible.
+
+        During an optimization, a strategy only stops its own run. Invoked
+        from anywhere else (an optimization callback, another thread) no more
+        runs are started'''
         self._event_stop = True  # signal a stop has been requested
+        if self._runthread != threading.current_thread().ident:
+            self._event_cancel = True  # not from the running backtest
 
     def run(self, **kwargs):
         '''The core method to perform backtesting. Any ``kwargs`` passed to it
@@ -1038,6 +1379,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
             Strategy classes added with ``addstrategy``
         '''
         self._event_stop = False  # Stop is requested
+        self._event_cancel = False
 
         if not self.datas:
             return []  # nothing can be run
@@ -1054,6 +1396,11 @@ class Cerebro(with_metaclass(MetaParams, object)):
         linebuffer.LineActions.usecache(self.p.objcache)
         indicator.Indicator.usecache(self.p.objcache)
 
+        linebuffer.LineBuffer.usenumpy(self.p.npbuffers)
+        linebuffer.LineActions.usememo(self.p.indmemo)
+        self._memostats = collections.OrderedDict(
+            (k, 0) for k in ('hits', 'misses', 'evictions'))
+
         self._dorunonce = self.p.runonce
         self._dopreload = self.p.preload
         self._exactbars = int(self.p.exactbars)
@@ -1073,6 +1420,10 @@ class Cerebro(with_metaclass(MetaParams, object)):
             self._dorunonce = False
             self._dopreload = False
 
+        # datas loaded and indicators calculated in blocks
+        self._doblocks = bool(self.p.onceblock and self._dopreload and
+                              self._dorunonce and not self.p.oldsync)
+
         self.runwriters = list()
 
         # Add the system default writer if requested
@@ -1088,6 +1439,10 @@ class Cerebro(with_metaclass(MetaParams, object)):
         # Write down if any writer wants the full csv output
         self.writers_csv = any(map(lambda x: x.p.csv, self.runwriters))
 
+        self.profiler = self.p.profiler
+        if self.profiler is True:
+            self.profiler = Profiler()
+
         self.runstrats = list()
 
         if self.signals:  # allow processing of signals
@@ -1119,44 +1474,265 @@ class Cerebro(with_metaclass(MetaParams, object)):
         if not self.strats:  # Datas are present, add a strategy
             self.addstrategy(Strategy)
 
+        if self._dooptimize and self.p.optspill:
+            self.runstrats = OptSpill(self.p.optspill)
+
+        self._optlimit = None
         iterstrats = itertools.product(*self.strats)
         if not self._dooptimize or self.p.maxcpus == 1:
             # If no optimmization is wished ... or 1 core is to be used
             # let's skip process "spawning"
-            for iterstrat in iterstrats:
-                runstrat = self.runstrategies(iterstrat)
-                self.runstrats.append(runstrat)
-                if self._dooptimize:
-                    for cb in self.optcbs:
-                        cb(runstrat)  # callback receives finished strategy
+            self._runoptimize(None, iterstrats)
         else:
+            sharepath = None
             if self.p.optdatas and self._dopreload and self._dorunonce:
                 for data in self.datas:
                     data.reset()
                     if self._exactbars < 1:  # datas can be full length
                         data.extend(size=self.params.lookahead)
-                    data._start()
-                    if self._dopreload:
-                        data.preload()
+                    self._startdata(data, preload=True)
 
-            pool = multiprocessing.Pool(self.p.maxcpus or None)
-            for r in pool.imap(self, iterstrats):
-                self.runstrats.append(r)
-                for cb in self.optcbs:
-                    cb(r)  # callback receives finished strategy
+                sharepath = self._sharedatas()
 
-            pool.close()
+            pool = multiprocessing.Pool(self.p.maxcpus or None,
+                                        initializer=_poolinit,
+                                        initargs=(self,))
+            try:
+                self._runoptimize(pool, iterstrats)
+                pool.close()
+                pool.join()
+            finally:
+                pool.terminate()
+                if sharepath is not None:
+                    self._unsharedatas(sharepath)
 
             if self.p.optdatas and self._dopreload and self._dorunonce:
                 for data in self.datas:
                     data.stop()
 
+        if isinstance(self.runstrats, OptSpill):
+            self.runstrats.close()
+
         if not self._dooptimize:
             # avoid a list of list for regular cases
             return self.runstrats[0]
 
         return self.runstrats
 
+    def _runoptimize(self, pool, iterstrats):
+        if self._dooptimize and self.p.optsearch is not None:
+            self._runsearch(pool)
+        elif self._dooptimize and self.p.optrank and self.p.opthalving > 1:
+            self._runhalving(pool, iterstrats)
+        else:
+            self._runstrats(pool, iterstrats)
+
+    def _runstrats(self, pool, iterstrats):
+        # Runs the combinations in this process or with the pool
+        if pool is not None:
+            self._runpool(pool, iterstrats)
+            return
+
+        for iterstrat in iterstrats:
+            runstrat = self.runstrategies(iterstrat)
+            self._addrunstrat(runstrat)
+            if self._event_cancel:
+                break
+
+    def _runhalving(self, pool, iterstrats):
+        # Successive halving: each round runs the candidates over a longer
+        # prefix of the data and keeps the best 1/opthalving of them for the
+        # next one. The results of the last round (full data) are kept
+        eta = self.p.opthalving
+        fraction = self.p.optfraction
+        candidates = list(iterstrats)
+        runstrats = self.runstrats
+        while True:
+            final = fraction >= 1.0 or len(candidates) <= 1
+            self._optlimit = None if final else fraction
+            self.runstrats = runstrats if final else list()
+            self._runstrats(pool, candidates)
+            if final or self._event_cancel:
+                break
+
+            scores = [self._optscore(runstrat) for runstrat in self.runstrats]
+            ranked = sorted(range(len(scores)), key=lambda i: -scores[i])
+            keep = int(math.ceil(len(candidates) / eta))
+            candidates = [candidates[i] for i in ranked[:keep]]
+            fraction *= eta
+
+        self._optlimit = None
+        self.runstrats = runstrats
+
+    def _runsearch(self, pool):
+        # The search proposes parameter sets in batches, which are run like
+        # any other combination and whose scores are told back to it
+        search = self.p.optsearch
+        if not self.p.optrank:
+            raise ValueError('optsearch needs optrank to score the runs')
+        if len(self._optstrats) != 1:
+            raise ValueError('optsearch can only search one optstrategy')
+
+        optidx, stratcls, args, kwargs = self._optstrats[0]
+        strats = [None if i == optidx else list(x)[0]
+                  for i, x in enumerate(self.strats)]
+
+        search.start(kwargs)
+        nbatch = 1 if pool is None else (self.p.maxcpus or
+                                         multiprocessing.cpu_count())
+        if not search.sequential:
+            nbatch *= 4  # no need to wait for the scores
+
+        budget, timeout = search.p.budget, search.p.timeout
+        tstart = time.time()
+        runstrats = self.runstrats
+        runs = 0
+        while not self._event_cancel:
+            if timeout is not None and time.time() - tstart >= timeout:
+                break
+
+            batch = list()
+            while len(batch) < nbatch and (budget is None or
+                                           runs + len(batch) < budget):
+                params = search.ask()
+                if params is None:
+                    break  # exhausted
+                batch.append(params)
+
+            if not batch:
+                break
+
+            iterstrats = list()
+            for params in batch:
+                strats[optidx] = (stratcls, args, params)
+                iterstrats.append(tuple(strats))
+
+            self.runstrats = list()
+            self._runstrats(pool, iterstrats)
+            if not self._event_cancel:
+                for params, runstrat in zip(batch, self.runstrats):
+                    search.tell(params, self._optscore(runstrat))
+
+            runs += len(batch)
+            for runstrat in self.runstrats:
+                runstrats.append(runstrat)
+
+        self.runstrats = runstrats
+
+    @staticmethod
+    def _optscore(runstrat):
+        # the 1st strategy of a run ranks it
+        if not runstrat:
+            return float('-inf')  # all skipped
+
+        return getattr(runstrat[0], 'optscore', float('-inf'))
+
+    def _addrunstrat(self, runstrat):
+        self.runstrats.append(runstrat)
+        self._addmemostats(runstrat)
+        if self._dooptimize:
+            for cb in self.optcbs:
+                cb(runstrat)  # callback receives finished strategy
+
+    def _runpool(self, pool, iterstrats):
+        # Feeds the pool with chunks of combinations as results come back,
+        # keeping a bounded number of chunks in flight: the combinations are
+        # not generated upfront, the chunk size can adapt to the measured run
+        # time and no more work is sent after a stop request
+        nprocs = self.p.maxcpus or multiprocessing.cpu_count()
+        chunksize = self.p.optchunk or 1
+        done = queue.Queue()
+        inflight = 0
+        pending = enumerate(iterstrats)
+        order = list()  # submission index of each delivered result
+
+        while True:
+            while inflight < 2 * nprocs and not self._event_cancel:
+                chunk = list(itertools.islice(pending, chunksize))
+                if not chunk:
+                    break
+
+                pool.apply_async(_poolrunchunk, (chunk, self._optlimit),
+                                 callback=done.put, error_callback=done.put)
+                inflight += 1
+
+            if not inflight or self._event_cancel:
+                break
+
+            ret = done.get()
+            inflight -= 1
+            if isinstance(ret, BaseException):
+                raise ret
+
+            elapsed, results = ret
+            if not self.p.optchunk and elapsed > 0.0:
+                ideal = int(self.optchunktime * len(results) / elapsed)
+                chunksize = max(1, min(ideal, 2 * chunksize))
+
+            for idx, runstrat in results:
+                order.append(idx)
+                self._addrunstrat(runstrat)
+                if self._event_cancel:
+                    break
+
+        if not isinstance(self.runstrats, OptSpill):
+            # deliver in the order of the combinations like a plain map
+            runstrats = sorted(zip(order, self.runstrats), key=lambda x: x[0])
+            self.runstrats[:] = [runstrat for idx, runstrat in runstrats]
+
+    def _startdata(self, data, preload):
+        # starts (and preloads) a data feed, with the bars of its cache if
+        # they are there (see the cache parameter of the data feeds)
+        if preload and data._startcache():
+            return
+
+        data._start()
+        if preload:
+            data.preload()
+            data._savecache()
+
+    def _sharedatas(self):
+        # Writes the preloaded values to a file for the subprocesses to map
+        # them in memory. Returns the path or None if nothing is shared
+        if linebuffer.np is None:
+            return None
+
+        fd, path = tempfile.mkstemp(prefix='backtrader-', suffix='.lines')
+        with os.fdopen(fd, 'wb') as f:
+            for data in self.datas:
+                for line in data.lines:
+                    line.share(f, path)
+
+        return path
+
+    def _unsharedatas(self, path):
+        for data in self.datas:
+            for line in data.lines:
+                line.unshare()
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # may still be mapped (windows), the temp dir will clean up
+
+    def _addmemostats(self, runstrat):
+        # the memo stats of each run travel with its results, because the
+        # run may have taken place in a subprocess
+        if runstrat:
+            for k, v in getattr(runstrat[0], 'memostats', {}).items():
+                self._memostats[k] += v
+
+    def getmemostats(self):
+        '''
+        Returns the hits, misses and evictions of the memo of calculated
+        indicators (see the ``indmemo`` parameter) during the last call to
+        ``run`` and the resulting hit rate
+        '''
+        stats = collections.OrderedDict(getattr(self, '_memostats', {}))
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        stats['hitrate'] = stats.get('hits', 0) / lookups if lookups else 0.0
+        return stats
+
     def _init_stcount(self):
         self.stcount = itertools.count(0)
 
@@ -1169,7 +1745,18 @@ class Cerebro(with_metaclass(MetaParams, object)):
         '''
         self._init_stcount()
 
+        # a runstop of the last run is over, a cancel applies to this one too
+        self._event_stop = self._event_cancel
+        self._runthread = threading.current_thread().ident
+
+        memo0 = linebuffer.LineActions.memostats()
+
         self.runningstrats = runstrats = list()
+
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start(self)
+
         for store in self.stores:
             store.start()
 
@@ -1202,21 +1789,29 @@ class Cerebro(with_metaclass(MetaParams, object)):
         # self._plotfillers = [list() for d in self.datas]
         # self._plotfillers2 = [list() for d in self.datas]
 
+        # with the datas already preloaded there is nothing to bound
+        doblocks = self._doblocks and not predata
+
         if not predata:
             for data in self.datas:
                 data.reset()
                 if self._exactbars < 1:  # datas can be full length
                     data.extend(size=self.params.lookahead)
-                data._start()
-                if self._dopreload:
-                    data.preload()
+                self._startdata(data, self._dopreload and not doblocks)
 
         for stratcls, sargs, skwargs in iterstrat:
             sargs = self.datas + list(sargs)
+            # the creation of the indicators produces many objects and no
+            # garbage: the collector would only slow it down
+            gcenabled = gc.isenabled()
+            gc.disable()
             try:
                 strat = stratcls(*sargs, **skwargs)
             except bt.errors.StrategySkipError:
                 continue  # do not add strategy to the mix
+            finally:
+                if gcenabled:
+                    gc.enable()
 
             if self.p.oldsync:
                 strat._oldsync = True  # tell strategy to use old clock update
@@ -1230,6 +1825,10 @@ class Cerebro(with_metaclass(MetaParams, object)):
         else:
             tz = tzparse(tz)
 
+        optrank = self.p.optrank
+        if optrank is not None and not isinstance(optrank, OptRank):
+            optrank = OptRank(optrank)
+
         if runstrats:
             # loop separated for clarity
             defaultsizer = self.sizers.get(None, (None, None, None))
@@ -1256,6 +1855,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 for ancls, anargs, ankwargs in self.analyzers:
                     strat._addanalyzer(ancls, *anargs, **ankwargs)
 
+                if optrank is not None:
+                    optrank.addanalyzer(strat)
+
                 sizer, sargs, skwargs = self.sizers.get(idx, defaultsizer)
                 if sizer is not None:
                     strat._addsizer(sizer, *sargs, **skwargs)
@@ -1267,10 +1869,22 @@ class Cerebro(with_metaclass(MetaParams, object)):
                     if writer.p.csv:
                         writer.addheaders(strat.getwriterheaders())
 
+            if self.p.prune:
+                savemem = not self._dorunonce and not self._exactbars
+                for strat in runstrats:
+                    strat._prune(savemem=savemem)
+
             if not predata:
                 for strat in runstrats:
                     strat.qbuffer(self._exactbars, replaying=self._doreplay)
 
+            if profiler is not None:  # before the plan takes the methods
+                profiler.addstrategies(runstrats)
+
+            if self.p.nextplan:
+                for strat in runstrats:
+                    strat._buildplan()
+
             for writer in self.runwriters:
                 writer.start()
 
@@ -1286,7 +1900,13 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 else:
                     self._timers.append(timer)
 
-            if self._dopreload and self._dorunonce:
+            self._dtlimit = self._optdtlimit()
+
+            if doblocks and self._dorunonce:
+                self._runonceblocks(runstrats)
+            elif doblocks:  # runonce disabled by an indicator: load as usual
+                self._runnext(runstrats)
+            elif self._dopreload and self._dorunonce:
                 if self.p.oldsync:
                     self._runonce_old(runstrats)
                 else:
@@ -1299,6 +1919,12 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
             for strat in runstrats:
                 strat._stop()
+                strat._buildplan(clear=True)
+
+            if optrank is not None:
+                for strat in runstrats:
+                    strat.optscore = optrank.score(strat)
+                    strat.optfraction = self._optlimit or 1.0
 
         self._broker.stop()
 
@@ -1314,18 +1940,50 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         self.stop_writers(runstrats)
 
+        if profiler is not None:
+            profiler.stop()
+
+        self._runthread = None
+
+        memostats = None
+        if self.p.indmemo:
+            memo1 = linebuffer.LineActions.memostats()
+            memostats = collections.OrderedDict(
+                (k, memo1[k] - memo0[k])
+                for k in ('hits', 'misses', 'evictions'))
+
+            for strat in runstrats:
+                strat.memostats = memostats
+
         if self._dooptimize and self.p.optreturn:
             # Results can be optimized
             results = list()
             for strat in runstrats:
-                for a in strat.analyzers:
+                analyzers = list(strat.analyzers)
+                for a in analyzers:
+                    analyzers.extend(a._children)  # (SharpeRatio) too
                     a.strategy = None
                     a._parent = None
                     for attrname in dir(a):
                         if attrname.startswith('data'):
                             setattr(a, attrname, None)
 
-                oreturn = OptReturn(strat.params, analyzers=strat.analyzers, strategycls=type(strat))
+                if self.p.optanalysis is None:
+                    oreturn = OptReturn(strat.params, analyzers=strat.analyzers, strategycls=type(strat))
+                else:
+                    analysis = OrderedDict(
+                        (name, a.get_analysis())
+                        for name, a in strat.analyzers.getitems()
+                        if self.p.optanalysis is True or
+                        name in self.p.optanalysis)
+
+                    oreturn = OptReturn(strat.params, analysis=analysis, strategycls=type(strat))
+
+                if memostats is not None:
+                    oreturn.memostats = memostats
+                if optrank is not None:
+                    oreturn.optscore = strat.optscore
+                    oreturn.optfraction = strat.optfraction
                 results.append(oreturn)
 
             return results
@@ -1486,10 +2144,195 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
                     writer.next()
 
+    def _optdtlimit(self):
+        # datetime of the last bar of data0 in the fraction of the data to be
+        # run or None to run everything. Only known if the data is preloaded
+        if self._optlimit is None or not self._dopreload:
+            return None
+
+        data0 = self.datas[0]
+        size = data0.buflen()
+        if not size:
+            return None
+
+        return data0.datetime.array[max(1, int(size * self._optlimit)) - 1]
+
     def _disable_runonce(self):
         '''API for lineiterators to disable runonce (see HeikinAshi)'''
         self._dorunonce = False
 
+    def _alignindex(self, datas):
+        '''
+        Returns the alignment of the preloaded (and not yet delivered) bars
+        of ``datas`` as ``(dts, steps)``, or ``None`` if the datas are not
+        preloaded or some is live, resampled or replayed
+
+        ``dts`` are the datetimes of the timeline of all datas. ``steps`` is
+        ``None`` if all datas have the same datetimes (each delivers a bar at
+        each datetime) or else ``(order, bounds)``: the indices (in
+        ``datas``) of the datas delivering a bar at ``dts[k]`` are
+        ``order[bounds[k]:bounds[k + 1]]``
+
+        Datas with different datetimes need ``numpy`` to merge them and
+        their datetimes must be increasing, else ``None`` is returned
+        '''
+        if not self._dopreload:
+            return None
+
+        arrays = []
+        for data in datas:
+            if data.islive() or data.resampling or data.replaying:
+                return None
+
+            size = data.buflen()
+            if not size or len(data):
+                return None
+
+            arrays.append(data.lines.datetime.array[:size])
+
+        dts = list(arrays[0])
+        if all(list(array) == dts for array in arrays[1:]):
+            return dts, None
+
+        if np is None:
+            return None
+
+        arrays = [np.asarray(array, dtype=np.float64) for array in arrays]
+        if any((np.diff(array) <= 0.0).any() for array in arrays):
+            return None  # the datas would not deliver a bar per datetime
+
+        # the timeline and the position in it of the bars of each data
+        timeline = np.unique(np.concatenate(arrays))
+        pos = np.concatenate([np.searchsorted(timeline, a) for a in arrays])
+        idxs = np.repeat(np.arange(len(arrays)), [len(a) for a in arrays])
+
+        # order the data indices by position (stable: in data order)
+        order = idxs[np.argsort(pos, kind='stable')]
+        counts = np.bincount(pos, minlength=len(timeline))
+        bounds = [0] + np.cumsum(counts).tolist()
+        return timeline.tolist(), (order, bounds)
+
+    @staticmethod
+    def _tickarrays(data):
+        '''Returns the ``__dict__`` of data and the (name, getter) pairs of
+        the tick_xxx values which ``_tick_fill`` sets. A getter returns the
+        value at a position of the buffer as the buffer does'''
+        def getter(line):
+            return functools.partial(line._getvalue, line.array)
+
+        dticks = []
+        for lalias in data.getlinealiases():
+            if lalias != 'datetime':
+                line = getattr(data.lines, lalias)
+                dticks.append(('tick_' + lalias, getter(line)))
+
+        alias0 = data._getlinealias(0)
+        dticks.append(('tick_last', getter(getattr(data.lines, alias0))))
+        return data.__dict__, dticks
+
+    def _datasteps(self, datas, index=None):
+        '''
+        Yields the datetime of the next bar to deliver and the indices (in
+        ``datas``) of the datas delivering a bar at it (all those with a bar
+        at the datetime) until no data delivers anything
+
+        The steps are taken from ``index`` if given (see ``_alignindex``)
+        and else from the datetimes of the next bar of the datas
+        '''
+        if index is not None:
+            dts, steps = index
+            if steps is None:
+                alldatas = list(range(len(datas)))
+                for dt0 in dts:
+                    yield dt0, alldatas
+            else:
+                order, bounds = steps
+                for k, dt0 in enumerate(dts):
+                    yield dt0, order[bounds[k]:bounds[k + 1]].tolist()
+
+            return
+
+        while True:
+            # Check next incoming date in the datas
+            dts = [d.advance_peek() for d in datas]
+            dt0 = min(dts)
+            if dt0 == float('inf'):
+                return  # no data delivers anything
+
+            yield dt0, [i for i, dti in enumerate(dts) if dti <= dt0]
+
+    def _runnextaligned(self, runstrats, datas, index):
+        '''
+        Delivers the preloaded bars of the datas in the same sequence as
+        ``_runnext``, taking the datas which deliver a bar for each datetime
+        from ``index`` (see ``_alignindex``) instead of moving all datas
+        and rewinding those which are ahead
+
+        Returns ``None`` if the bars were delivered, ``False`` if the run
+        has to end (limit of the datetime reached) and ``True`` if stopped
+        '''
+        # plain datas move their lines, others (like clones) do more
+        advances = []
+        for data in datas:
+            if type(data).advance is AbstractDataBase.advance:
+                advances.append(data.lines.advance)
+            else:
+                advances.append(functools.partial(data.advance, ticks=False))
+
+        ticks = [self._tickarrays(data) for data in datas]
+        poss = [-1] * len(datas)
+        cheat_on_open = self.p.cheat_on_open
+        for dt0, idxs in self._datasteps(datas, index):
+            self._storenotify()
+            if self._event_stop:  # stop if requested
+                return True
+            if any(data.notifs for data in datas):
+                self._datanotify()
+                if self._event_stop:  # stop if requested
+                    return True
+
+            for i in idxs:
+                advances[i]()
+
+            if self._dtlimit is not None and dt0 > self._dtlimit:
+                return False  # prefix of the data has been run
+
+            dmaster = datas[idxs[0]]  # and timemaster
+            self._dtmaster = dmaster.num2date(dt0)
+            self._udtmaster = num2date(dt0)
+
+            for i in idxs:
+                poss[i] = pos = poss[i] + 1
+                ddict, dticks = ticks[i]
+                for tickname, getvalue in dticks:
+                    ddict[tickname] = getvalue(pos)
+
+            if any(data.notifs for data in datas):
+                self._datanotify()
+                if self._event_stop:  # stop if requested
+                    return True
+
+            self._check_timers(runstrats, dt0, cheat=True)
+            if cheat_on_open:
+                for strat in runstrats:
+                    strat._next_open()
+                    if self._event_stop:  # stop if requested
+                        return True
+
+            self._brokernotify()
+            if self._event_stop:  # stop if requested
+                return True
+
+            self._check_timers(runstrats, dt0, cheat=False)
+            for strat in runstrats:
+                strat._next()
+                if self._event_stop:  # stop if requested
+                    return True
+
+                self._next_writers(runstrats)
+
+        return None
+
     def _runnext(self, runstrats):
         '''
         Actual implementation of run in full next mode. All objects have its
@@ -1501,6 +2344,25 @@ class Cerebro(with_metaclass(MetaParams, object)):
         data0 = datas[0]
         d0ret = True
 
+        # preloaded datas deliver their bars following the timeline of all
+        # datas and the regular loop below sees then the end of the datas
+        index = self._alignindex(datas)
+        if index is not None and index[1] is not None:
+            # datas not delivering are moved and rewound by the regular loop:
+            # it has to make no difference
+            for data in datas:
+                if type(data).advance is not AbstractDataBase.advance or \
+                        any(hasattr(ff, 'check') for ff, a, k in data._filters):
+                    index = None
+                    break
+
+        if index is not None:
+            done = self._runnextaligned(runstrats, datas, index)
+            if done:
+                return
+
+            d0ret = done is None
+
         rs = [i for i, x in enumerate(datas) if x.resampling]
         rp = [i for i, x in enumerate(datas) if x.replaying]
         rsonly = [i for i, x in enumerate(datas)
@@ -1557,6 +2419,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
                     dt0 = min((d for i, d in enumerate(dts)
                                if d is not None and i not in rsonly))
 
+                if self._dtlimit is not None and dt0 > self._dtlimit:
+                    break  # prefix of the data has been run
+
                 dmaster = datas[dts.index(dt0)]  # and timemaster
                 self._dtmaster = dmaster.num2date(dt0)
                 self._udtmaster = num2date(dt0)
@@ -1652,6 +2517,9 @@ class Cerebro(with_metaclass(MetaParams, object)):
             strat._once()
             strat.reset()  # strat called next by next - reset lines
 
+        if all(strat._oncedone for strat in runstrats):
+            return  # all results have been calculated in vectorized form
+
         # The default once for strategies does nothing and therefore
         # has not moved forward all datas/indicators/observers that
         # were homed before calling once, Hence no "need" to do it
@@ -1659,23 +2527,172 @@ class Cerebro(with_metaclass(MetaParams, object)):
         datas = sorted(self.datas,
                        key=lambda x: (x._timeframe, x._compression))
 
+        self._runoncepost(runstrats, datas)
+
+    def _runonceblocks(self, runstrats):
+        '''
+        Implementation of ``_runonce`` in blocks of ``onceblock`` bars: the
+        bars of a block are loaded from the datas, the indicators calculated
+        in vector mode for them and then the bars are delivered to the
+        strategies. Afterwards only the lookback is kept in the lines
+        '''
+        datas = sorted(self.datas,
+                       key=lambda x: (x._timeframe, x._compression))
+
+        # the lines of indicators and operations are aligned with the data
+        # feed clocking them and have to be trimmed as the data feed
+        roots = dict()
+        for data in self.datas:
+            roots[id(data)] = data
+            for line in data.lines:
+                roots[id(line)] = data
+
+        owners = dict()
+        onceobjs = list()
+        pending = list(runstrats)
+        while pending:
+            lineiter = pending.pop()
+            for ind in getattr(lineiter, '_lineiterators', {}).get(
+                    lineiter.IndType, []):
+                onceobjs.append((ind, None))
+                pending.append(ind)
+                if not isinstance(ind, linebuffer.LineBuffer):
+                    for line in ind.lines:
+                        owners.setdefault(id(line), ind)
+
+        for i, (obj, root) in enumerate(onceobjs):
+            root = self._blockroot(obj, roots, owners)
+            if root is None:  # no single data clock: calculate everything
+                for data in self.datas:
+                    data.preload()
+
+                return self._runonce(runstrats)
+
+            onceobjs[i] = (obj, root)
+
+        minperiods = [obj._minperiod for obj, root in onceobjs]
+        minperiods.extend(strat._minperiod for strat in runstrats)
+        lookback = max(minperiods) + 1 + self.p.oncelookback
+
+        lines = collections.OrderedDict()  # lines moved by the calculation
+        for data in self.datas:
+            for line in data.lines:
+                lines.setdefault(id(line), (line, data))
+
+        for obj, root in onceobjs:
+            for line in obj.lines:
+                lines.setdefault(id(line), (line, root))
+
+        nextlines = list()  # lines of strategies/observers (own lookback)
+        for strat in runstrats:
+            for lineiter in [strat] + strat._lineiterators[strat.ObsType]:
+                nextlines.extend(line for line in lineiter.lines
+                                 if id(line) not in lines)
+
+        size = self.p.onceblock
+        done = set()  # ids of the datas which cannot deliver anymore bars
         while True:
-            # Check next incoming date in the datas
-            dts = [d.advance_peek() for d in datas]
-            dt0 = min(dts)
-            if dt0 == float('inf'):
-                break  # no data delivers anything
-
-            # Timemaster if needed be
-            # dmaster = datas[dts.index(dt0)]  # and timemaster
-            slen = len(runstrats[0])
-            for i, dti in enumerate(dts):
-                if dti <= dt0:
-                    datas[i].advance()
-                    # self._plotfillers2[i].append(slen)  # mark as fill
+            state = [(line, line.idx, line.lencount)
+                     for line, root in lines.values()]
+
+            for data in self.datas:
+                if id(data) in done:
+                    continue
+
+                if not data._loadblock(size):
+                    done.add(id(data))
+
+            for strat in runstrats:
+                strat._onceblock()
+
+            for line, idx, lencount in state:
+                line.idx, line.lencount = idx, lencount
+
+            # bars past the last loaded bar of any data which can still
+            # deliver are delivered in the next block
+            dtends = [d.lines.datetime[d.buflen() - len(d)]
+                      for d in self.datas if id(d) not in done]
+            if self._runoncepost(runstrats, datas, min(dtends or [None])):
+                break
+
+            for line, root in lines.values():
+                line.trim(len(root) - lookback - line._trimmed)
+
+            for obj, root in onceobjs:
+                if not isinstance(obj, linebuffer.LineBuffer):
+                    obj._trimmed = max(obj._trimmed, len(root) - lookback)
+
+            for line in nextlines:
+                line.trim(len(line) - lookback - line._trimmed)
+
+    @staticmethod
+    def _blockroot(obj, roots, owners):
+        # data feed clocking obj, following the clocks, or None
+        seen = set()
+        while id(obj) not in roots:
+            if id(obj) in seen:
+                return None
+
+            seen.add(id(obj))
+            if isinstance(obj, LineSeriesStub):
+                obj = obj.lines[0]
+            elif id(obj) in owners:
+                obj = owners[id(obj)]
+            else:
+                obj = getattr(obj, '_clock', None)
+
+            if obj is None:
+                return None
+
+        return roots[id(obj)]
+
+    def _runoncepost(self, runstrats, datas, dtend=None):
+        '''
+        Delivers the bars of the datas, with the indicators already
+        calculated, to the strategies. If ``dtend`` is not ``None`` bars past
+        it are not delivered (they belong to the next block)
+
+        Returns ``True`` if the run is over
+        '''
+        # fully preloaded datas follow the timeline of all datas
+        index = self._alignindex(datas) if dtend is None else None
+
+        # plain preloaded datas are moved to the position of their next bar
+        # setting the tick_xxx values as advance does: none for the last bar
+        fast = [None] * len(datas)
+        if index is not None:
+            for i, data in enumerate(datas):
+                if type(data).advance is AbstractDataBase.advance:
+                    last = data.buflen() - 1
+                    fast[i] = (data.lines.advance, last) + \
+                        self._tickarrays(data)
+
+        poss = [-1] * len(datas)
+        for dt0, idxs in self._datasteps(datas, index):
+            if dtend is not None and dt0 > dtend:
+                return False  # block done (or nothing loaded yet)
+
+            if self._dtlimit is not None and dt0 > self._dtlimit:
+                return True  # prefix of the data has been run
+
+            for i in idxs:
+                if fast[i] is None:
+                    data = datas[i]
+                    data.advance()
+                    if dtend is not None and not data._blockend and \
+                       len(data) == data.buflen():
+                        data._tick_fill()  # last bar of the block, not data
+                    continue
+
+                advance, last, ddict, dticks = fast[i]
+                advance()
+                poss[i] = pos = poss[i] + 1
+                if pos < last:
+                    for tickname, getvalue in dticks:
+                        ddict[tickname] = getvalue(pos)
                 else:
-                    # self._plotfillers[i].append(slen)
-                    pass
+                    for tickname, getvalue in dticks:
+                        ddict[tickname] = None
 
             self._check_timers(runstrats, dt0, cheat=True)
 
@@ -1683,21 +2700,24 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 for strat in runstrats:
                     strat._oncepost_open()
                     if self._event_stop:  # stop if requested
-                        return
+                        return True
 
             self._brokernotify()
             if self._event_stop:  # stop if requested
-                return
+                return True
 
             self._check_timers(runstrats, dt0, cheat=False)
 
             for strat in runstrats:
                 strat._oncepost(dt0)
                 if self._event_stop:  # stop if requested
-                    return
+                    return True
 
                 self._next_writers(runstrats)
 
+        # no data delivers anything: a block is done (or nothing loaded yet)
+        return dtend is None
+
     def _check_timers(self, runstrats, dt0, cheat=False):
         timers = self._timers if not cheat else self._timerscheat
         for t in timers:
@@ -23,9 +23,16 @@ from __future__ import (absolute_import, division, print_function,
 
 import collections
 import datetime
+import hashlib
 import inspect
 import io
 import os.path
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the bars are loaded one by one
 
 import backtrader as bt
 from backtrader import (date2num, num2date, time2num, TimeFrame, dataseries,
@@ -34,10 +41,42 @@ from backtrader import (date2num, num2date, time2num, TimeFrame, dataseries,
 from backtrader.utils.py3 import with_metaclass, zip, range, string_types
 from backtrader.utils import tzparse
 from .dataseries import SimpleFilterWrapper
+from .linebuffer import blockseek
 from .resamplerfilter import Resampler, Replayer
 from .tradingcal import PandasMarketCalendar
 
 
+def _cachetoken(value):
+    # text standing for a value in the key of a cache (see
+    # AbstractDataBase._cachekey). Values which cannot be told apart from one
+    # run to another (objects known by their address, lambdas) raise ValueError
+    if isinstance(value, (list, tuple)):
+        return '(%s)' % ','.join(_cachetoken(x) for x in value)
+
+    if isinstance(value, dict):
+        items = sorted((_cachetoken(k), _cachetoken(v))
+                       for k, v in value.items())
+        return '{%s}' % ','.join('%s:%s' % kv for kv in items)
+
+    if inspect.isclass(value) or inspect.isroutine(value):
+        name = getattr(value, '__qualname__', value.__name__)
+        if '<' in name:  # <lambda>, <locals>
+            raise ValueError('%r cannot be identified' % value)
+
+        return '%s.%s' % (value.__module__, name)
+
+    params = getattr(value, 'params', None)
+    if isinstance(params, metabase.AutoInfoClass):  # filters, calendars
+        return '%s%s' % (_cachetoken(type(value)),
+                         _cachetoken(list(params._getkwargs().items())))
+
+    token = repr(value)
+    if ' at 0x' in token:
+        raise ValueError('%r cannot be identified' % value)
+
+    return token
+
+
 class MetaAbstractDataBase(dataseries.OHLCDateTime.__class__):
     _indcol = dict()
 
@@ -136,6 +175,7 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         ('tzinput', None),
         ('qcheck', 0.0),  # timeout in seconds (float) to check for events
         ('calendar', None),
+        ('cache', None),  # directory of the preloaded bars (see _startcache)
     )
 
     (CONNECTED, DISCONNECTED, CONNBROKEN, DELAYED,
@@ -156,6 +196,10 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
     _clone = False
     _qcheck = 0.0
 
+    _mdigest = None  # memo key: digest of the loaded values
+    _fromcache = False  # the bars come from the cache (nothing to load)
+    _bulkviews = False  # the lines are views on all bars (nothing to load)
+
     _tmoffset = datetime.timedelta()
 
     # Set to non 0 if resampling/replaying
@@ -201,10 +245,141 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
 
     def _start(self):
         self.start()
+        self._mdigest = None  # values will be (re)loaded
+        self._fromcache = self._bulkviews = False
 
         if not self._started:
             self._start_finish()
 
+    def _memokey(self):
+        # The values of a feed are identified by a digest of the loaded lines
+        # which is independent of the object holding them (subprocesses)
+        if self._mdigest is None:
+            digest = hashlib.sha1()
+            for line in self.lines:
+                if line.useislice:  # memory saving buffers, not all values
+                    return None
+
+                digest.update(line.array)
+
+            self._mdigest = (AbstractDataBase, digest.hexdigest())
+
+        return self._mdigest
+
+    def _cachekey(self):
+        '''Returns the key of the bars in the cache (see ``_startcache``) or
+        ``None`` if they cannot be cached
+
+        The key is made of the class of the data feed, the values of the
+        parameters and the filters. If ``dataname`` is a file, its size and
+        modification time are part of the key. Other sources (a ticker to
+        download) are cached for the day, unless ``todate`` is given
+        '''
+        dataname = self.p.dataname
+        if not isinstance(dataname, string_types):
+            return None  # stream, dataframe, ...
+
+        tokens = [bt.__version__, _cachetoken(type(self))]
+        if os.path.isfile(dataname):
+            st = os.stat(dataname)
+            tokens.append('%s %d %r' % (os.path.abspath(dataname), st.st_size,
+                                        st.st_mtime))
+        elif self.p.todate is None:
+            tokens.append(datetime.date.today().isoformat())
+
+        try:
+            for pname, pvalue in self.p._getkwargs().items():
+                if pname not in ('name', 'filters', 'cache'):
+                    tokens.append('%s=%s' % (pname, _cachetoken(pvalue)))
+
+            # the filters of the params are also in _filters
+            tokens.append(_cachetoken(self._filters))
+            if self.p.calendar is None and self._filters:
+                tokens.append(_cachetoken(self._env._tradingcal))
+        except ValueError:
+            return None
+
+        digest = hashlib.sha1('\n'.join(tokens).encode('utf-8')).hexdigest()
+        return '%s-%s' % (type(self).__name__, digest[:24])
+
+    def _cachepath(self):
+        # file of the bars in the cache or None if not cached
+        if not self.p.cache or np is None or self._clone:
+            return None
+
+        if any(line.useislice or line.extension for line in self.lines):
+            return None  # memory saving or lookahead buffers
+
+        key = self._cachekey()
+        if key is None:
+            return None
+
+        return os.path.join(self.p.cache, key + '.npy')
+
+    def _startcache(self):
+        '''Starts the data feed with the bars saved in the cache (the
+        directory given with the ``cache`` parameter) by an earlier
+        ``_savecache``, instead of calling ``start`` and ``preload``. The
+        source of the bars (file, download) is therefore not touched
+
+        The file of the cache is mapped in memory (copy-on-write): the lines
+        are views on it until something is added to them. A change in the
+        source or in the parameters gives a new file: the old ones are left
+        in the directory
+
+        Returns ``False`` if the bars are not in the cache and have to be
+        loaded
+        '''
+        path = self._cachepath()
+        if path is None or not os.path.isfile(path):
+            return False
+
+        try:
+            values = np.load(path, mmap_mode='c', allow_pickle=False)
+        except (IOError, OSError, ValueError):
+            return False  # will be saved again
+
+        if values.ndim != 2 or len(values) != self.lines.fullsize():
+            return False
+
+        values = np.asarray(values)  # ndarray views of the map
+        AbstractDataBase.start(self)  # no source to open
+        self._mdigest = None
+        if not self._started:
+            self._start_finish()
+
+        for line, lvalues in zip(self.lines, values):
+            line.forwardvalues(lvalues, copy=False)
+
+        self._fromcache = True
+        self.home()
+        return True
+
+    def _savecache(self):
+        '''Saves the preloaded bars to the cache, if the ``cache`` parameter
+        is set, for ``_startcache`` to find them in later runs'''
+        if self._fromcache:
+            return
+
+        path = self._cachepath()
+        if path is None:
+            return
+
+        values = [np.asarray(line.array, dtype=np.float64)
+                  for line in self.lines]
+        if len(set(len(x) for x in values)) > 1:
+            return  # not a plain preload
+
+        if not os.path.isdir(self.p.cache):
+            os.makedirs(self.p.cache)
+
+        # written aside and renamed: other runs see the whole file or nothing
+        tmppath = '%s.%d.tmp' % (path, os.getpid())
+        with io.open(tmppath, 'wb') as f:
+            np.save(f, np.vstack(values) if values else np.empty((0, 0)))
+
+        getattr(os, 'replace', os.rename)(tmppath, path)
+
     def _timeoffset(self):
         return self._tmoffset
 
@@ -303,6 +478,7 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         self._barstack = collections.deque()
         self._barstash = collections.deque()
         self._laststatus = self.CONNECTED
+        self._blockend = False  # all bars loaded in blocks (_loadblock)
 
     def stop(self):
         pass
@@ -441,6 +617,69 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         self._last()
         self.home()
 
+    def _canbulk(self):
+        '''Whether bars can be added with ``_loadbulk``, which is not the case
+        if something (filters, an input timezone) has to see them one by
+        one'''
+        return (np is not None and not self._filters and not self._tzinput and
+                not self._barstack and not self._barstash)
+
+    def _loadbulk(self, columns, copy=True):
+        '''Adds bars in bulk, as ``load`` would have done one by one.
+        ``columns`` maps line names to arrays of values (``datetime`` in the
+        format of ``date2num``). Lines not in ``columns`` are filled with
+        ``NaN``. With ``copy=False`` the lines can be views on the arrays
+        (see ``LineBuffer.forwardvalues``)
+
+        ``fromdate`` and ``todate`` are applied as a slice: the bars before
+        ``fromdate`` are skipped and the bars end with the first one after
+        ``todate``
+
+        Returns the number of bars added
+        '''
+        dts = np.asarray(columns['datetime'], dtype=np.float64)
+        after = dts > self.todate
+        end = int(after.argmax()) if after.any() else len(dts)
+        keep = dts[:end] >= self.fromdate
+        start = int(keep.argmax()) if keep.any() else end
+        if keep[start:].all():
+            rows = slice(start, end)
+        else:  # unsorted: bars before fromdate in the middle
+            rows = np.flatnonzero(keep)
+
+        size = len(dts[rows])
+        for i, line in enumerate(self.lines):
+            values = columns.get(self.lines._getlinealias(i))
+            if values is None:
+                values = np.full(size, float('NaN'))
+            else:
+                values = np.asarray(values, dtype=np.float64)[rows]
+
+            line.forwardvalues(values, copy=copy)
+
+        return size
+
+    def _loadblock(self, size):
+        '''Loads bars until ``size`` bars not yet delivered are available
+        (see the ``onceblock`` parameter of ``Cerebro``). Returns ``False``
+        if no more bars can be loaded'''
+        consumed = len(self)
+        blockseek(self, self.buflen() - self.lines[0]._trimmed)  # load at end
+        while self.buflen() - consumed < size:
+            if not self.load():
+                self._last()
+                self._blockend = True
+                return False
+
+        self.prefetch(size)  # read ahead during the calculation
+        return True
+
+    def prefetch(self, size):
+        '''Hint that the next ``size`` bars will be loaded soon (see the
+        ``onceblock`` parameter of ``Cerebro``). Data feeds reading from slow
+        sources can start reading them in the background'''
+        pass
+
     def _last(self, datamaster=None):
         # Last chance for filters to deliver something
         ret = 0
@@ -468,6 +707,9 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
             ff.check(self, _forcedata=forcedata, *fargs, **fkwargs)
 
     def load(self):
+        if self._fromcache or self._bulkviews:
+            return False  # all bars are there (forward would copy views)
+
         while True:
             # move data pointer forward for new bar
             self.forward()
@@ -658,10 +900,27 @@ class CSVDataBase(with_metaclass(MetaCSVDataBase, DataBase)):
 
     The return value of ``_loadline`` (True/False) will be the return value
     of ``_load`` which has been overriden by this base class
+
+    To preload the whole file at once, subclasses can also override
+    ``_loadcolumns``, which returns the values of all lines as arrays (see
+    ``_readcolumns``)
+
+    Params:
+
+      - ``headers`` (default: ``True``): the first line holds the headers
+
+      - ``separator`` (default: ``,``): separator of the fields
+
+      - ``bulk`` (default: ``True``): when preloading, parse the whole file
+        at once with the C parser of ``pandas`` (if installed and supported
+        by the data feed) instead of line by line. Files which the bulk
+        parsing does not understand are read line by line
     '''
 
     f = None
-    params = (('headers', True), ('separator', ','),)
+    params = (('headers', True), ('separator', ','), ('bulk', True),)
+
+    _prefetch = None  # (thread, lines) reading lines ahead (see prefetch)
 
     def start(self):
         super(CSVDataBase, self).start()
@@ -680,13 +939,56 @@ class CSVDataBase(with_metaclass(MetaCSVDataBase, DataBase)):
 
     def stop(self):
         super(CSVDataBase, self).stop()
+        self._prefetched()  # let a background reading finish
+        self._prefetch = None
         if self.f is not None:
             self.f.close()
             self.f = None
 
+    def prefetch(self, size):
+        '''Reads the next ``size`` lines of the file in a background thread,
+        overlapping the reading with the calculations done with the lines
+        already loaded'''
+        if self.f is None or self._prefetch is not None:
+            return
+
+        lines = collections.deque()
+        thread = threading.Thread(target=self._prefetchlines,
+                                  args=(self.f, lines, size))
+        thread.daemon = True
+        self._prefetch = (thread, lines)
+        thread.start()
+
+    @staticmethod
+    def _prefetchlines(f, lines, size):
+        for i in range(size):
+            line = f.readline()
+            if not line:
+                break
+
+            lines.append(line)
+
+    def _prefetched(self):
+        # lines read in the background, once the reading is over
+        if self._prefetch is None:
+            return None
+
+        thread, lines = self._prefetch
+        thread.join()
+        return lines
+
+    def _readline(self):
+        lines = self._prefetched()
+        if lines:
+            return lines.popleft()
+
+        self._prefetch = None  # consumed: read directly again
+        return self.f.readline()
+
     def preload(self):
-        while self.load():
-            pass
+        if not self._preloadbulk():
+            while self.load():
+                pass
 
         self._last()
         self.home()
@@ -695,12 +997,120 @@ class CSVDataBase(with_metaclass(MetaCSVDataBase, DataBase)):
         self.f.close()
         self.f = None
 
+    def _preloadbulk(self):
+        '''Loads all the bars of the file with ``_loadcolumns``. Returns
+        ``False`` if they have to be loaded line by line'''
+        if not self.p.bulk or self.f is None or not self._canbulk():
+            return False
+
+        try:
+            pos = self.f.tell()
+        except (AttributeError, IOError, ValueError):
+            return False  # not seekable: no way back to the lines
+
+        try:
+            columns = self._loadcolumns()
+        except (ValueError, TypeError, IndexError, KeyError, OverflowError):
+            columns = None  # let _loadline see what is wrong (if anything)
+
+        if columns is None:
+            self.f.seek(pos)
+            return False
+
+        self._loadbulk(columns)
+        return True
+
+    def _loadcolumns(self):
+        '''Returns the values of the lines for the rest of the file (see
+        ``_loadbulk``) or ``None`` to load the lines one by one with
+        ``_loadline``, which is what the base class does'''
+        return None
+
+    def _readcolumns(self, **kwargs):
+        '''Reads the rest of the file with the C parser of ``pandas``. The
+        columns of the returned ``DataFrame`` are numbered from ``0``.
+        ``kwargs`` go to ``pandas.read_csv``
+
+        The numbers are parsed like ``float`` does and no value is
+        considered missing unless given with ``na_values``
+
+        Returns ``None`` if ``pandas`` is not installed or cannot parse with
+        the separator
+        '''
+        try:
+            import pandas as pd  # keep the import local (slow)
+        except ImportError:
+            return None
+
+        if len(self.separator) != 1:
+            return None  # would be a regular expression for pandas
+
+        kwargs.setdefault('keep_default_na', False)
+        return pd.read_csv(self.f, sep=self.separator, header=None,
+                           engine='c', float_precision='round_trip',
+                           quoting=3, **kwargs)  # csv.QUOTE_NONE
+
+    @staticmethod
+    def _numeric(column):
+        # the values of a column as floats if pandas found them to be numbers
+        if column.dtype.kind not in 'fiu':
+            raise ValueError('not a numeric column')
+
+        return column.values.astype(np.float64)
+
+    @staticmethod
+    def _parsedays(dates):
+        # datetime64[D] of the strings YYYY?MM?DD (only the first 10
+        # characters matter, as in the slicing of _loadline) or None if not
+        # valid
+        chars = np.asarray(dates).astype('S10').view(np.uint8)
+        chars = chars.reshape(-1, 10)
+        digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9]].astype(np.int64) - 48
+        if len(digits) and (digits.min() < 0 or digits.max() > 9):
+            return None
+
+        years = digits[:, :4].dot([1000, 100, 10, 1])
+        months = digits[:, 4:6].dot([10, 1])
+        mdays = digits[:, 6:8].dot([10, 1])
+        if len(digits) and (years.min() < 1 or months.min() < 1 or
+                            months.max() > 12 or mdays.min() < 1):
+            return None
+
+        months = (years - 1970) * 12 + months - 1
+        days = months.astype('datetime64[M]').astype('datetime64[D]')
+        days += mdays - 1
+        if (days.astype('datetime64[M]').astype(np.int64) != months).any():
+            return None  # past the end of the month
+
+        return days
+
+    @staticmethod
+    def _parsetimes(times):
+        # microseconds into the day of the strings HH?MM?SS or None if not
+        # valid
+        chars = np.asarray(times).astype('S8').view(np.uint8).reshape(-1, 8)
+        digits = chars[:, [0, 1, 3, 4, 6, 7]].astype(np.int64) - 48
+        if len(digits) and (digits.min() < 0 or digits.max() > 9):
+            return None
+
+        hms = digits.reshape(-1, 3, 2).dot([10, 1])
+        if len(hms) and (hms.max(axis=0) > [23, 59, 59]).any():
+            return None
+
+        return hms.dot([3600, 60, 1]) * 1000000
+
+    @staticmethod
+    def _daymus(tm):
+        # microseconds into the day of a datetime.time
+        return (((tm.hour * 60 + tm.minute) * 60 + tm.second) * 1000000 +
+                tm.microsecond)
+
     def _load(self):
         if self.f is None:
             return False
 
         # Let an exception propagate to let the caller know
-        line = self.f.readline()
+        line = self._readline()
 
         if not line:
             return False
@@ -714,7 +1124,7 @@ class CSVDataBase(with_metaclass(MetaCSVDataBase, DataBase)):
             return None
 
         # Let an exception propagate to let the caller know
-        line = self.f.readline()
+        line = self._readline()
 
         if not line:
             return None
@@ -751,6 +1161,7 @@ class DataClone(AbstractDataBase):
     def _start(self):
         # redefine to copy data bits from guest data
         self.start()
+        self._mdigest = None  # values will be (re)loaded
 
         # Copy tz infos
         self._tz = self.data._tz
@@ -772,6 +1183,7 @@ class DataClone(AbstractDataBase):
     def start(self):
         super(DataClone, self).start()
         self._dlen = 0
+        self._dblock = 0  # bars of the guest copied when loading in blocks
         self._preloading = False
 
     def preload(self):
@@ -780,6 +1192,27 @@ class DataClone(AbstractDataBase):
         self.data.home()  # preloading data was pushed forward
         self._preloading = False
 
+    def _loadblock(self, size):
+        # copy (as when preloading) the bars the guest has loaded for the
+        # block, starting after the last one copied
+        guest = self.data
+        consumed = len(self)
+        blockseek(self, self.buflen() - self.lines[0]._trimmed)
+        blockseek(guest, self._dblock - guest.lines[0]._trimmed)
+
+        self._preloading = True
+        while self.buflen() - consumed < size and self.load():
+            pass
+
+        self._preloading = False
+        self._dblock = min(len(guest), guest.buflen())
+        if self._dblock < guest.buflen() or not guest._blockend:
+            return True
+
+        self._last()
+        self._blockend = True
+        return False
+
     def _load(self):
         # assumption: the data is in the system
         # simply copy the lines
@@ -31,6 +31,7 @@ from .quandl import *
 from .sierrachart import *
 from .mt4csv import *
 from .pandafeed import *
+from .memmapfeed import *
 from .influxfeed import *
 try:
     from .ibdata import *
@@ -24,7 +24,7 @@ from __future__ import (absolute_import, division, print_function,
 from datetime import date, datetime, time
 
 from .. import feed
-from ..utils import date2num
+from ..utils import date2num, date2numarray
 
 
 class BacktraderCSVData(feed.CSVDataBase):
@@ -58,6 +58,28 @@ class BacktraderCSVData(feed.CSVDataBase):
 
         return True
 
+    def _loadcolumns(self):
+        table = self._readcolumns(dtype={0: str})
+        if table is None or len(table.columns) not in (7, 8):
+            return None
+
+        days = self._parsedays(table[0].values)
+        if len(table.columns) == 8:
+            tms = self._parsetimes(table[1].values)
+        else:
+            tms = self._daymus(self.p.sessionend)  # end of the session
+
+        if days is None or tms is None:
+            return None
+
+        columns = dict(datetime=date2numarray(days.astype('datetime64[us]') +
+                                              tms))
+        fields = ('open', 'high', 'low', 'close', 'volume', 'openinterest')
+        for field, col in zip(fields, table.columns[-6:]):
+            columns[field] = self._numeric(table[col])
+
+        return columns
+
 
 class BacktraderCSV(feed.CSVFeedBase):
     DataCls = BacktraderCSVData
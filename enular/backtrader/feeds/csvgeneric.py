@@ -24,8 +24,13 @@ from __future__ import (absolute_import, division, print_function,
 from datetime import datetime
 import itertools
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the lines are parsed one by one
+
 from .. import feed, TimeFrame
-from ..utils import date2num
+from ..utils import date2num, date2numarray
 from ..utils.py3 import integer_types, string_types
 
 
@@ -157,6 +162,77 @@ class GenericCSVData(feed.CSVDataBase):
 
         return True
 
+    def _loadcolumns(self):
+        dayeos = self.p.timeframe >= TimeFrame.Days
+        if dayeos and self._tz is not None:
+            return None  # the end of the session is localized bar by bar
+
+        dtformat = self.p.dtformat
+        if self._dtstr:
+            if '%z' in dtformat or '%Z' in dtformat:
+                return None  # aware datetimes
+        elif not isinstance(dtformat, integer_types) or dtformat not in (1, 2):
+            return None  # a callable does the conversion
+
+        strcols = [self.p.time] if self.p.time >= 0 else []
+        if self._dtstr:
+            strcols.append(self.p.datetime)
+
+        table = self._readcolumns(dtype=dict.fromkeys(strcols, str),
+                                  na_values=[''])
+        if table is None:
+            return None
+
+        dtfield = table[self.p.datetime]
+        if self._dtstr:
+            import pandas as pd  # there, it has read the table
+
+            if self.p.time >= 0:
+                # add time value and format if it's in a separate field
+                dtfield = dtfield + 'T' + table[self.p.time]
+                dtformat += 'T' + self.p.tmformat
+
+            if dtfield.isna().any():
+                return None
+
+            dts = pd.to_datetime(dtfield, format=dtformat).values
+        elif dtformat == 1:  # utcfromtimestamp(int(x))
+            if dtfield.dtype.kind not in 'iu':
+                return None
+
+            dts = dtfield.values.astype('datetime64[s]')
+        else:  # utcfromtimestamp(float(x)): microseconds rounded half even
+            secs = self._numeric(dtfield)
+            if not np.isfinite(secs).all():
+                return None
+
+            frac, secs = np.modf(secs)
+            mus = secs.astype(np.int64) * 1000000
+            mus += np.rint(frac * 1e6).astype(np.int64)
+            dts = mus.astype('datetime64[us]')
+
+        dts = dts.astype('datetime64[us]')
+        dtnums = date2numarray(dts)
+        if dayeos:
+            # if the expected end of session is larger than parsed, use it
+            eos = dts.astype('datetime64[D]').astype('datetime64[us]')
+            eosnums = date2numarray(eos + self._daymus(self.p.sessionend))
+            dtnums = np.where(eosnums > dtnums, eosnums, dtnums)
+
+        columns = dict(datetime=dtnums)
+        nullvalue = float(self.p.nullvalue)
+        for linefield in (x for x in self.getlinealiases() if x != 'datetime'):
+            csvidx = getattr(self.params, linefield)
+            if csvidx is None or csvidx < 0:
+                values = np.full(len(table), nullvalue)
+            else:
+                values = self._numeric(table[csvidx])
+                values[np.isnan(values)] = nullvalue  # empty fields
+
+            columns[linefield] = values
+
+        return columns
+
 
 class GenericCSV(feed.CSVFeedBase):
     DataCls = GenericCSVData
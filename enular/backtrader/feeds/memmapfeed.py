@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os.path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # checked when the data feed starts
+
+from backtrader.utils import date2numarray
+import backtrader.feed as feed
+
+
+__all__ = ['MemMapData']
+
+
+class MemMapData(feed.DataBase):
+    '''
+    Reads the bars from binary files mapped in memory. Histories larger than
+    the memory can be backtested: the operating system reads the parts of
+    the files which are used and can discard them again
+
+    ``dataname`` is either:
+
+      - a ``.npy`` file holding a 2-D array with one row per field (see the
+        ``fields`` parameter). The files of the cache of the data feeds (see
+        their ``cache`` parameter) have this format
+
+      - a directory with a ``.npy`` file per field, named after the line
+        (``datetime.npy``, ``close.npy``, ...). Lines without a file are
+        ``NaN``
+
+    The ``datetime`` values are in the format of ``date2num`` or are naive
+    (UTC) ``datetime64``. The other fields can be of any numeric type
+
+    When preloading, the lines are read-only views on the files (nothing is
+    copied) if the values are doubles (``float64``, ``datetime`` included)
+    and ``fromdate``/``todate`` select consecutive bars. Filters and a
+    ``tzinput`` need the bars one by one, which are then copied
+
+    Without preloading, the bars are read in pages of ``pagesize`` bars:
+    with ``exactbars`` only a page is in memory. The pages ending before
+    ``fromdate`` are skipped
+
+    ``write`` creates the 2-D files
+
+    Params:
+
+      - ``fields`` (default: ``None``): names of the rows of a 2-D file, the
+        lines of the data feed (in their order) if ``None``. Rows after the
+        last name are ignored, as are names which are not lines
+
+      - ``pagesize`` (default: ``65536``): bars converted at once when not
+        preloading
+    '''
+    params = (
+        ('fields', None),
+        ('pagesize', 65536),
+    )
+
+    def start(self):
+        super(MemMapData, self).start()
+        if np is None:
+            raise ImportError('MemMapData needs numpy to be installed. '
+                              'Please use pip install numpy or the method '
+                              'of your choice')
+
+        self._columns = self._mapcolumns()
+        self._size = len(self._columns['datetime'])
+        self._idx = 0  # first bar of the next page
+        self._page = list()  # (line, values of the page)
+        self._pageidx = self._pagelen = 0
+
+    def stop(self):
+        super(MemMapData, self).stop()
+        self._columns = None  # the maps go with the last view
+        self._page = list()
+
+    def _mapcolumns(self):
+        # line name -> array mapped in memory
+        path = self.p.dataname
+        aliases = self.getlinealiases()
+        columns = dict()
+        if os.path.isdir(path):
+            for name in aliases:
+                fname = os.path.join(path, name + '.npy')
+                if os.path.isfile(fname):
+                    columns[name] = np.load(fname, mmap_mode='r',
+                                            allow_pickle=False)
+        else:
+            values = np.load(path, mmap_mode='r', allow_pickle=False)
+            fields = self.p.fields or aliases
+            if values.ndim != 2 or len(values) < len(fields):
+                raise ValueError('%s: a row per field expected (%s)' %
+                                 (path, ', '.join(fields)))
+
+            for name, row in zip(fields, values):
+                if name in aliases:
+                    columns[name] = row
+
+        if 'datetime' not in columns:
+            raise ValueError('%s: no datetime values' % path)
+
+        if len(set(len(x) for x in columns.values())) > 1:
+            raise ValueError('%s: fields of different lengths' % path)
+
+        return columns
+
+    def _values(self, name, start=0, end=None):
+        # the values of the bars of a field as doubles: a view on the file if
+        # they already are doubles
+        values = self._columns[name][start:end]
+        if values.dtype.kind == 'M':
+            return date2numarray(values)
+
+        return np.asarray(values, dtype=np.float64)
+
+    def preload(self):
+        if not self._canbulk():
+            return super(MemMapData, self).preload()
+
+        columns = dict((name, self._values(name)) for name in self._columns)
+        self._loadbulk(columns, copy=False)
+        self._idx = self._size  # nothing left for _load
+        self._bulkviews = True
+
+        self._last()
+        self.home()
+
+    def _nextpage(self):
+        # converts the values of the next page of bars to lists, which are
+        # faster to index than the arrays
+        while self._idx < self._size:
+            start = self._idx
+            self._idx = end = min(start + self.p.pagesize, self._size)
+            if not self._tzinput:  # fromdate can be checked before load
+                if self._values('datetime', start, end).max() < self.fromdate:
+                    continue
+
+            self._page = [(getattr(self.lines, name),
+                           self._values(name, start, end).tolist())
+                          for name in self._columns]
+            self._pageidx, self._pagelen = 0, end - start
+            return True
+
+        return False
+
+    def _load(self):
+        if self._pageidx >= self._pagelen and not self._nextpage():
+            return False
+
+        i = self._pageidx
+        self._pageidx += 1
+        for line, values in self._page:
+            line[0] = values[i]
+
+        return True
+
+    @classmethod
+    def write(cls, filename, columns, fields=None, pagesize=1 << 20):
+        '''Writes ``columns`` (field name -> values) to ``filename`` as a
+        2-D file: a row of doubles per name of ``fields`` (default: the lines
+        of the data feed), ``NaN`` for the names not in ``columns``
+
+        ``datetime`` values can be ``datetime64`` (naive UTC) or in the
+        format of ``date2num``. The values, which can themselves be mapped in
+        memory, are written in pages of ``pagesize`` bars
+        '''
+        if np is None:
+            raise ImportError('MemMapData needs numpy to be installed. '
+                              'Please use pip install numpy or the method '
+                              'of your choice')
+
+        fields = fields or cls.lines.getlinealiases()
+        size = len(columns['datetime'])
+        out = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float64,
+                                        shape=(len(fields), size))
+        for row, name in zip(out, fields):
+            values = columns.get(name)
+            if values is None:
+                row[:] = float('NaN')
+                continue
+
+            if len(values) != size:
+                raise ValueError('%s: %d values for %d bars' %
+                                 (name, len(values), size))
+
+            for start in range(0, size, pagesize):
+                page = np.asarray(values[start:start + pagesize])
+                if page.dtype.kind == 'M':
+                    page = date2numarray(page)
+
+                row[start:start + pagesize] = page
+
+        out.flush()
+        del out  # unmapped
@@ -21,9 +21,15 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # pandas is not there either
+
 from backtrader.utils.py3 import filter, string_types, integer_types
 
 from backtrader import date2num
+from backtrader.utils import date2numarray
 import backtrader.feed as feed
 
 
@@ -120,6 +126,10 @@ class PandasData(feed.DataBase):
 
       - The ``dataname`` parameter is a Pandas DataFrame
 
+      - When preloading, the columns are copied to the lines in bulk and
+        ``fromdate``/``todate`` select a slice of the rows, unless filters
+        or ``tzinput`` have to see the bars one by one
+
       - Values possible for datetime
 
         - None: the index contains the datetime
@@ -215,6 +225,9 @@ class PandasData(feed.DataBase):
         # reset the length with each start
         self._idx = -1
 
+        # the number of bars is known in advance
+        self.reserve(len(self.p.dataname))
+
         # Transform names (valid for .ix) into indices (good for .iloc)
         if self.p.nocase and not self.colsnumeric:
             colnames = [x.lower() for x in self.p.dataname.columns.values]
@@ -239,6 +252,45 @@ class PandasData(feed.DataBase):
 
             self._colmapping[k] = v
 
+    def _timestamps(self):
+        # the datetimes of the rows as naive UTC datetime64 or None if they
+        # are not datetimes or miss some (NaT: the rows go one by one)
+        coldtime = self._colmapping['datetime']
+        if coldtime is None:
+            tstamps = self.p.dataname.index
+        else:
+            tstamps = self.p.dataname.iloc[:, coldtime]
+
+        if getattr(tstamps, 'dtype', None) is None or tstamps.dtype.kind != 'M':
+            return None
+
+        dtaccess = getattr(tstamps, 'dt', tstamps)  # Series or DatetimeIndex
+        if dtaccess.tz is not None:
+            tstamps = dtaccess.tz_convert('UTC').tz_localize(None)
+
+        tstamps = np.asarray(tstamps)
+        if np.isnat(tstamps).any():
+            return None
+
+        return tstamps
+
+    def preload(self):
+        tstamps = self._timestamps() if self._canbulk() else None
+        if tstamps is None:
+            return super(PandasData, self).preload()
+
+        columns = dict(datetime=date2numarray(tstamps))
+        for datafield in self.getlinealiases():
+            colindex = self._colmapping[datafield]
+            if datafield != 'datetime' and colindex is not None:
+                columns[datafield] = self.p.dataname.iloc[:, colindex].values
+
+        self._loadbulk(columns)
+        self._idx = len(self.p.dataname)  # nothing left for _load
+
+        self._last()
+        self.home()
+
     def _load(self):
         self._idx += 1
 
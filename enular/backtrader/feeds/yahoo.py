@@ -30,8 +30,30 @@ from ..utils.py3 import (urlopen, urlquote, ProxyHandler, build_opener,
                          install_opener)
 
 import backtrader as bt
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the lines are parsed one by one
+
 from .. import feed
-from ..utils import date2num
+from ..utils import date2num, date2numarray
+
+
+def _roundarray(values, ndigits):
+    # round(value, ndigits) for each value. numpy scales by a power of 10,
+    # which rounds differently close to the halves (and for large values):
+    # those are rounded by python
+    with np.errstate(invalid='ignore', over='ignore'):
+        rounded = np.round(values, ndigits)
+        scaled = values * 10.0 ** ndigits
+        half = np.abs(scaled - np.floor(scaled) - 0.5)
+        redo = half <= 1e-9 * np.maximum(np.abs(scaled), 1.0)
+        redo |= np.isfinite(scaled) & (np.abs(scaled) >= 2.0 ** 52)
+
+    for i in np.flatnonzero(redo):
+        rounded[i] = round(float(values[i]), ndigits)
+
+    return rounded
 
 
 class YahooFinanceCSVData(feed.CSVDataBase):
@@ -177,6 +199,58 @@ class YahooFinanceCSVData(feed.CSVDataBase):
 
         return True
 
+    def _loadcolumns(self):
+        table = self._readcolumns(dtype={0: str}, na_values=['null'])
+        if table is None or len(table.columns) < 6:
+            return None
+
+        # lines with "null" values are skipped
+        table = table[~table.iloc[:, 1:].isna().any(axis=1).values]
+        days = self._parsedays(table[0].values)
+        if days is None:
+            return None
+
+        tms = self._daymus(self.p.sessionend)
+        dts = date2numarray(days.astype('datetime64[us]') + tms)
+
+        o, h, l, c, adjustedclose = [self._numeric(table[col])
+                                     for col in table.columns[1:6]]
+        if len(table.columns) > 6:
+            v = self._numeric(table[table.columns[6]])
+        else:
+            v = np.zeros(len(table))
+
+        if self.p.swapcloses:  # swap closing prices if requested
+            c, adjustedclose = adjustedclose, c
+
+        if not adjustedclose.all():
+            return None  # let _loadline raise the ZeroDivisionError
+
+        adjfactor = c / adjustedclose
+
+        # in v7 "adjusted prices" seem to be given, scale back for non adj
+        if self.params.adjclose:
+            o = o / adjfactor
+            h = h / adjfactor
+            l = l / adjfactor
+            c = adjustedclose
+
+            # If the price goes down, volume must go up and viceversa
+            if self.p.adjvolume:
+                v = v * adjfactor
+
+        if self.p.round:
+            decimals = self.p.decimals
+            o = _roundarray(o, decimals)
+            h = _roundarray(h, decimals)
+            l = _roundarray(l, decimals)
+            c = _roundarray(c, decimals)
+
+        v = _roundarray(v, int(self.p.roundvolume))
+
+        return dict(datetime=dts, open=o, high=h, low=l, close=c, volume=v,
+                    openinterest=np.zeros(len(table)), adjclose=adjustedclose)
+
 
 class YahooLegacyCSV(YahooFinanceCSVData):
     '''
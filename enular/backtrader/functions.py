@@ -24,6 +24,11 @@ from __future__ import (absolute_import, division, print_function,
 import functools
 import math
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from .linebuffer import LineActions
 from .utils.py3 import cmp, range
 
@@ -180,6 +185,14 @@ class If(Logic):
         self[0] = self.a[0] if self.cond[0] else self.b[0]
 
     def once(self, start, end):
+        arrays = [self.ndarray(), self.cond.ndarray(),
+                  self.a.ndarray(), self.b.ndarray()]
+        if all(x is not None for x in arrays):
+            dst, cond, srca, srcb = (x[start:end] for x in arrays)
+            # nan is not zero and is therefore true as in python
+            dst[:] = np.where(cond != 0.0, srca, srcb)
+            return
+
         # cache python dictionary lookups
         dst = self.array
         srca = self.a.array
@@ -218,14 +231,33 @@ class SingleLogic(Logic):
 
 
 class MultiLogicReduce(MultiLogic):
+    # name of a numpy logical ufunc equivalent to flogic for the truth values
+    # of the arguments, to reduce them at once in vectorized mode
+    npreduce = None
+
     def __init__(self, *args, **kwargs):
         super(MultiLogicReduce, self).__init__(*args)
+        self._npreduce = None
         if 'initializer' not in kwargs:
             self.flogic = functools.partial(functools.reduce, self.flogic)
+            if np is not None and self.npreduce is not None:
+                self._npreduce = getattr(np, self.npreduce)
         else:
             self.flogic = functools.partial(functools.reduce, self.flogic,
                                             initializer=kwargs['initializer'])
 
+    def once(self, start, end):
+        if self._npreduce is not None and len(self.args) > 1:
+            dst = self.ndarray()
+            arrays = [arg.ndarray() for arg in self.args]
+            if dst is not None and all(x is not None for x in arrays):
+                # nan is not zero and is therefore true as in python
+                truths = [x[start:end] != 0.0 for x in arrays]
+                dst[start:end] = functools.reduce(self._npreduce, truths)
+                return
+
+        super(MultiLogicReduce, self).once(start, end)
+
 
 class Reduce(MultiLogicReduce):
     def __init__(self, flogic, *args, **kwargs):
@@ -241,6 +273,7 @@ def _andlogic(x, y):
 
 class And(MultiLogicReduce):
     flogic = staticmethod(_andlogic)
+    npreduce = 'logical_and'
 
 
 def _orlogic(x, y):
@@ -249,6 +282,7 @@ def _orlogic(x, y):
 
 class Or(MultiLogicReduce):
     flogic = staticmethod(_orlogic)
+    npreduce = 'logical_or'
 
 
 class Max(MultiLogic):
@@ -24,6 +24,7 @@ from __future__ import (absolute_import, division, print_function,
 
 from .utils.py3 import range, with_metaclass
 
+from .linebuffer import LineActions, _memokeys
 from .lineiterator import LineIterator, IndicatorBase
 from .lineseries import LineSeriesMaker, Lines
 from .metabase import AutoInfoClass
@@ -64,6 +65,15 @@ class MetaIndicator(IndicatorBase.__class__):
         _obj = super(MetaIndicator, cls).__call__(*args, **kwargs)
         return cls._icache.setdefault(ckey, _obj)
 
+    def dopreinit(cls, _obj, *args, **kwargs):
+        _obj, args, kwargs = \
+            super(MetaIndicator, cls).dopreinit(_obj, *args, **kwargs)
+
+        # Non-data arguments also identify the calculation for the memo
+        _obj._memoargs = (args, kwargs)
+
+        return _obj, args, kwargs
+
     def __init__(cls, name, bases, dct):
         '''
         Class has already been created ... register subclasses
@@ -98,6 +108,56 @@ class Indicator(with_metaclass(MetaIndicator, IndicatorBase)):
         if len(self) < len(self._clock):
             self.lines.advance(size=size)
 
+    def _memokey(self):
+        # An indicator is identified by its class, params, datas and any other
+        # argument it was created with
+        try:
+            return self._mkey
+        except AttributeError:
+            pass
+
+        args, kwargs = self._memoargs
+        keys = (
+            _memokeys(self.datas),
+            _memokeys(self.params._getvalues()),
+            _memokeys(args),
+            _memokeys(kwargs.values()),
+        )
+        if any(k is None for k in keys):
+            mkey = None
+        else:
+            mkey = (type(self),) + keys + (tuple(kwargs),)
+
+        self._mkey = mkey
+        return mkey
+
+    def _once(self):
+        mkey = self._memokey() if LineActions._amemosize else None
+        values = LineActions.memoget(mkey)
+        if values is None:
+            super(Indicator, self)._once()
+            LineActions.memoput(mkey, [x._memosave() for x in self.lines])
+            return
+
+        # Calculated before: fetch the values but keep the sub-indicators
+        # (which will usually also be found in the memo) in place
+        self.forward(size=self._clock.buflen())
+
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            indicator._once()
+
+        for data in self.datas:
+            data.home()
+
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            indicator.home()
+
+        self.home()
+
+        for line, lvalues in zip(self.lines, values):
+            line._memoload(lvalues)
+            line.oncebinding()
+
     def preonce_via_prenext(self, start, end):
         # generic implementation if prenext is overridden but preonce is not
         for i in range(start, end):
@@ -36,21 +36,100 @@ import collections
 import datetime
 from itertools import islice
 import math
+import mmap
+import operator
 
-from .utils.py3 import range, with_metaclass, string_types
+try:
+    import numpy as np
+except ImportError:
+    np = None  # numpy backed buffers are not available
+
+from .utils.py3 import range, with_metaclass, string_types, integer_types
 
 from .lineroot import LineRoot, LineSingle, LineMultiple
 from . import metabase
-from .utils import num2date, time2num
+from .utils import num2date, num2datearray, time2num
 
 
 NAN = float('NaN')
 
 
+if np is not None:
+    # operations which can be applied to entire slices of the buffers with a
+    # numpy ufunc, yielding exactly the same values as the scalar operation
+    _npufuncs = {
+        operator.__add__: np.add,
+        operator.__sub__: np.subtract,
+        operator.__mul__: np.multiply,
+        operator.__truediv__: np.true_divide,
+        operator.__floordiv__: np.floor_divide,
+        operator.__lt__: np.less,
+        operator.__gt__: np.greater,
+        operator.__le__: np.less_equal,
+        operator.__ge__: np.greater_equal,
+        operator.__eq__: np.equal,
+        operator.__ne__: np.not_equal,
+        operator.__neg__: np.negative,
+        operator.__abs__: np.absolute,
+    }
+else:
+    _npufuncs = dict()
+
+# a zero divisor raises an exception in Python and not in numpy. The scalar
+# loop is kept for those to preserve the behavior
+_npzerodiv = (operator.__truediv__, operator.__floordiv__)
+
+# operations which compare datetime.time values as well as their number of
+# microseconds into the day
+_nptimecmp = (operator.__lt__, operator.__gt__, operator.__le__,
+              operator.__ge__, operator.__eq__, operator.__ne__)
+
+
+# files holding shared line values (see LineBuffer.share) mapped in memory by
+# this process. All lines shared in a file use the same map
+_sharedmaps = dict()
+
+
+def _npvalue(larray, idx):
+    # a float like array.array gives and not a numpy scalar. Indicators may
+    # also have replaced the storage with an array.array (like talib does)
+    return float(larray[idx])
+
+
+def _trimmederror(idx):
+    return IndexError('Value %d positions before the first one kept in the '
+                      'buffer. Increase the oncelookback of cerebro' % -idx)
+
+
+def _trimmedvalue(getvalue):
+    # reads like getvalue from a trimmed storage (see LineBuffer.trim), where
+    # a negative position would wrap around to the last values
+    def trimmedvalue(larray, idx):
+        if idx < 0:
+            raise _trimmederror(idx)
+
+        return getvalue(larray, idx)
+
+    return trimmedvalue
+
+
+def _sharedview(path, offset, size):
+    try:
+        smap = _sharedmaps[path]
+    except KeyError:
+        with open(path, 'rb') as f:
+            smap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _sharedmaps[path] = smap
+
+    return np.frombuffer(smap, dtype=np.float64, count=size, offset=offset)
+
+
 class LineBuffer(LineSingle):
     '''
-    LineBuffer defines an interface to an "array.array" (or list) in which
-    index 0 points to the item which is active for input and output.
+    LineBuffer defines an interface to an "array.array" (or list or
+    numpy.ndarray) in which index 0 points to the item which is active for
+    input and output.
 
     Positive indices fetch values from the past (left hand side)
     Negative indices fetch values from the future (if the array has been
@@ -72,6 +151,27 @@ class LineBuffer(LineSingle):
 
     UnBounded, QBuffer = (0, 1)
 
+    _share = None  # (path, offset, size) of the values if shared
+    _dt64 = None  # (trimmed, size, last value, storage) see datetime64
+    _trimmed = 0  # values removed from the beginning (see trim)
+
+    # Unbounded buffers can be backed by a growable numpy.ndarray instead of
+    # an array.array. The "array" attribute is then a view on the first
+    # "buflen" positions of a larger preallocated storage
+    _npuse = False
+    _npminsize = 64
+
+    # reads a value of the storage (see _usegetter)
+    _getvalue = operator.getitem
+
+    @classmethod
+    def usenumpy(cls, onoff):
+        if onoff and np is None:
+            raise ImportError('numpy backed line buffers need numpy to be '
+                              'installed. Please use pip install numpy or '
+                              'the method of your choice')
+        cls._npuse = onoff
+
     def __init__(self):
         self.lines = [self]
         self.mode = self.UnBounded
@@ -110,13 +210,30 @@ class LineBuffer(LineSingle):
             # allows the forward without removing that bar
             self.array = collections.deque(maxlen=self.maxlen + self.extrasize)
             self.useislice = True
+            self._npbuf = None
+        elif self._npuse:
+            self._npbuf = np.empty(0)
+            self.array = self._npbuf[:0]
+            self.useislice = False
         else:
             self.array = array.array(str('d'))
             self.useislice = False
+            self._npbuf = None
 
         self.lencount = 0
         self.idx = -1
         self.extension = 0
+        self._trimmed = 0
+        self._dt64 = None
+        self._usegetter()
+
+    def _usegetter(self):
+        # picks how __getitem__ reads a value for the kind of storage
+        getvalue = operator.getitem if self._npbuf is None else _npvalue
+        if self._trimmed:
+            getvalue = _trimmedvalue(getvalue)
+
+        self._getvalue = getvalue
 
     def qbuffer(self, savemem=0, extrasize=0):
         self.mode = self.QBuffer
@@ -128,6 +245,134 @@ class LineBuffer(LineSingle):
     def getindicators(self):
         return []
 
+    def reserve(self, size):
+        '''Preallocates room for ``size`` additional values if the buffer is
+        backed by numpy, avoiding reallocations when the final length is known
+        in advance (for example the number of rows of a feed source)
+
+        The logical length and the index of the buffer are not modified
+        '''
+        if self._npbuf is not None:
+            capacity = len(self.array) + size
+            if capacity > len(self._npbuf):
+                self._npresize(capacity)
+
+    def trim(self, size):
+        '''Removes ``size`` values from the beginning of an unbounded buffer
+        to bound the memory it uses
+
+        The logical length and the value returned by ``buflen`` are not
+        modified and the index keeps pointing to the same value. Positions
+        (as in ``once``) are afterwards relative to the first kept value.
+        Reading a removed value raises an ``IndexError``
+        '''
+        larray = self.array
+        size = min(size, len(larray))
+        if size <= 0 or self.mode == self.QBuffer:
+            return
+
+        if self._npbuf is not None:
+            if getattr(larray, 'base', None) is not self._npbuf:
+                self._npresize(len(larray))
+                larray = self.array
+
+            kept = len(larray) - size
+            self._npbuf[:kept] = larray[size:]
+            self.array = self._npbuf[:kept]
+        else:
+            del larray[:size]
+
+        self._idx -= size
+        self._trimmed += size
+        self._usegetter()
+
+    def _npresize(self, capacity):
+        larray = self.array
+        nbuf = np.empty(max(capacity, self._npminsize))
+        nbuf[:len(larray)] = larray
+        self._npbuf = nbuf
+        self.array = nbuf[:len(larray)]
+
+    def ndarray(self):
+        '''Returns a zero-copy ``numpy.ndarray`` view of the buffer storage
+        (``numpy.ndarray`` or ``array.array`` of doubles) or ``None`` if numpy
+        is not available or the storage cannot be viewed (memory saving modes)
+
+        The view must not be kept beyond the current operation, because the
+        storage can be reallocated when the buffer grows
+        '''
+        larray = self.array
+        if np is None or self.useislice or not len(larray):
+            return None
+
+        if isinstance(larray, np.ndarray):
+            return larray
+
+        if isinstance(larray, array.array) and larray.typecode == 'd':
+            return np.frombuffer(larray, dtype=np.float64)
+
+        return None
+
+    def share(self, f, path):
+        '''Writes the values of the buffer to the binary file ``f`` (opened
+        for writing from ``path``). Until ``unshare`` is called, pickling the
+        buffer sends only a reference to them: the unpickled buffer maps the
+        file in memory as a read-only ``numpy.ndarray``, which all processes
+        unpickling it share
+
+        Requires numpy and has no effect on memory saving buffers
+        '''
+        larray = self.array
+        if np is None or self.useislice or not len(larray):
+            return
+
+        if isinstance(larray, array.array):
+            if larray.typecode != 'd':
+                return
+
+            larray.tofile(f)
+        else:
+            f.write(larray.astype(np.float64, copy=False).tobytes())
+
+        self._share = (path, f.tell() - len(larray) * 8, len(larray))
+
+    def unshare(self):
+        '''Pickling sends the values of the buffer again'''
+        self._share = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_dt64', None)  # cache: converted again if needed
+        state.pop('_getvalue', None)  # set again for the storage
+        if self._share is not None:
+            state['array'] = state['_npbuf'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._share is not None:
+            # a forward/extend reallocates a private (writable) copy, because
+            # the view is not a slice of _npbuf
+            self.array = _sharedview(*self._share)
+            self._npbuf = self.array[:0]
+            self._share = None
+
+        self._usegetter()
+
+    def _npforward(self, value, size):
+        # grows the ndarray view by size, reallocating (doubling) the storage
+        # if needed or if the view no longer points to it (after a pickle)
+        larray = self.array
+        start = len(larray)
+        end = start + size
+        if end > len(self._npbuf) or getattr(larray, 'base', None) is not \
+           self._npbuf:
+            self._npresize(max(end, 2 * len(self._npbuf)))
+
+        self._npbuf[start:end] = value
+        self.array = self._npbuf[:end]
+
     def minbuffer(self, size):
         '''The linebuffer must guarantee the minimum requested size to be
         available.
@@ -155,12 +400,12 @@ class LineBuffer(LineSingle):
         The internal buffer can be longer than the actual stored data to
         allow for "lookahead" operations. The real amount of data that is
         held/can be held in the buffer
-        is returned
+        is returned (including the values removed with ``trim``)
         '''
-        return len(self.array) - self.extension
+        return len(self.array) - self.extension + self._trimmed
 
     def __getitem__(self, ago):
-        return self.array[self.idx + ago]
+        return self._getvalue(self.array, self.idx + ago)
 
     def get(self, ago=0, size=1):
         ''' Returns a slice of the array relative to *ago*
@@ -181,7 +426,11 @@ class LineBuffer(LineSingle):
             end = self.idx + ago + 1
             return list(islice(self.array, start, end))
 
-        return self.array[self.idx + ago - size + 1:self.idx + ago + 1]
+        start = self.idx + ago - size + 1
+        if start < 0 and self._trimmed:
+            raise _trimmederror(start)
+
+        return self.array[start:self.idx + ago + 1]
 
     def getzeroval(self, idx=0):
         ''' Returns a single value of the array relative to the real zero
@@ -194,7 +443,7 @@ class LineBuffer(LineSingle):
         Returns:
             A slice of the underlying buffer
         '''
-        return self.array[idx]
+        return self._getvalue(self.array, idx)
 
     def getzero(self, idx=0, size=1):
         ''' Returns a slice of the array relative to the real zero of the buffer
@@ -254,9 +503,47 @@ class LineBuffer(LineSingle):
         self.idx += size
         self.lencount += size
 
+        if self._npbuf is not None:
+            self._npforward(value, size)
+            return
+
         for i in range(size):
             self.array.append(value)
 
+    def forwardvalues(self, values, copy=True):
+        ''' Moves the logical index forward over new positions holding values
+
+        Keyword Args:
+            values (sequence): values of the new positions (a
+            ``numpy.ndarray`` of doubles is copied in bulk)
+            copy (bool): if ``False`` and the buffer is empty, a contiguous
+            ``numpy.ndarray`` of doubles becomes the storage of the buffer
+            (as a view, like a shared buffer). Adding positions later makes
+            a copy
+        '''
+        size = len(values)
+        if self.mode == self.QBuffer:
+            for value in values:
+                self.forward(value)
+            return
+
+        self.idx += size
+        self.lencount += size
+
+        if not copy and not len(self.array) and np is not None and \
+           isinstance(values, np.ndarray) and values.dtype == np.float64 and \
+           values.ndim == 1 and values.flags.c_contiguous:
+            self.array = values
+            self._npbuf = values[:0]  # not the base: forward reallocates
+            self._usegetter()
+        elif self._npbuf is not None:
+            self._npforward(values, size)
+        elif np is not None and isinstance(values, np.ndarray):
+            self.array.frombytes(
+                np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        else:
+            self.array.extend(values)
+
     def backwards(self, size=1, force=False):
         ''' Moves the logical index backwards and reduces the buffer as much as needed
 
@@ -267,6 +554,10 @@ class LineBuffer(LineSingle):
         # Go directly to property setter to support force
         self.set_idx(self._idx - size, force=force)
         self.lencount -= size
+        if self._npbuf is not None:
+            self.array = self.array[:len(self.array) - size]
+            return
+
         for i in range(size):
             self.array.pop()
 
@@ -294,6 +585,10 @@ class LineBuffer(LineSingle):
         set values in the buffer "future"
         '''
         self.extension += size
+        if self._npbuf is not None:
+            self._npforward(value, size)
+            return
+
         for i in range(size):
             self.array.append(value)
 
@@ -336,10 +631,45 @@ class LineBuffer(LineSingle):
         Executes the bindings when running in "once" mode
         '''
         larray = self.array
-        blen = self.buflen()
+        blen = self.buflen() - self._trimmed
         for binding in self.bindings:
             binding.array[0:blen] = larray[0:blen]
 
+    def _memokey(self):
+        '''
+        Returns a hashable key identifying the values of the line for the memo
+        of calculated lines or ``None`` if they cannot be identified. A plain
+        line is identified by its owner and its position in the owner
+        '''
+        owner = self._owner
+        okey = owner._memokey() if owner is not None else None
+        if okey is None:
+            return None
+
+        for i, line in enumerate(owner.lines):
+            if line is self:
+                return (okey, i)
+
+        return None
+
+    def _memosave(self):
+        # copy of the calculated values to be kept in the memo
+        larray = self.array
+        if isinstance(larray, array.array):
+            return larray[:]
+
+        return larray.copy()
+
+    def _memoload(self, values):
+        # restore the values from the memo. numpy backed buffers may have
+        # been switched on/off since the values were saved
+        larray = self.array
+        if isinstance(larray, array.array) and \
+           not isinstance(values, array.array):
+            values = array.array(str('d'), values.tolist())
+
+        larray[0:len(values)] = values
+
     def bind2lines(self, binding=0):
         '''
         Stores a binding to another line. "binding" can be an index or a name
@@ -383,6 +713,40 @@ class LineBuffer(LineSingle):
     def _settz(self, tz):
         self._tz = tz
 
+    def datetime64(self):
+        '''Returns the values of the buffer (the positions of ``ndarray``)
+        converted to naive (UTC) ``numpy.datetime64[us]``, as ``num2date``
+        would do for each value without a timezone
+
+        The conversion is cached for the line: the next calls only convert
+        the values added in the meantime (and the last one, which resampling
+        and replaying update). Returns ``None`` if ``ndarray`` does
+
+        The returned array must not be kept beyond the current operation
+        '''
+        values = self.ndarray()
+        if values is None:
+            return None
+
+        size = len(values)
+        start, dt64 = 0, None
+        if self._dt64 is not None:
+            trimmed, cached, last, dt64 = self._dt64
+            if trimmed == self._trimmed and 0 < cached <= size and \
+               values[cached - 1] == last:
+                start = cached - 1  # the last one may have been updated
+
+        if dt64 is None or len(dt64) < size:
+            storage = np.empty(max(size, 2 * start), dtype='datetime64[us]')
+            if start:
+                storage[:start] = dt64[:start]
+
+            dt64 = storage
+
+        dt64[start:size] = num2datearray(values[start:size])
+        self._dt64 = (self._trimmed, size, values[size - 1], dt64)
+        return dt64[:size]
+
     def datetime(self, ago=0, tz=None, naive=True):
         return num2date(self.array[self.idx + ago],
                         tz=tz or self._tz, naive=naive)
@@ -509,6 +873,12 @@ class MetaLineActions(LineBuffer.__class__):
     _acache = dict()
     _acacheuse = False
 
+    # LRU memo of the values calculated in "once" mode, keyed on the
+    # structure of the calculation (see _memokey) and kept across runs
+    _amemo = collections.OrderedDict()
+    _amemosize = 0
+    _amemostats = dict(hits=0, misses=0, evictions=0)
+
     @classmethod
     def cleancache(cls):
         cls._acache = dict()
@@ -517,6 +887,77 @@ class MetaLineActions(LineBuffer.__class__):
     def usecache(cls, onoff):
         cls._acacheuse = onoff
 
+    @classmethod
+    def cleanmemo(cls):
+        cls._amemo = collections.OrderedDict()
+        cls._amemostats = dict(hits=0, misses=0, evictions=0)
+
+    @classmethod
+    def usememo(cls, size):
+        '''
+        Keeps up to ``size`` calculated lines (operations and indicators) in
+        the memo. ``0`` deactivates it and releases the kept values
+        '''
+        cls._amemosize = size or 0
+        cls._memotrim()
+
+    @classmethod
+    def memostats(cls):
+        '''
+        Returns the hits, misses and evictions of the memo since it was last
+        cleaned, the number of entries and the hit rate
+        '''
+        stats = collections.OrderedDict()
+        for k in ('hits', 'misses', 'evictions'):
+            stats[k] = cls._amemostats[k]
+
+        stats['entries'] = len(cls._amemo)
+        lookups = stats['hits'] + stats['misses']
+        stats['hitrate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    @classmethod
+    def memoget(cls, mkey):
+        '''
+        Returns the values kept in the memo for ``mkey`` or ``None``
+        '''
+        if mkey is None or not cls._amemosize:
+            return None
+
+        try:
+            values = cls._amemo.pop(mkey)
+        except TypeError:  # something not hashable
+            return None
+        except KeyError:
+            cls._amemostats['misses'] += 1
+            return None
+
+        cls._amemo[mkey] = values  # back in as most recently used
+        cls._amemostats['hits'] += 1
+        return values
+
+    @classmethod
+    def memoput(cls, mkey, values):
+        '''
+        Keeps ``values`` in the memo under ``mkey``, evicting the least
+        recently used entries if needed
+        '''
+        if mkey is None or not cls._amemosize:
+            return
+
+        try:
+            cls._amemo[mkey] = values
+        except TypeError:  # something not hashable
+            return
+
+        cls._memotrim()
+
+    @classmethod
+    def _memotrim(cls):
+        while len(cls._amemo) > cls._amemosize:
+            cls._amemo.popitem(last=False)
+            cls._amemostats['evictions'] += 1
+
     def __call__(cls, *args, **kwargs):
         if not cls._acacheuse:
             return super(MetaLineActions, cls).__call__(*args, **kwargs)
@@ -556,6 +997,9 @@ class MetaLineActions(LineBuffer.__class__):
         # update own minperiod if needed
         _obj.updateminperiod(_minperiod)
 
+        # The arguments identify the calculation for the memo
+        _obj._memoargs = (args, kwargs)
+
         return _obj, args, kwargs
 
     def dopostinit(cls, _obj, *args, **kwargs):
@@ -579,6 +1023,27 @@ class PseudoArray(object):
     def array(self):
         return self
 
+    def ndarray(self):
+        return None
+
+    def _memokey(self):
+        return (PseudoArray, self.wrapped)
+
+
+def _memokeys(objs):
+    # memo keys of the lines objects in objs (other objects are their own
+    # key) or None if any of the lines objects cannot be identified
+    keys = list()
+    for obj in objs:
+        if isinstance(obj, (LineRoot, PseudoArray)):
+            obj = obj._memokey()
+            if obj is None:
+                return None
+
+        keys.append(obj)
+
+    return tuple(keys)
+
 
 class LineActions(with_metaclass(MetaLineActions, LineBuffer)):
     '''
@@ -587,6 +1052,11 @@ class LineActions(with_metaclass(MetaLineActions, LineBuffer)):
     providing operational _next and _once interfaces.
 
     The metaclass does the dirty job of calculating minperiods and registering
+
+    If the memo is active (see ``MetaLineActions.usememo``) the values
+    calculated in "once" mode are kept and reused by any later object
+    performing the same calculation: same class, same arguments and same
+    input values
     '''
 
     _ltype = LineBuffer.IndType
@@ -622,17 +1092,80 @@ class LineActions(with_metaclass(MetaLineActions, LineBuffer)):
         else:
             self.prenext()
 
+    def _memokey(self):
+        try:
+            return self._mkey
+        except AttributeError:
+            pass
+
+        args, kwargs = self._memoargs
+        akeys = _memokeys(args)
+        kkeys = _memokeys(kwargs.values())
+        if akeys is None or kkeys is None:
+            self._mkey = None
+        else:
+            self._mkey = (type(self), akeys, tuple(zip(kwargs, kkeys)))
+
+        return self._mkey
+
     def _once(self):
         self.forward(size=self._clock.buflen())
         self.home()
 
-        self.preonce(0, self._minperiod - 1)
-        self.oncestart(self._minperiod - 1, self._minperiod)
-        self.once(self._minperiod, self.buflen())
+        mkey = self._memokey() if LineActions._amemosize else None
+        values = LineActions.memoget(mkey)
+        if values is not None:
+            self._memoload(values)
+        else:
+            self.preonce(0, self._minperiod - 1)
+            self.oncestart(self._minperiod - 1, self._minperiod)
+            self.once(self._minperiod, self.buflen())
+            LineActions.memoput(mkey, self._memosave())
+
+        self.oncebinding()
+
 
+    def _onceblock(self):
+        # calculate the values delivered by the clock since the last block
+        # (see the "onceblock" parameter of Cerebro)
+        start, end = self.buflen(), self._clock.buflen()
+        self.forward(size=end - start)
+        oncerange(self, start, end, self._trimmed)
         self.oncebinding()
 
 
+def oncerange(obj, start, end, trimmed=0):
+    '''
+    Calls ``preonce``, ``oncestart`` and ``once`` of ``obj`` to calculate the
+    values from ``start`` to ``end`` (counted from the first value of the
+    clock), as ``_once`` does for all values. ``trimmed`` values have been
+    removed from the beginning of the buffers, and the positions passed to the
+    methods are relative to the first kept value
+    '''
+    minper = obj._minperiod
+    if start < minper - 1:
+        obj.preonce(start - trimmed, min(end, minper - 1) - trimmed)
+
+    if start <= minper - 1 < end:
+        obj.oncestart(minper - 1 - trimmed, minper - trimmed)
+
+    start = max(start, minper)
+    if start < end:
+        obj.once(start - trimmed, end - trimmed)
+
+
+def blockseek(obj, pos):
+    '''
+    Moves the index of the lines of ``obj`` (a line or a lines object) right
+    before the value at position ``pos`` of the buffers, as ``home`` does for
+    the 1st value, keeping the length consistent with the values removed
+    with ``trim``
+    '''
+    for line in obj.lines:
+        line.idx = pos - 1
+        line.lencount = pos + line._trimmed
+
+
 def LineDelay(a, ago=0, **kwargs):
     if ago <= 0:
         return _LineDelay(a, ago, **kwargs)
@@ -663,10 +1196,17 @@ class _LineDelay(LineActions):
         self[0] = self.a[self.ago]
 
     def once(self, start, end):
+        ago = self.ago
+        if start + ago >= 0:
+            dst = self.ndarray()
+            src = self.a.ndarray()
+            if dst is not None and src is not None:
+                dst[start:end] = src[start + ago:end + ago]
+                return
+
         # cache python dictionary lookups
         dst = self.array
         src = self.a.array
-        ago = self.ago
 
         for i in range(start, end):
             dst[i] = src[i + ago]
@@ -722,6 +1262,11 @@ class LinesOperation(LineActions):
     No real execution time benefits were appreciated and therefore the loops
     have been kept in place for clarity (although the maps are not really
     unclear here)
+
+    If numpy is available, the operation is a known arithmetic or comparison
+    operator and the operands are buffers (or numbers), the "once" operation
+    is executed with a single ufunc call over the slice. Anything else falls
+    back to the loops
     '''
 
     def __init__(self, a, b, operation, r=False):
@@ -751,6 +1296,9 @@ class LinesOperation(LineActions):
             self[0] = self.operation(self.a, self.b[0])
 
     def once(self, start, end):
+        if self._once_np(start, end):
+            return
+
         if self.bline:
             self._once_op(start, end)
         elif not self.r:
@@ -761,6 +1309,40 @@ class LinesOperation(LineActions):
         else:
             self._once_val_op_r(start, end)
 
+    def _once_np(self, start, end):
+        ufunc = _npufuncs.get(self.operation, None)
+        if ufunc is None or self.btime:
+            return False
+
+        dst = self.ndarray()
+        if dst is None:
+            return False
+
+        if self.bline:
+            srca, srcb = self.a.ndarray(), self.b.ndarray()
+        elif not self.r:
+            srca, srcb = self.a.ndarray(), self.b
+        else:
+            srca, srcb = self.a, self.b.ndarray()
+
+        srcs = []
+        for src in (srca, srcb):
+            if isinstance(src, np.ndarray):
+                src = src[start:end]
+            elif not isinstance(src, integer_types + (float,)):
+                return False  # no buffer or no plain number
+
+            srcs.append(src)
+
+        srca, srcb = srcs
+        if self.operation in _npzerodiv and not np.all(srcb):
+            return False  # let python raise the exception
+
+        with np.errstate(all='ignore'):
+            ufunc(srca, srcb, out=dst[start:end])
+
+        return True
+
     def _once_op(self, start, end):
         # cache python dictionary lookups
         dst = self.array
@@ -771,7 +1353,31 @@ class LinesOperation(LineActions):
         for i in range(start, end):
             dst[i] = op(srca[i], srcb[i])
 
+    def _once_time_np(self, start, end):
+        # the time of the day of the whole range as microseconds, from the
+        # datetime64 values of the line
+        tm = self.b
+        if self.operation not in _nptimecmp or self._tz is not None or \
+           tm.tzinfo is not None:
+            return False
+
+        dst = self.ndarray()
+        dts = self.a.datetime64()
+        if dst is None or dts is None:
+            return False
+
+        dts = dts[start:end]
+        daymus = (dts - dts.astype('datetime64[D]')).view(np.int64)
+        tmmus = ((tm.hour * 60 + tm.minute) * 60 + tm.second) * 1000000 + \
+            tm.microsecond
+
+        _npufuncs[self.operation](daymus, tmmus, out=dst[start:end])
+        return True
+
     def _once_time_op(self, start, end):
+        if self._once_time_np(start, end):
+            return
+
         # cache python dictionary lookups
         dst = self.array
         srca = self.a.array
@@ -820,6 +1426,14 @@ class LineOwnOperation(LineActions):
         self[0] = self.operation(self.a[0])
 
     def once(self, start, end):
+        ufunc = _npufuncs.get(self.operation, None)
+        if ufunc is not None:
+            dst = self.ndarray()
+            srca = self.a.ndarray()
+            if dst is not None and srca is not None:
+                ufunc(srca[start:end], out=dst[start:end])
+                return
+
         # cache python dictionary lookups
         dst = self.array
         srca = self.a.array
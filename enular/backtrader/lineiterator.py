@@ -29,12 +29,36 @@ from .utils.py3 import map, range, zip, with_metaclass, string_types
 from .utils import DotDict
 
 from .lineroot import LineRoot, LineSingle
-from .linebuffer import LineActions, LineNum
-from .lineseries import LineSeries, LineSeriesMaker
+from .linebuffer import LineActions, LineNum, blockseek, oncerange
+from .lineseries import Lines, LineSeries, LineSeriesMaker, LineSeriesStub
 from .dataseries import DataSeries
 from . import metabase
 
 
+_datanames = dict()
+
+
+def datanames(lines, d):
+    '''Returns the (name, index) pairs of the aliases of ``lines`` (those of
+    the data ``d``) in a ``LineIterator``'''
+    key = (lines.__class__, lines.fullsize(), d)
+    try:
+        return _datanames[key]
+    except KeyError:
+        pass
+
+    names = []
+    for l in range(lines.fullsize()):
+        linealias = lines._getlinealias(l)
+        prefixes = ('data_', 'data%d_' % d) if not d else ('data%d_' % d,)
+        for prefix in prefixes:
+            if linealias:
+                names.append((prefix + linealias, l))
+            names.append((prefix + str(l), l))
+
+    return _datanames.setdefault(key, tuple(names))
+
+
 class MetaLineIterator(LineSeries.__class__):
     def donew(cls, *args, **kwargs):
         _obj, args, kwargs = \
@@ -80,22 +104,15 @@ class MetaLineIterator(LineSeries.__class__):
         # For each found data add access member -
         # for the first data 2 (data and data0)
         if _obj.datas:
-            _obj.data = data = _obj.datas[0]
-
-            for l, line in enumerate(data.lines):
-                linealias = data._getlinealias(l)
-                if linealias:
-                    setattr(_obj, 'data_%s' % linealias, line)
-                setattr(_obj, 'data_%d' % l, line)
+            _obj.data = _obj.datas[0]
 
+            odict = _obj.__dict__
             for d, data in enumerate(_obj.datas):
-                setattr(_obj, 'data%d' % d, data)
+                odict['data%d' % d] = data
 
-                for l, line in enumerate(data.lines):
-                    linealias = data._getlinealias(l)
-                    if linealias:
-                        setattr(_obj, 'data%d_%s' % (d, linealias), line)
-                    setattr(_obj, 'data%d_%d' % (d, l), line)
+                lines = data.lines
+                for name, l in datanames(lines, d):
+                    odict[name] = lines[l]
 
         # Parameter values have now been set before __init__
         _obj.dnames = DotDict([(d._name, d)
@@ -148,6 +165,17 @@ class MetaLineIterator(LineSeries.__class__):
 class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
     _nextforce = False  # force cerebro to run in next mode (runonce=False)
 
+    # values calculated and removed from the buffers when calculating in
+    # blocks (see _onceblock)
+    _oncelen = 0
+    _trimmed = 0
+
+    # flat list of the steps of the indicators in _next (see _buildplan)
+    # and number of indicators added (anywhere) when it was built
+    _plan = None
+    _planadds = 0
+    _additions = 0
+
     _mindatas = 1
     _ltype = LineSeries.IndType
 
@@ -208,6 +236,7 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
     def addindicator(self, indicator):
         # store in right queue
         self._lineiterators[indicator._ltype].append(indicator)
+        LineIterator._additions += 1  # execution plans have to be rebuilt
 
         # use getattr because line buffers don't have this attribute
         if getattr(indicator, '_nextforce', False):
@@ -259,8 +288,14 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
     def _next(self):
         clock_len = self._clk_update()
 
-        for indicator in self._lineiterators[LineIterator.IndType]:
-            indicator._next()
+        if self._plan is None:
+            for indicator in self._lineiterators[LineIterator.IndType]:
+                indicator._next()
+        else:
+            if self._planadds != LineIterator._additions:
+                self._buildplan()  # indicators added since the last build
+
+            _runplan(self._plan)
 
         self._notify()
 
@@ -290,6 +325,32 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
 
         return clock_len
 
+    def _buildplan(self, clear=False):
+        '''Flattens the tree of indicators under this object into a list of
+        steps which _next executes in place of the recursive _next calls of
+        the indicators
+
+        Each step holds the bound methods to call, the minperiod and the
+        line buffers (of the clock and of the indicator) which give the
+        lengths to compare. Children are calculated in between the forward
+        and the calculation of their owner, as in the recursive calls
+
+        Indicators with their own _next (or _clk_update/_notify) are
+        executed with it
+
+        With ``clear`` the plan is removed
+        '''
+        if clear:
+            self._plan = None
+            return
+
+        plan = []
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            _planadd(plan, indicator)
+
+        self._plan = plan
+        self._planadds = LineIterator._additions
+
     def _once(self):
         self.forward(size=self._clock.buflen())
 
@@ -320,6 +381,32 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
         for line in self.lines:
             line.oncebinding()
 
+    def _onceblock(self):
+        # "_once" for the values delivered by the clock since the last block
+        # (see the "onceblock" parameter of Cerebro). The buffers keep only
+        # the last values and the lines are positioned at the 1st value of
+        # the block, instead of being homed
+        start, end = self._oncelen, self._clock.buflen()
+        self.forward(size=end - start)
+
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            indicator._onceblock()
+
+        pos = start - self._trimmed
+        for data in self.datas:
+            blockseek(data, pos)
+
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            blockseek(indicator, pos)
+
+        blockseek(self, pos)
+
+        oncerange(self, start, end, self._trimmed)
+        self._oncelen = end
+
+        for line in self.lines:
+            line.oncebinding()
+
     def preonce(self, start, end):
         pass
 
@@ -375,6 +462,217 @@ class LineIterator(with_metaclass(MetaLineIterator, LineSeries)):
         for data in self.datas:
             data.minbuffer(self._minperiod)
 
+    def _prune(self, savemem=False):
+        '''
+        Builds the dependency graph of the indicators (and line operations)
+        below this lineiterator and removes those whose output is not read by
+        anyone, so that they are neither calculated nor stored
+
+        The lineiterators directly below this one (and their observers) are
+        the consumers: anything they hold in their attributes, params or
+        inputs is read, and so on down the graph. An indicator is kept if
+        anything below it is kept. The minimum periods are not changed
+
+        With ``savemem`` the lines of the kept indicators which are read by
+        no one else (only by the indicator itself) keep only the values of
+        the minimum period of the indicator plus 1: an indicator can read its
+        own lines back to ``[-minperiod]``. This is only possible if the
+        calculation is not vectorized
+
+        Returns the number of removed indicators
+        '''
+        owners = dict()  # id(node) -> registering lineiterator
+        nodes = list()
+        pending = [self]
+        while pending:
+            lineiter = pending.pop()
+            for ind in getattr(lineiter, '_lineiterators', {}).get(
+                    LineIterator.IndType, []):
+                owners[id(ind)] = lineiter
+                nodes.append(ind)
+                pending.append(ind)
+
+        # lines of the nodes -> node producing them (operations are lines)
+        producer = dict()
+        for node in nodes:
+            if isinstance(node, LineActions):
+                producer[id(node)] = node
+            else:
+                for line in node.lines:
+                    producer[id(line)] = node
+
+        # the values of a line with bindings are produced by the binder
+        binders = collections.defaultdict(list)
+        ownlines = set(id(line) for line in self.lines)
+        for node in nodes:
+            lines = [node] if isinstance(node, LineActions) else node.lines
+            for line in lines:
+                for binding in line.bindings:
+                    if id(binding) in producer:
+                        binders[id(producer[id(binding)])].append(node)
+                    elif id(binding) in ownlines:
+                        binders[id(self)].append(node)
+
+        live = dict()
+        consumed = set()  # ids of the lines read by another node
+
+        def consume(obj):
+            if isinstance(obj, LineSeriesStub):
+                obj = obj.lines[0]
+
+            node = producer.get(id(obj), None)
+            if node is not None:
+                consumed.add(id(obj))
+            elif id(obj) in owners:
+                node = obj  # the whole indicator is read
+                consumed.update(id(line) for line in obj.lines)
+            else:
+                return  # data feeds, the consumers ...
+
+            while id(node) in owners and id(node) not in live:
+                live[id(node)] = node
+                pending.append(node)
+                node = owners[id(node)]  # the owner calculates the node
+
+        pending = [self]
+        for itcls in self._lineiterators:
+            for lineiter in self._lineiterators[itcls]:
+                consume(lineiter)
+                pending.append(lineiter)
+
+        while pending:
+            node = pending.pop()
+            # its own lines (aliases like line0) are not read from another
+            lines = [node] if isinstance(node, LineActions) else node.lines
+            ownids = set(id(line) for line in lines)
+            for obj in _lineinputs(node):
+                if id(obj) not in ownids:
+                    consume(obj)
+
+            for binder in binders[id(node)]:
+                consume(binder)
+
+        removed = 0
+        for node in nodes:
+            if id(node) not in live:
+                owner = owners[id(node)]
+                inds = owner._lineiterators[LineIterator.IndType]
+                inds[:] = [ind for ind in inds if ind is not node]
+                removed += 1
+
+        if savemem:
+            toplevel = set(id(x) for x in self._lineiterators[self.IndType])
+            for node in live.values():
+                if isinstance(node, LineActions) or id(node) in toplevel:
+                    continue  # operations are read, the top level plotted
+
+                # the node may read its own values back to its minperiod
+                for line in node.lines:
+                    if id(line) not in consumed:
+                        line.qbuffer()
+                        line.minbuffer(node._minperiod + 1)
+
+        return removed
+
+
+# attributes of a lineiterator which are not its inputs
+_noinputs = ('_owner', '_lineiterators', 'lines', '_opcache', '_plan')
+
+
+def _lineinputs(node, depth=3):
+    '''Yields the line objects held by the attributes and params of "node"
+    (also inside lists, tuples, sets and dictionaries)'''
+    objs = [v for k, v in vars(node).items() if k not in _noinputs]
+    params = getattr(node, 'p', None)
+    if params is not None and hasattr(params, '_getvalues'):
+        objs.extend(params._getvalues())
+
+    for i in range(depth):
+        nobjs = []
+        for obj in objs:
+            if isinstance(obj, LineRoot):
+                yield obj
+            elif isinstance(obj, Lines):
+                nobjs.extend(obj.lines)
+            elif isinstance(obj, dict):
+                nobjs.extend(obj.keys())
+                nobjs.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                nobjs.extend(obj)
+
+        objs = nobjs
+
+
+# kinds of steps of an execution plan (see LineIterator._buildplan)
+_PLANNEXT, _PLANFORWARD, _PLANCALC, _PLANACTION, _PLANCALL = range(5)
+
+
+def _planline(obj):
+    '''Returns the line buffer whose length is that of obj'''
+    if isinstance(obj, LineSeries) and \
+            type(obj).__len__ is LineSeries.__len__ and obj.lines.fullsize():
+        return obj.lines[0]
+
+    return obj
+
+
+def _planadd(plan, node):
+    '''Adds the steps which calculate node to the plan'''
+    cls = type(node)
+    if isinstance(node, LineActions):
+        if cls._next is not LineActions._next:
+            plan.append((_PLANCALL, None, None, 0, node._next, None, None,
+                         None))
+            return
+
+        kind = _PLANACTION
+    elif cls._next is not LineIterator._next or \
+            cls._clk_update is not LineIterator._clk_update or \
+            cls._notify is not LineIterator._notify:
+        plan.append((_PLANCALL, None, None, 0, node._next, None, None, None))
+        return
+    else:
+        children = node._lineiterators[LineIterator.IndType]
+        kind = _PLANCALC if children else _PLANNEXT
+
+    step = (kind, _planline(node._clock), _planline(node), node._minperiod,
+            node.forward, node.next, node.nextstart, node.prenext)
+
+    if kind == _PLANCALC:
+        # forward, children and then the calculation
+        plan.append((_PLANFORWARD,) + step[1:])
+        for child in children:
+            _planadd(plan, child)
+
+    plan.append(step)
+
+
+def _runplan(plan):
+    '''Executes the steps of an execution plan for a bar'''
+    for kind, clock, line, minperiod, forward, next_, nextstart, prenext \
+            in plan:
+        if kind == _PLANCALL:
+            forward()  # the _next of the object
+            continue
+
+        clock_len = len(clock)
+        if kind == _PLANACTION:
+            if clock_len > len(line):
+                forward()
+        elif kind != _PLANCALC:  # next, forward: LineIterator._clk_update
+            if clock_len != len(line):
+                forward()
+
+            if kind == _PLANFORWARD:
+                continue  # the children are calculated in the next steps
+
+        if clock_len > minperiod:
+            next_()
+        elif clock_len == minperiod:
+            nextstart()  # only called for the 1st value
+        elif clock_len or kind == _PLANACTION:
+            prenext()
+
 
 # This 3 subclasses can be used for identification purposes within LineIterator
 # or even outside (like in LineObservers)
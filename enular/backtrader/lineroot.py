@@ -42,17 +42,34 @@ class MetaLineRoot(metabase.MetaParams):
     '''
     Once the object is created (effectively pre-init) the "owner" of this
     class is sought
+
+    The owner is looked for first amongst the objects still being created
+    (the object is for example created in the ``__init__`` of the owner) and
+    only else by inspecting the frames of the stack
     '''
 
+    def __call__(cls, *args, **kwargs):
+        ownerstack = metabase.ownerstack()
+        depth = len(ownerstack)
+        try:
+            return super(MetaLineRoot, cls).__call__(*args, **kwargs)
+        finally:
+            del ownerstack[depth:]  # done with the creation (or failed)
+
     def donew(cls, *args, **kwargs):
         _obj, args, kwargs = super(MetaLineRoot, cls).donew(*args, **kwargs)
 
         # Find the owner and store it
-        # startlevel = 4 ... to skip intermediate call stacks
         ownerskip = kwargs.pop('_ownerskip', None)
-        _obj._owner = metabase.findowner(_obj,
-                                         _obj._OwnerCls or LineMultiple,
-                                         skip=ownerskip)
+        ownercls = _obj._OwnerCls or LineMultiple
+        owner = metabase.findcreator(_obj, ownercls, skip=ownerskip)
+        if owner is None:
+            owner = metabase.findowner(_obj, ownercls, skip=ownerskip)
+
+        _obj._owner = owner
+
+        # Owner of what is created until the creation is over
+        metabase.ownerstack().append(_obj)
 
         # Parameter values have now been set before __init__
         return _obj, args, kwargs
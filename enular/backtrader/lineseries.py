@@ -33,7 +33,7 @@ from __future__ import (absolute_import, division, print_function,
 
 import sys
 
-from .utils.py3 import map, range, string_types, with_metaclass
+from .utils.py3 import map, range, string_types, with_metaclass, zip
 
 from .linebuffer import LineBuffer, LineActions, LinesOperation, LineDelay, NAN
 from .lineroot import LineRoot, LineSingle, LineMultiple
@@ -281,6 +281,13 @@ class Lines(object):
         for line in self.lines:
             line.reset()
 
+    def reserve(self, size):
+        '''
+        Proxy line operation
+        '''
+        for line in self.lines:
+            line.reserve(size)
+
     def home(self):
         '''
         Proxy line operation
@@ -302,6 +309,18 @@ class Lines(object):
         return self.lines[line].buflen()
 
 
+_linenames = []
+
+
+def linenames(size):
+    '''Returns the names ('line_X', 'lineX') of the aliases of the first
+    ``size`` lines'''
+    for l in range(len(_linenames), size):
+        _linenames.append(('line_%d' % l, 'line%d' % l))
+
+    return _linenames[:size]
+
+
 class MetaLineSeries(LineMultiple.__class__):
     '''
     Dirty job manager for a LineSeries
@@ -410,10 +429,7 @@ class MetaLineSeries(LineMultiple.__class__):
         aliases for "lines" and the "lines" held within it
         '''
         # _obj.plotinfo shadows the plotinfo (class) definition in the class
-        plotinfo = cls.plotinfo()
-
-        for pname, pdef in cls.plotinfo._getitems():
-            setattr(plotinfo, pname, kwargs.pop(pname, pdef))
+        plotinfo = cls.plotinfo._fromkwargs(kwargs)
 
         # Create the object and set the params in place
         _obj, args, kwargs = super(MetaLineSeries, cls).donew(*args, **kwargs)
@@ -432,10 +448,10 @@ class MetaLineSeries(LineMultiple.__class__):
         if _obj.lines.fullsize():
             _obj.line = _obj.lines[0]
 
-        for l, line in enumerate(_obj.lines):
-            setattr(_obj, 'line_%s' % l, _obj._getlinealias(l))
-            setattr(_obj, 'line_%d' % l, line)
-            setattr(_obj, 'line%d' % l, line)
+        odict = _obj.__dict__
+        names = linenames(_obj.lines.fullsize())
+        for (name_, name), line in zip(names, _obj.lines):
+            odict[name_] = odict[name] = line
 
         # Parameter values have now been set before __init__
         return _obj, args, kwargs
@@ -565,12 +581,20 @@ class LineSeries(with_metaclass(MetaLineSeries, LineMultiple)):
     def reset(self):
         self.lines.reset()
 
+    def reserve(self, size):
+        self.lines.reserve(size)
+
     def home(self):
         self.lines.home()
 
     def advance(self, size=1):
         self.lines.advance(size)
 
+    def _memokey(self):
+        # key identifying the values of the lines for the memo of calculated
+        # lines. Only indicators and data feeds can be identified
+        return None
+
 
 class LineSeriesStub(LineSeries):
     '''Simulates a LineMultiple object based on LineSeries from a single line
@@ -620,6 +644,10 @@ class LineSeriesStub(LineSeries):
         if not self.slave:
             super(LineSeriesStub, self).reset()
 
+    def reserve(self, size):
+        if not self.slave:
+            super(LineSeriesStub, self).reserve(size)
+
     def home(self):
         if not self.slave:
             super(LineSeriesStub, self).home()
@@ -636,6 +664,9 @@ class LineSeriesStub(LineSeries):
         if not self.slave:
             super(LineSeriesStub, self).minbuffer(size)
 
+    def _memokey(self):
+        return self.lines[0]._memokey()
+
 
 def LineSeriesMaker(arg, slave=False):
     if isinstance(arg, LineSeries):
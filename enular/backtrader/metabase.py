@@ -24,6 +24,7 @@ from __future__ import (absolute_import, division, print_function,
 from collections import OrderedDict
 import itertools
 import sys
+import threading
 
 import backtrader as bt
 from .utils.py3 import zip, string_types, with_metaclass
@@ -63,6 +64,34 @@ def findowner(owned, cls, startlevel=2, skip=None):
     return None
 
 
+_creating = threading.local()
+
+
+def ownerstack():
+    '''Returns the (per thread) stack of the objects in the middle of their
+    creation, innermost last'''
+    try:
+        return _creating.stack
+    except AttributeError:
+        _creating.stack = stack = []
+        return stack
+
+
+def findcreator(owned, cls, skip=None):
+    '''Returns the innermost object of class ``cls`` in the middle of its
+    creation (other than ``owned`` and ``skip``) or ``None``
+
+    Objects are created during the creation of their owner (in ``__init__``
+    mostly) and this is the owner ``findowner`` would find, without having to
+    inspect the frames
+    '''
+    for obj in reversed(ownerstack()):
+        if obj is not owned and obj is not skip and isinstance(obj, cls):
+            return obj
+
+    return None
+
+
 class MetaBase(type):
     def doprenew(cls, *args, **kwargs):
         return cls, args, kwargs
@@ -140,6 +169,11 @@ class AutoInfoClass(object):
         setattr(newcls, '_getpairs', classmethod(lambda cls: clsinfo.copy()))
         setattr(newcls, '_getrecurse', classmethod(lambda cls: recurse))
 
+        # keys/items are asked for each instance: no copy is needed for them
+        clskeys, clsitems = tuple(clsinfo.keys()), tuple(clsinfo.items())
+        setattr(newcls, '_getkeys', classmethod(lambda cls: clskeys))
+        setattr(newcls, '_getitems', classmethod(lambda cls: clsitems))
+
         for infoname, infoval in info2add.items():
             if recurse:
                 recursecls = getattr(newcls, infoname, AutoInfoClass)
@@ -189,6 +223,20 @@ class AutoInfoClass(object):
     def _getvalues(self):
         return [getattr(self, x) for x in self._getkeys()]
 
+    @classmethod
+    def _fromkwargs(cls, kwargs):
+        '''Returns an instance with the values taken (and removed) from
+        ``kwargs`` or else the defaults'''
+        obj = cls()
+        values = obj.__dict__
+        if kwargs:
+            for name, default in cls._getitems():
+                values[name] = kwargs.pop(name, default)
+        else:
+            values.update(cls._getitems())
+
+        return obj
+
     def __new__(cls, *args, **kwargs):
         obj = super(AutoInfoClass, cls).__new__(cls, *args, **kwargs)
 
@@ -280,9 +328,7 @@ class MetaParams(MetaBase):
                     setattr(sys.modules[basecls.__module__], falias, pattr)
 
         # Create params and set the values from the kwargs
-        params = cls.params()
-        for pname, pdef in cls.params._getitems():
-            setattr(params, pname, kwargs.pop(pname, pdef))
+        params = cls.params._fromkwargs(kwargs)
 
         # Create the object and set the params in place
         _obj, args, kwargs = super(MetaParams, cls).donew(*args, **kwargs)
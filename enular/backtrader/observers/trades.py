@@ -105,6 +105,10 @@ class Trades(Observer):
 
 
 class MetaDataTrades(Observer.__class__):
+    def __init__(cls, name, bases, dct):
+        super(MetaDataTrades, cls).__init__(name, bases, dct)
+        cls._derived = dict()  # lines names -> lines/plotlines classes
+
     def donew(cls, *args, **kwargs):
         _obj, args, kwargs = super(MetaDataTrades, cls).donew(*args, **kwargs)
 
@@ -114,11 +118,21 @@ class MetaDataTrades(Observer.__class__):
         else:
             lnames = tuple('data{}'.format(x) for x in range(len(_obj.datas)))
 
-        # Generate a new lines class
-        linescls = cls.lines._derive(uuid.uuid4().hex, lnames, 0, ())
+        # Generate a new lines/plotlines class (once for the same names)
+        try:
+            linescls, plotlines = cls._derived[lnames]
+        except KeyError:
+            linescls, plotlines = cls._derived.setdefault(
+                lnames, cls._derivelines(lnames))
 
         # Instantiate lines
         _obj.lines = linescls()
+        _obj.plotlines = plotlines()
+
+        return _obj, args, kwargs  # return the instantiated object and args
+
+    def _derivelines(cls, lnames):
+        linescls = cls.lines._derive(uuid.uuid4().hex, lnames, 0, ())
 
         # Generate plotlines info
         markers = ['o', 'v', '^', '<', '>', '1', '2', '3', '4', '8', 's', 'p',
@@ -136,9 +150,8 @@ class MetaDataTrades(Observer.__class__):
 
         plotlines = cls.plotlines._derive(
             uuid.uuid4().hex, plines, [], recurse=True)
-        _obj.plotlines = plotlines()
 
-        return _obj, args, kwargs  # return the instantiated object and args
+        return linescls, plotlines
 
 
 class DataTrades(with_metaclass(MetaDataTrades, Observer)):
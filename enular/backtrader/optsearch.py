@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import collections
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # model based searches are not available
+
+from .metabase import MetaParams
+from .utils.py3 import string_types, with_metaclass
+
+
+__all__ = ['OptInt', 'OptFloat', 'OptSearch', 'RandomSearch', 'TPESearch']
+
+
+class OptFloat(object):
+    '''Continuous parameter for an ``OptSearch`` in ``[low, high]``
+
+    With ``log`` the values are searched on a logarithmic scale (``low`` must
+    be greater than ``0``)
+    '''
+    def __init__(self, low, high, log=False):
+        self.low, self.high, self.log = low, high, log
+        if log:
+            self._a, self._b = math.log(low), math.log(high)
+        else:
+            self._a, self._b = low, high
+
+    def fromunit(self, u):
+        '''Value for the position ``u`` in ``[0, 1]`` of the range'''
+        v = self._a + u * (self._b - self._a)
+        v = math.exp(v) if self.log else v
+        return min(max(v, self.low), self.high)
+
+    def tounit(self, v):
+        '''Position in ``[0, 1]`` of the range for the value ``v``'''
+        v = math.log(v) if self.log else v
+        return (v - self._a) / ((self._b - self._a) or 1.0)
+
+
+class OptInt(OptFloat):
+    '''Integer parameter for an ``OptSearch`` in ``[low, high]`` (both
+    included)
+
+    With ``log`` the values are searched on a logarithmic scale (``low`` must
+    be greater than ``0``)
+    '''
+    def __init__(self, low, high, log=False):
+        super(OptInt, self).__init__(low, high + 1, log=log)
+        self.high = high
+
+    def fromunit(self, u):
+        v = self._a + u * (self._b - self._a)
+        v = int(math.floor(math.exp(v) if self.log else v))
+        return min(max(v, self.low), self.high)
+
+    def tounit(self, v):
+        return super(OptInt, self).tounit(v + 0.5)  # center of the value
+
+
+class OptSearch(with_metaclass(MetaParams, object)):
+    '''Base class of the searches which can replace the grid of
+    ``Cerebro.optstrategy`` (see the ``optsearch`` parameter of ``Cerebro``)
+
+    The values given to ``optstrategy`` define the search space:
+
+      - ``OptInt`` and ``OptFloat`` instances: ranges of values
+
+      - iterables (``list``, ``tuple``, ``range``): choice of one of the
+        values
+
+      - anything else: fixed value
+
+    The search is asked for parameter sets to run and is told the score of
+    each run (the ``optscore`` of ``optrank``, higher is better)
+
+    Params:
+
+      - ``budget`` (default: ``100``): maximum number of runs. ``None`` for
+        no limit (then a ``timeout`` should be set)
+
+      - ``timeout`` (default: ``None``): seconds after which no more runs are
+        started
+
+      - ``seed`` (default: ``None``): seed of the random generator
+
+    The parameter sets are sampled uniformly (as in ``RandomSearch``).
+    Subclasses override ``sample`` to generate them otherwise
+    '''
+    params = (
+        ('budget', 100),
+        ('timeout', None),
+        ('seed', None),
+    )
+
+    # attempts to sample a parameter set not yet run, after which random
+    # samples are tried (up to retries)
+    samples = 10
+    retries = 100
+    sequential = True  # the scores of the runs change the next samples
+
+    def start(self, space):
+        '''Called with the search space (dictionary of parameter name to
+        value) before the first run'''
+        self.space = collections.OrderedDict()
+        self.fixed = dict()
+        for name, val in space.items():
+            if isinstance(val, OptFloat):
+                self.space[name] = val
+            elif isinstance(val, string_types):
+                self.fixed[name] = val
+            elif hasattr(val, '__iter__'):
+                self.space[name] = list(val)
+            else:
+                self.fixed[name] = val
+
+        self.trials = list()  # (params, score) of the finished runs
+        self._seen = set()
+        self.rng = random.Random(self.p.seed)
+
+    def ask(self):
+        '''Returns the next parameter set to run or ``None`` if no new one
+        can be found'''
+        for i in range(self.retries):
+            params = self.sample() if i < self.samples else self.randsample()
+            key = tuple(params[name] for name in self.space)
+            if key not in self._seen:
+                self._seen.add(key)
+                params.update(self.fixed)
+                return params
+
+        return None  # the space is probably exhausted
+
+    def tell(self, params, score):
+        '''Receives the score of a finished run'''
+        self.trials.append((params, score))
+
+    def sample(self):
+        '''Returns a parameter set (dictionary) of the search space'''
+        return self.randsample()
+
+    def randsample(self):
+        return dict((name, self.randparam(dim))
+                    for name, dim in self.space.items())
+
+    def randparam(self, dim):
+        if isinstance(dim, OptFloat):
+            return dim.fromunit(self.rng.random())
+
+        return self.rng.choice(dim)
+
+
+class RandomSearch(OptSearch):
+    '''Samples each parameter uniformly (on a logarithmic scale for ranges
+    with ``log``)'''
+    sequential = False
+
+
+class TPESearch(OptSearch):
+    '''Sequential model based search after the *Tree-structured Parzen
+    Estimator*
+
+    The finished runs are split in the best ``gamma`` fraction and the rest.
+    Each parameter gets a density estimate for both groups (gaussian kernels
+    for ranges, smoothed frequencies for choices) and the next parameter set
+    is, from ``candidates`` drawn from the density of the best, the one which
+    maximizes the ratio of the best density to the rest density
+
+    Params:
+
+      - ``startup`` (default: ``10``): runs with random parameters before
+        using the model
+
+      - ``gamma`` (default: ``0.25``): fraction of the runs considered best
+
+      - ``candidates`` (default: ``24``): number of candidates evaluated to
+        choose a parameter set
+
+    Needs ``numpy``
+    '''
+    params = (
+        ('startup', 10),
+        ('gamma', 0.25),
+        ('candidates', 24),
+    )
+
+    def __init__(self):
+        if np is None:
+            raise ImportError('TPESearch needs numpy to be installed. Please '
+                              'use pip install numpy or the method of your '
+                              'choice')
+
+    def start(self, space):
+        super(TPESearch, self).start(space)
+        self.nprng = np.random.RandomState(self.p.seed)
+
+    def sample(self):
+        if len(self.trials) < max(self.p.startup, 2):
+            return self.randsample()
+
+        scores = np.array([score for params, score in self.trials])
+        ngood = max(1, int(math.ceil(self.p.gamma * len(scores))))
+        order = np.argsort(-scores, kind='stable')
+        good, bad = order[:ngood], order[ngood:]
+
+        ncand = self.p.candidates
+        cands = [dict() for i in range(ncand)]
+        ratio = np.zeros(ncand)
+        for name, dim in self.space.items():
+            vals = [params[name] for params, score in self.trials]
+            if isinstance(dim, OptFloat):
+                units = np.array([dim.tounit(v) for v in vals])
+                x = self._kdesample(units[good], ncand)
+                ratio += (self._kdelogpdf(units[good], x) -
+                          self._kdelogpdf(units[bad], x))
+                for cand, u in zip(cands, x):
+                    cand[name] = dim.fromunit(float(u))
+            else:
+                idxs = np.array([dim.index(v) for v in vals])
+                lgood = self._catlogp(idxs[good], len(dim))
+                lbad = self._catlogp(idxs[bad], len(dim))
+                x = self.nprng.choice(len(dim), size=ncand, p=np.exp(lgood))
+                ratio += lgood[x] - lbad[x]
+                for cand, i in zip(cands, x):
+                    cand[name] = dim[int(i)]
+
+        # (noise breaks the ties of candidates with the same values)
+        best = int(np.argmax(ratio + self.nprng.uniform(0, 1e-9, ncand)))
+        return cands[best]
+
+    @staticmethod
+    def _kdebw(points):
+        # kernel widths: Scott's rule on the unit range, plus a prior
+        # kernel covering the full range
+        n = len(points) + 1
+        sigma = max(np.std(np.append(points, 0.5)) * n ** -0.2, 0.5 / n)
+        return min(sigma, 1.0)
+
+    def _kdesample(self, points, size):
+        sigma = self._kdebw(points)
+        mus = np.append(points, 0.5)
+        sigmas = np.append(np.full(len(points), sigma), 1.0)
+        comp = self.nprng.randint(0, len(mus), size=size)
+        x = self.nprng.normal(mus[comp], sigmas[comp])
+        return np.clip(x, 0.0, 1.0)
+
+    def _kdelogpdf(self, points, x):
+        sigma = self._kdebw(points)
+        mus = np.append(points, 0.5)
+        sigmas = np.append(np.full(len(points), sigma), 1.0)
+        z = (x[:, None] - mus[None, :]) / sigmas[None, :]
+        pdf = np.exp(-0.5 * z * z) / sigmas[None, :]
+        return np.log(pdf.mean(axis=1) + 1e-300)
+
+    @staticmethod
+    def _catlogp(idxs, size):
+        counts = np.bincount(idxs, minlength=size) + 1.0  # prior of 1
+        return np.log(counts / counts.sum())
@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import collections
+import io
+import json
+import os
+import time
+
+from .linebuffer import LineActions
+from .lineiterator import LineIterator
+from .metabase import MetaParams
+from .utils.py3 import string_types, with_metaclass
+
+
+__all__ = ['Profiler']
+
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+# methods timed for each kind of object
+_NEXTS = ('prenext', 'nextstart', 'next')
+_ONCES = ('preonce', 'oncestart', 'once')
+_NOTIFYS = ('notify_order', 'notify_trade', 'notify_cashvalue',
+            'notify_fund')
+
+_METHODS = {
+    'strategy': _NEXTS + ('prenext_open', 'nextstart_open', 'next_open') +
+    _NOTIFYS,
+    'indicator': _NEXTS + _ONCES,
+    'observer': _NEXTS + _ONCES,
+    'analyzer': _NEXTS + _NOTIFYS,
+    'broker': ('next',),
+    'writer': ('next',),
+}
+
+
+class _TimedFilter(object):
+    '''Stands for a filter in the list of filters of a data feed and times
+    its calls. Anything else (``check``, ``last``) goes to the filter'''
+    def __init__(self, filter, timed):
+        self._filter = filter
+        self._timed = timed
+
+    def __call__(self, *args, **kwargs):
+        return self._timed(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._filter, name)
+
+
+class Profiler(with_metaclass(MetaParams, object)):
+    '''Records the time spent by the objects of a backtest (see the
+    ``profiler`` parameter of ``Cerebro``)
+
+    Each object gets the number of calls and the cumulative wall time of its
+    methods:
+
+      - strategies: ``next`` (and the ``prenext``, ``nextstart``, ``_open``
+        variants) and the ``notify_xxx`` methods
+
+      - indicators (including the operations between lines) and observers:
+        the ``next`` and ``once`` families of methods
+
+      - analyzers: the ``next`` family and the ``notify_xxx`` methods
+
+      - broker: ``next``
+
+      - data feeds: ``load`` and ``_load`` (the former includes the latter
+        and the filters)
+
+      - filters: the calls made by the data feed
+
+      - writers: ``next``
+
+    The time is that of the methods of the object itself: the sub-indicators
+    of an indicator are accounted in their own entries, which are named after
+    the path from the strategy (``St/MACD/EMA[1]``)
+
+    Nothing is instrumented unless a profiler is given to ``Cerebro``, and
+    the objects get their methods back at the end of the run
+
+    The results of several runs (optimization) add up. The runs of
+    an optimization made in other processes are not seen: use
+    ``maxcpus=1`` to profile them
+
+    Params:
+
+      - ``trace`` (default: ``None``): name of a file in which the individual
+        calls are written in the *Chrome trace* format (``chrome://tracing``,
+        *Perfetto*, *speedscope*) at the end of each run
+
+      - ``tracelimit`` (default: ``1000000``): maximum number of calls
+        recorded for ``trace``
+
+      - ``folded`` (default: ``None``): name of a file in which the times are
+        written as folded stacks (``St;MACD;EMA 1234``, in microseconds) for
+        ``flamegraph.pl`` and compatible tools
+    '''
+    params = (
+        ('trace', None),
+        ('tracelimit', 1000000),
+        ('folded', None),
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        '''Discards the results'''
+        self.stats = collections.OrderedDict()  # path -> [calls, time, busy]
+        self.kinds = dict()  # path -> kind of object
+        self.runs = 0
+        self.runtime = 0.0
+        self.events = list() if self.p.trace else None
+        self._inclusive = set()  # paths whose time includes their children
+        self._restore = list()
+        self._t0 = None
+
+    def _stat(self, path, kind):
+        stat = self.stats.get(path)
+        if stat is None:
+            stat = self.stats[path] = [0, 0.0, False]
+            self.kinds[path] = kind
+
+        return stat
+
+    def _timer(self, func, stat, path):
+        # the calls made while the object is already busy (next from
+        # nextstart, next from the default once ...) are part of the first
+        events = self.events
+        limit = self.p.tracelimit
+
+        def timed(*args, **kwargs):
+            if stat[2]:
+                return func(*args, **kwargs)
+
+            stat[2] = True
+            t0 = _clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                t1 = _clock()
+                stat[2] = False
+                stat[0] += 1
+                stat[1] += t1 - t0
+                if events is not None and len(events) < limit:
+                    events.append((path, t0, t1 - t0))
+
+        return timed
+
+    def _wrap(self, obj, path, kind, names=None):
+        stat = self._stat(path, kind)
+        objdict = obj.__dict__
+        for name in names or _METHODS[kind]:
+            func = getattr(obj, name, None)
+            if func is None:
+                continue
+
+            self._restore.append((objdict, name, objdict.get(name)))
+            objdict[name] = self._timer(func, stat, path)
+
+    @staticmethod
+    def _names(objs):
+        # class names, with an index for repeated classes
+        counts = collections.Counter(type(obj).__name__ for obj in objs)
+        seen = collections.Counter()
+        for obj in objs:
+            name = type(obj).__name__
+            if counts[name] > 1:
+                idx = seen[name]
+                seen[name] += 1
+                name = '%s[%d]' % (name, idx)
+
+            yield obj, name
+
+    def _wraptree(self, obj, path, kind):
+        self._wrap(obj, path, kind)
+        if isinstance(obj, LineActions):
+            return  # no indicators of its own
+
+        children = obj._lineiterators[LineIterator.IndType]
+        for child, name in self._names(children):
+            self._wraptree(child, path + '/' + name, kind)
+
+    def _wrapanalyzers(self, analyzers, path):
+        for analyzer, name in self._names(analyzers):
+            apath = path + '/' + name
+            self._wrap(analyzer, apath, 'analyzer')
+            self._wrapanalyzers(analyzer._children, apath)
+
+    def _wrapdata(self, data, path):
+        # load includes _load and the filters, which are its children
+        self._wrap(data, path, 'feed', ('load',))
+        self._inclusive.add(path)
+        self._wrap(data, path + '/_load', 'feed', ('_load',))
+
+        filters = data._filters
+        if filters:
+            self._restore.append((filters, slice(None), list(filters)))
+            for i, (ff, fargs, fkwargs) in enumerate(filters):
+                fname = getattr(ff, '__name__', None) or type(ff).__name__
+                fpath = '%s/%s[%d]' % (path, fname, i)
+                timed = self._timer(ff, self._stat(fpath, 'filter'), fpath)
+                filters[i] = (_TimedFilter(ff, timed), fargs, fkwargs)
+
+    def start(self, cerebro):
+        '''Called by ``Cerebro`` at the start of a run, before the data
+        feeds are started and preloaded'''
+        self._t0 = _clock()
+        broker = cerebro.getbroker()
+        self._wrap(broker, 'broker', 'broker')
+        for i, data in enumerate(cerebro.datas):
+            self._wrapdata(data, 'data/%s' % (data._name or 'data%d' % i))
+
+        for writer, name in self._names(cerebro.runwriters):
+            self._wrap(writer, 'writer/' + name, 'writer')
+
+    def addstrategies(self, runstrats):
+        '''Called by ``Cerebro`` with the strategies ready to run'''
+        for strat, name in self._names(runstrats):
+            self._wrap(strat, name, 'strategy')
+            for ind, iname in self._names(
+                    strat._lineiterators[LineIterator.IndType]):
+                self._wraptree(ind, name + '/' + iname, 'indicator')
+
+            observers = strat._lineiterators[LineIterator.ObsType]
+            for obs, oname in self._names(observers):
+                opath = name + '/' + oname
+                self._wraptree(obs, opath, 'observer')
+                self._wrapanalyzers(obs._analyzers, opath)
+
+            analyzers = list(strat.analyzers) + strat._slave_analyzers
+            self._wrapanalyzers(analyzers, name)
+
+    def stop(self):
+        '''Called by ``Cerebro`` at the end of a run. The objects get their
+        methods back and the output files are written'''
+        for container, name, value in reversed(self._restore):
+            if isinstance(name, slice):
+                container[name] = value
+            elif value is None:
+                container.pop(name, None)
+            else:
+                container[name] = value
+
+        self._restore = list()
+        if self._t0 is not None:
+            self.runtime += _clock() - self._t0
+            self.runs += 1
+            self._t0 = None
+
+        if self.p.trace:
+            self.writetrace(self.p.trace)
+
+        if self.p.folded:
+            self.writefolded(self.p.folded)
+
+    def report(self):
+        '''Returns a list with a dictionary per object (``name``, ``kind``,
+        ``calls``, ``time``, ``percall`` and ``pct`` of the time of the
+        runs), sorted by descending time'''
+        runtime = self.runtime or 1.0
+        rows = list()
+        for path, (calls, t, busy) in self.stats.items():
+            if not calls:
+                continue
+
+            rows.append(collections.OrderedDict((
+                ('name', path),
+                ('kind', self.kinds[path]),
+                ('calls', calls),
+                ('time', t),
+                ('percall', t / calls),
+                ('pct', 100.0 * t / runtime),
+            )))
+
+        rows.sort(key=lambda row: row['time'], reverse=True)
+        return rows
+
+    def asdict(self):
+        '''Returns the results as a dictionary, ready for ``json``'''
+        return collections.OrderedDict((
+            ('runs', self.runs),
+            ('runtime', self.runtime),
+            ('objects', self.report()),
+        ))
+
+    def tojson(self, out=None, indent=2):
+        '''Returns the results in JSON format or writes them to ``out`` (a
+        file name or a stream)'''
+        text = json.dumps(self.asdict(), indent=indent)
+        if out is None:
+            return text
+
+        if isinstance(out, string_types):
+            with io.open(out, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            out.write(text)
+
+    def table(self, limit=None):
+        '''Returns the results as text, the ``limit`` most expensive
+        objects only if given'''
+        rows = self.report()[:limit]
+        width = max([len(row['name']) for row in rows] + [6])
+        fmt = '%%-%ds %%-9s %%10s %%11s %%12s %%7s' % width
+        lines = [fmt % ('object', 'kind', 'calls', 'time (s)', 'call (us)',
+                        '%')]
+        for row in rows:
+            lines.append(fmt % (row['name'], row['kind'], row['calls'],
+                                '%.6f' % row['time'],
+                                '%.3f' % (row['percall'] * 1e6),
+                                '%.2f' % row['pct']))
+
+        lines.append('%d run(s) in %.6f seconds' % (self.runs, self.runtime))
+        return '\n'.join(lines)
+
+    def writetrace(self, filename):
+        '''Writes the recorded calls in the *Chrome trace* format'''
+        pid = os.getpid()
+        events = list()
+        for path, t0, dt in self.events or ():
+            events.append(dict(name=path.rsplit('/', 1)[-1],
+                               cat=self.kinds[path], ph='X', pid=pid, tid=0,
+                               ts=t0 * 1e6, dur=dt * 1e6, args=dict(path=path)))
+
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(dict(traceEvents=events,
+                                    displayTimeUnit='ms')))
+
+    def writefolded(self, filename):
+        '''Writes the times as folded stacks (in microseconds)'''
+        selftimes = collections.OrderedDict(
+            (path, stat[1]) for path, stat in self.stats.items() if stat[0])
+
+        for path in self._inclusive:
+            prefix = path + '/'
+            for child, t in selftimes.items():
+                if child.startswith(prefix) and '/' not in child[len(prefix):]:
+                    selftimes[path] -= t
+
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            for path, t in selftimes.items():
+                f.write('%s %d\n' % (path.replace('/', ';'), max(t, 0) * 1e6))
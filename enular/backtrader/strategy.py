@@ -113,6 +113,7 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
 
     csv = True
     _oldsync = False  # update clock using old methodology : data 0
+    _oncedone = False  # results calculated in _once: no bar by bar run
 
     # keep the latest delivered data date in the line
     lines = ('datetime',)
@@ -289,6 +290,12 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
         else:
             self.prenext_open()
 
+    def _onceblock(self):
+        # calculate the indicators for a new block of bars. The strategy and
+        # the observers are run on a next basis
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            indicator._onceblock()
+
     def _oncepost(self, dt):
         for indicator in self._lineiterators[LineIterator.IndType]:
             if len(indicator._clock) > len(indicator):
@@ -25,6 +25,11 @@ import datetime
 import math
 import time as _time
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # the array conversions are not available
+
 from .py3 import string_types
 
 
@@ -227,6 +232,80 @@ def date2num(dt, tz=None):
     return base
 
 
+# ordinal of 1970-01-01, the epoch of numpy datetime64 values
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+MUSECONDS_PER_MINUTE = MUSECONDS_PER_SECOND * SECONDS_PER_MINUTE
+MUSECONDS_PER_HOUR = MUSECONDS_PER_MINUTE * MINUTES_PER_HOUR
+
+
+def _twosum(a, b):
+    # a + b as the rounded sum and its exact rounding error
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def date2numarray(dts):
+    """
+    Array version of :func:`date2num`: converts the naive (UTC)
+    ``datetime64`` values (or anything numpy converts to them) in *dts* to
+    an array of float days, equal to what ``date2num`` returns for each
+    value (the fractions of the day are summed exactly like ``math.fsum``
+    does)
+
+    Sub-microsecond parts are truncated. Raises ``ValueError`` if there is
+    a ``NaT`` (like ``date2num`` fails without a datetime). Needs numpy
+    """
+    dts = np.asarray(dts, dtype='datetime64[us]')
+    if np.isnat(dts).any():
+        raise ValueError('NaT cannot be converted to a number of days')
+
+    mus = dts.view(np.int64)
+    days, mus = np.divmod(mus, int(MUSECONDS_PER_DAY))
+    hours, mus = np.divmod(mus, int(MUSECONDS_PER_HOUR))
+    minutes, mus = np.divmod(mus, int(MUSECONDS_PER_MINUTE))
+    seconds, mus = np.divmod(mus, int(MUSECONDS_PER_SECOND))
+
+    total = (days + EPOCH_ORDINAL).astype(np.float64)
+    error = np.zeros_like(total)
+    for part in (hours / HOURS_PER_DAY, minutes / MINUTES_PER_DAY,
+                 seconds / SECONDS_PER_DAY, mus / MUSECONDS_PER_DAY):
+        total, err = _twosum(total, part)
+        error += err
+
+    return total + error
+
+
+def num2datearray(nums):
+    """
+    Array version of :func:`num2date`: converts the float days in *nums* to
+    an array of naive (UTC) ``datetime64[us]`` values, equal to what
+    ``num2date`` returns for each value without a *tz*. ``NaN`` values are
+    converted to ``NaT``
+
+    Needs numpy
+    """
+    x = np.array(nums, dtype=np.float64)
+    nans = np.isnan(x)
+    x[nans] = EPOCH_ORDINAL
+
+    days = np.trunc(x)
+    hours, remainder = np.divmod(HOURS_PER_DAY * (x - days), 1)
+    minutes, remainder = np.divmod(MINUTES_PER_HOUR * remainder, 1)
+    seconds, remainder = np.divmod(SECONDS_PER_MINUTE * remainder, 1)
+    mus = np.trunc(MUSECONDS_PER_SECOND * remainder)
+    mus[mus < 10] = 0  # compensate for rounding errors (as num2date)
+    mus[mus > 999990] = MUSECONDS_PER_SECOND
+
+    total = (days.astype(np.int64) - EPOCH_ORDINAL) * int(MUSECONDS_PER_DAY)
+    total += (hours * MUSECONDS_PER_HOUR + minutes * MUSECONDS_PER_MINUTE +
+              seconds * MUSECONDS_PER_SECOND + mus).astype(np.int64)
+
+    dts = total.view('datetime64[us]')
+    dts[nans] = np.datetime64('NaT')
+    return dts
+
+
 def time2num(tm):
     """
     Converts the hour/minute/second/microsecond part of tm (datetime.datetime
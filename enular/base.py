@@ -1,4 +1,7 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
+import math
+
+import numpy
 from backtrader import backtrader as bt
 #import backtrader as bt
 
@@ -37,6 +40,62 @@ class Dummy(bt.Indicator):
         self.lines.dummy[0] = 0.0
 
 
+def operand(owner, indcls, *args, **kwargs):
+    '''
+    Instantiates ``indcls(*args, **kwargs)`` as an operand of ``owner``,
+    reusing an identical instance if one has already been built in the same
+    strategy.
+
+    Instances are keyed on the class, the resolved params (defaults updated
+    with ``kwargs``) and the identity of the input lines, so structurally
+    identical subtrees of an operation tree are only built and calculated
+    once. The cache lives in the strategy at the root of the owner chain and
+    is therefore discarded with it.
+
+    A shared instance stays registered with the owner which built it. Any
+    other owner keeps it in ``_opshared`` to move its buffer pointer in
+    lockstep during ``runonce`` and to account for its minperiod.
+
+    Setting ``IndicatorOperation.opcache`` to ``False`` disables the sharing
+    '''
+    if not IndicatorOperation.opcache:
+        return indcls(*args, **kwargs)
+
+    root = owner
+    while root._owner is not None:
+        root = root._owner
+
+    try:
+        cache = root._opcache
+    except AttributeError:
+        cache = root._opcache = dict()
+
+    params = indcls.params._getkwargsdefault()
+    params.update(kwargs)
+    ckey = (
+        indcls,
+        tuple(id(x) if isinstance(x, bt.LineRoot) else x for x in args),
+        tuple(params.items()),
+    )
+
+    try:
+        ind = cache[ckey]
+    except TypeError:  # something not hashable
+        return indcls(*args, **kwargs)
+    except KeyError:
+        pass  # hashable but not in the cache
+    else:
+        # lines redefine ==, hence the identity checks
+        if ind._owner is not owner and \
+           not any(x is ind for x in owner._opshared):
+            owner._opshared += (ind,)
+
+        return ind
+
+    # the instance keeps its inputs alive: the ids in the key stay unique
+    return cache.setdefault(ckey, indcls(*args, **kwargs))
+
+
 class IndicatorOperation(bt.Indicator):
     
     params = (
@@ -46,36 +105,204 @@ class IndicatorOperation(bt.Indicator):
 
     plotinfo = dict(subplot=False)
 
+    # share structurally identical operands across the strategy
+    opcache = True
+    _opshared = ()
+
     def init_logic(self):
         pass
 
     def __init__(self):
 
-        self.data0 = self.params.indicator_a(self.data)
-        self.data1 = self.params.indicator_b(self.data)
+        self.data0 = operand(self, self.params.indicator_a, self.data)
+        self.data1 = operand(self, self.params.indicator_b, self.data)
 
         self.init_logic()
 
+    def _periodrecalc(self):
+        super()._periodrecalc()
+        for ind in self._opshared:
+            self.updateminperiod(ind._minperiod)
+
+    def home(self):
+        super().home()
+        for ind in self._opshared:
+            ind.home()
+
+    def advance(self, size=1):
+        super().advance(size=size)
+        for ind in self._opshared:
+            ind.advance(size=size)
+
 class StrategyOperation(bt.Strategy):
+    '''
+    Trades the operands ``indicator_a`` and ``indicator_b``: ``trade_logic``
+    opens a position and ``close_logic`` closes it after ``holdbars`` bars.
+
+    With the param ``fastsignal`` and ``runonce`` the strategy is not run
+    bar by bar. If ``trade_signal`` gives the entries in vectorized form and
+    ``close_logic`` is the default, the trades are simulated from the
+    calculated arrays (market orders executed at the next open, fixed stake
+    of the sizer, commission of the broker) and the results are kept in
+    ``signalresult`` (see the ``SignalResult`` analyzer). The broker does
+    not see any order. Else the strategy runs as usual.
+
+    This approximation is meant to screen operation trees before running
+    the best ones in full.
+    '''
     
     params = (
         ('indicator_a',Dummy),
         ('indicator_b',Dummy),
+        ('fastsignal',False),
     )
 
+    holdbars = 5  # bars a position is held before close_logic closes it
+
+    _opshared = ()
+    signalresult = None
+
     def __init__(self):
 
         self.dataclose = self.datas[0].close
         self.order = None
 
-        self.indicator_a = self.params.indicator_a(self.datas[0])
-        self.indicator_b = self.params.indicator_b(self.datas[0])
+        self.indicator_a = operand(self, self.params.indicator_a, self.datas[0])
+        self.indicator_b = operand(self, self.params.indicator_b, self.datas[0])
+
+    def _once(self):
+        super()._once()
+        for ind in self._opshared:
+            ind.home()
+
+        if self.p.fastsignal:
+            self.signalresult = self.signalbacktest()
+            self._oncedone = self.signalresult is not None
+
+    def _oncepost(self, dt):
+        for ind in self._opshared:
+            if len(ind._clock) > len(ind):
+                ind.advance()
+
+        super()._oncepost(dt)
 
     def trade_logic(self):
         pass
 
+    def trade_signal(self, a, b):
+        # trade_logic over the whole arrays of the operands: 1 to buy, -1 to
+        # sell and 0 to do nothing. None if not available
+        return None
+
+    def signalbacktest(self):
+        '''
+        Simulates the trades of ``trade_signal`` and the default
+        ``close_logic`` over the calculated arrays. Returns the results or
+        ``None`` if the strategy cannot be simulated
+        '''
+        if type(self).close_logic is not StrategyOperation.close_logic:
+            return None  # custom exits need the bar by bar run
+
+        stake = getattr(self.getsizer().p, 'stake', None)
+        a = self.indicator_a.lines[0].ndarray()
+        b = self.indicator_b.lines[0].ndarray()
+        opens = self.data.open.ndarray()
+        closes = self.data.close.ndarray()
+        if stake is None or any(x is None for x in (a, b, opens, closes)):
+            return None
+
+        signal = self.trade_signal(a, b)
+        if signal is None:
+            return None
+
+        signal = numpy.array(signal, dtype=numpy.float64)
+        signal[:self._minperiod - 1] = 0.0  # next starts at the minperiod
+        bars = numpy.flatnonzero(signal)
+
+        comminfo = self.broker.getcommissioninfo(self.data)
+        mult = comminfo.p.mult
+        cash = self.broker.startingcash
+
+        n = len(closes)
+        position = numpy.zeros(n)
+        price = numpy.zeros(n)
+        realized = numpy.zeros(n)
+        trades = []
+
+        bar = 0
+        while True:
+            k = numpy.searchsorted(bars, bar)
+            if k == len(bars):
+                break
+
+            entry = bars[k] + 1  # the order is executed with the next open
+            if entry >= n:
+                break
+
+            size = stake if signal[bars[k]] > 0 else -stake
+            eprice = opens[entry]
+            ecomm = comminfo.getcommission(size, eprice)
+
+            if comminfo.stocklike and size > 0 and \
+               size * eprice + ecomm > cash + realized[entry - 1]:
+                bar = entry  # margin: trade_logic runs again at entry
+                continue
+
+            # bar_executed is len(self) at entry and close_logic closes at
+            # len(self) >= bar_executed + holdbars with the next open
+            exit = entry + self.holdbars + 1
+
+            trade = dict(entry=int(entry), size=size, price=eprice)
+            trades.append(trade)
+            if exit >= n:
+                position[entry:] = size
+                price[entry:] = eprice
+                realized[entry:] -= ecomm
+                trade.update(exit=None, pnl=None, pnlcomm=None)
+                break
+
+            xprice = opens[exit]
+            comm = ecomm + comminfo.getcommission(size, xprice)
+            pnl = size * (xprice - eprice) * mult
+
+            position[entry:exit] = size
+            price[entry:exit] = eprice
+            realized[entry:exit] -= ecomm
+            realized[exit:] += pnl - comm
+            trade.update(exit=int(exit), pnl=pnl, pnlcomm=pnl - comm)
+
+            bar = exit  # no order and no position: trade_logic runs again
+
+        value = cash + realized + position * (closes - price) * mult
+
+        closed = [t for t in trades if t['exit'] is not None]
+        won = [t['pnlcomm'] for t in closed if t['pnlcomm'] > 0.0]
+        lost = [t['pnlcomm'] for t in closed if t['pnlcomm'] <= 0.0]
+
+        rets = bt.utils.AutoOrderedDict()
+        rets.total.total = len(trades)
+        rets.total.open = len(trades) - len(closed)
+        rets.total.closed = len(closed)
+        rets.won.total = len(won)
+        rets.won.pnl.total = math.fsum(won)
+        rets.lost.total = len(lost)
+        rets.lost.pnl.total = math.fsum(lost)
+        rets.pnl.gross.total = math.fsum(t['pnl'] for t in closed)
+        rets.pnl.net.total = math.fsum(t['pnlcomm'] for t in closed)
+        rets.pnl.net.average = rets.pnl.net.total / (len(closed) or 1)
+        rets.value = float(value[-1]) if n else cash
+        rets.rtot = math.log(rets.value / cash) if rets.value > 0 else None
+        rets.trades = trades
+
+        start = max(self._minperiod - 1, 0)
+        with numpy.errstate(all='ignore'):
+            rets.returns = value[start + 1:] / value[start:-1] - 1.0
+
+        rets._close()
+        return rets
+
     def close_logic(self):
-        if len(self) >= (self.bar_executed + 5):
+        if len(self) >= (self.bar_executed + self.holdbars):
             self.log(f'CLOSE CREATE {self.dataclose[0]:2f}')
             self.order = self.close()
 
@@ -140,6 +367,18 @@ class Broker(bt.brokers.BackBroker):
 class Analyzer(bt.Analyzer):
     pass
 
+class SignalResult(bt.Analyzer):
+    '''
+    Results of the fast signal backtest of a ``StrategyOperation`` (see
+    ``fastsignal``): trade counts and pnl like ``TradeAnalyzer``, the final
+    ``value``, ``rtot`` like ``Returns`` and the per bar ``returns``. Empty if
+    the strategy has been run bar by bar
+    '''
+    def stop(self):
+        result = self.strategy.signalresult
+        if result is not None:
+            self.rets = result
+
 #TEST
 
 class Test:
@@ -31,11 +31,181 @@ import functools
 import math
 import operator
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # rolling kernels are not available
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None  # exponential smoothing keeps its loop
+
 from backtrader.utils.py3 import map, range
 
 from backtrader.indicator import Indicator
 
 
+# Rolling window kernels for the "once" calculations. Each one takes the
+# numpy array "x" holding the "period - 1" values before the first window end
+# and returns the values for the "len(x) - period + 1" windows
+
+def _rolling_badwindows(bad, period):
+    '''Returns the indices of the windows which contain a flagged value'''
+    cbad = np.concatenate(([0], np.cumsum(bad)))
+    return np.flatnonzero(cbad[period:] - cbad[:-period])
+
+
+def _rolling_accumulate(x, period, ufunc):
+    '''van Herk/Gil-Werman decomposition of the windows in blocks of size
+    "period". Returns the accumulation of "ufunc" from the start of each block
+    (forwards) and from the end of each block (backwards)
+
+    Any window is covered by the backwards accumulation of a block and the
+    forwards accumulation of the next one, which gives O(n) regardless of the
+    period
+    '''
+    nblocks = -(-len(x) // period)
+    padded = np.empty(nblocks * period)
+    padded[:len(x)] = x
+    padded[len(x):] = x[-1]  # never part of a window
+
+    blocks = padded.reshape(nblocks, period)
+    fwd = ufunc.accumulate(blocks, axis=1).ravel()
+    bwd = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return fwd, bwd
+
+
+def _twosum(a, b):
+    # a + b as the rounded sum and its exact rounding error (Knuth)
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def _rolling_accumulate2(x, period):
+    '''Like "_rolling_accumulate" with "np.add" but in double-double: the
+    partial sums come with the (accumulated) rounding errors of the additions.
+    Returns fwd, fwderr, bwd, bwderr'''
+    nblocks = -(-len(x) // period)
+    padded = np.zeros(nblocks * period)
+    padded[:len(x)] = x
+
+    blocks = padded.reshape(nblocks, period)
+    sums = []
+    for cols in (range(period), range(period - 1, -1, -1)):
+        acc, err = np.empty_like(blocks), np.empty_like(blocks)
+        s, e = blocks[:, cols[0]].copy(), np.zeros(nblocks)
+        for j in cols:
+            if j != cols[0]:
+                s, ej = _twosum(s, blocks[:, j])
+                e = e + ej
+
+            acc[:, j], err[:, j] = s, e
+
+        sums.extend((acc.ravel(), err.ravel()))
+
+    return sums
+
+
+def _rolling_sum(x, period, func):
+    # Each window is the addition of 2 partial sums (a single one if the
+    # window matches a block) accumulated in double-double and rounded once,
+    # which gives the result of math.fsum (correctly rounded) unless the
+    # exact sum is too close to the middle of 2 doubles for the remaining
+    # error to tell. Those windows are summed again with func
+    n = len(x) - period + 1
+    fwd, fwderr, bwd, bwderr = _rolling_accumulate2(x, period)
+
+    hi = fwd[period - 1:period - 1 + n].copy()
+    lo = fwderr[period - 1:period - 1 + n].copy()
+    partial = np.arange(n) % period != 0
+    hi[partial], err = _twosum(bwd[:n][partial], hi[partial])
+    lo[partial] += err + bwderr[:n][partial]
+    out, lo = _twosum(hi, lo)
+
+    # bound of the error left in lo: the errors of the additions of the
+    # errors (the absolute values are summed without compensation: a margin)
+    fabs, babs = _rolling_accumulate(np.abs(x), period, np.add)
+    absum = fabs[period - 1:period - 1 + n].copy()
+    absum[partial] += babs[:n][partial]
+    bound = absum * (4.0 * (period + 2) ** 2 * 2.0 ** -106)
+
+    # half the distance to the next double in the direction of lo
+    aout = np.abs(out)
+    toward = (lo > 0) == (out > 0)
+    gap = np.where(toward, np.spacing(aout), aout - np.nextafter(aout, 0.0))
+    ties = (np.abs(lo) + bound >= gap / 2.0) | ((out == 0.0) & (absum > 0))
+
+    # non-finite values are left to func (nan, inf, overflow exceptions)
+    ties |= ~np.isfinite(out)
+    for i in np.union1d(np.flatnonzero(ties),
+                        _rolling_badwindows(~np.isfinite(x), period)):
+        out[i] = func(x[i:i + period])
+
+    return out
+
+
+def _rolling_ext(x, period, func, ufunc):
+    # max/min are exact: the windows are made up of overlapping partials
+    n = len(x) - period + 1
+    fwd, bwd = _rolling_accumulate(x, period, ufunc)
+    out = ufunc(bwd[:n], fwd[period - 1:period - 1 + n])
+
+    # the result of the builtins depends on the position of a nan
+    for i in _rolling_badwindows(np.isnan(x), period):
+        out[i] = func(x[i:i + period])
+
+    return out
+
+
+def _rolling_max(x, period, func):
+    return _rolling_ext(x, period, func, np.maximum)
+
+
+def _rolling_min(x, period, func):
+    return _rolling_ext(x, period, func, np.minimum)
+
+
+def _rolling_argext(x, period, func, ext, recent):
+    # index of the most recent ("ago" count) or oldest extreme in each window
+    # using a strided view of the windows, without copies
+    windows = np.lib.stride_tricks.sliding_window_view(x, period)
+    if recent:
+        windows = windows[:, ::-1]
+
+    out = getattr(windows, ext)(axis=1).astype(np.float64)
+    if not recent:
+        out = (period - 1) - out
+
+    for i in _rolling_badwindows(np.isnan(x), period):
+        out[i] = func(x[i:i + period])
+
+    return out
+
+
+def _expsmooth(x, alpha, alpha1, seed):
+    '''Recursive filter "y = y(-1) * alpha1 + x * alpha" with "y(-1) = seed"
+
+    A first order IIR filter (scipy lfilter) with the seed as initial state.
+    The operations are the same as in the scalar loop and the results are
+    identical for finite inputs
+    '''
+    zi = np.array([seed * alpha1])
+    y, zf = lfilter([alpha], [1.0, -alpha1], x, zi=zi)
+    return y
+
+
+if np is not None:
+    _rolling_kernels = {
+        math.fsum: _rolling_sum,
+        max: _rolling_max,
+        min: _rolling_min,
+    }
+else:
+    _rolling_kernels = dict()
+
+
 
 class PeriodN(Indicator):
 
@@ -73,7 +243,21 @@ class OperationN(PeriodN):
     def next(self):
         self.line[0] = self.func(self.data.get(size=self.params.period))
 
+    def _once_kernel(self, start, end):
+        '''Returns a rolling kernel for "func" in vectorized mode or None'''
+        return _rolling_kernels.get(self.func, None)
+
     def once(self, start, end):
+        kernel = self._once_kernel(start, end)
+        period = self.params.period
+        if kernel is not None and start >= period - 1 and start < end:
+            dst = self.line.ndarray()
+            src = self.data.lines[0].ndarray()
+            if dst is not None and src is not None:
+                x = src[start - period + 1:end]
+                dst[start:end] = kernel(x, period, self.func)
+                return
+
         dst = self.line.array
         src = self.data.array
         period = self.params.period
@@ -194,6 +378,9 @@ class SumN(OperationN):
     'math.sum' for the calculation rather than the built-in 'sum' to avoid
     precision errors.
 
+    In vectorized mode (and if numpy is available) the sums are calculated
+    with an O(n) rolling kernel, which gives the same results as 'math.fsum'
+
     Formula:
 
         - SumN = sum(data, period)
@@ -239,6 +426,9 @@ class AllN(OperationN):
     func = all
 
 
+_argexts = {max: 'argmax', min: 'argmin'} if np is not None else dict()
+
+
 class FindFirstIndex(OperationN):
 
     """Returns the index of the last data that satisfies equality with the
@@ -262,6 +452,13 @@ class FindFirstIndex(OperationN):
         m = self.params._evalfunc(iterable)
         return next(i for i, v in enumerate(reversed(iterable)) if v == m)
 
+    def _once_kernel(self, start, end):
+        ext = _argexts.get(self.params._evalfunc, None)
+        if ext is None:
+            return None
+
+        return functools.partial(_rolling_argext, ext=ext, recent=True)
+
 
 class FindFirstIndexHighest(FindFirstIndex):
 
@@ -325,6 +522,13 @@ class FindLastIndex(OperationN):
         # period - index = 1 ... and must be zero!
         return self.params.period - index - 1
 
+    def _once_kernel(self, start, end):
+        ext = _argexts.get(self.params._evalfunc, None)
+        if ext is None:
+            return None
+
+        return functools.partial(_rolling_argext, ext=ext, recent=False)
+
 
 class FindLastIndexHighest(FindLastIndex):
 
@@ -411,6 +615,9 @@ class Average(PeriodN):
 
         - average = data(period) / period
 
+    In vectorized mode the sums are calculated with the same rolling kernel
+    (and results) as in 'SumN'
+
     Additional information found at:
     https://en.wikipedia.org/wiki/Arithmetic_mean
     
@@ -424,9 +631,17 @@ class Average(PeriodN):
             math.fsum(self.data.get(size=self.params.period)) / self.params.period
 
     def once(self, start, end):
+        period = self.params.period
+        if np is not None and start >= period - 1 and start < end:
+            dst = self.line.ndarray()
+            src = self.data.lines[0].ndarray()
+            if dst is not None and src is not None:
+                x = src[start - period + 1:end]
+                dst[start:end] = _rolling_sum(x, period, math.fsum) / period
+                return
+
         src = self.data.array
         dst = self.line.array
-        period = self.params.period
 
         for i in range(start, end):
             dst[i] = math.fsum(src[i - period + 1:i + 1]) / period
@@ -442,6 +657,9 @@ class ExponentialSmoothing(Average):
 
         - average = prev * (1 - alpha) + data * alpha
 
+    In vectorized mode the recurrence is run as a first order recursive
+    filter (scipy.signal.lfilter) seeded with the arithmetic mean
+
     Additional information found at:
     https://en.wikipedia.org/wiki/Exponential_smoothing
     
@@ -471,6 +689,16 @@ class ExponentialSmoothing(Average):
         super(ExponentialSmoothing, self).once(start, end)
 
     def once(self, start, end):
+        if lfilter is not None and start < end:
+            dst = self.line.ndarray()
+            src = self.data.lines[0].ndarray()
+            # inf is nan for the filter: the loop calculates those
+            if dst is not None and src is not None and \
+               np.all(np.isfinite(src[start:end])):
+                dst[start:end] = _expsmooth(src[start:end], self.alpha,
+                                            self.alpha1, dst[start - 1])
+                return
+
         darray = self.data.array
         larray = self.line.array
         alpha = self.alpha
@@ -1,4 +1,5 @@
 
+import numpy
 import backtrader as bt
 import enularlib
 
@@ -15,9 +16,30 @@ class BTBBase(enularlib.IndicatorOperation):
 
         return stand_data
 
+    def b_standardise_once(self, stand_data):
+
+        # b_standardise over a whole array (nan is 0.0 like in b_standardise)
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([stand_data >= 1.0, stand_data <= -1.0],
+                                [1.0, -1.0], 0.0)
+
     def next_logic(self):
         pass
 
+    def once_logic(self, temp0, temp1):
+        # the gate over the whole standardised input arrays. None (gates
+        # defining only next_logic) calculates the gate with next_logic
+        return None
+
+    def once_matches_next(self):
+        # once_logic calculates next_logic only if it is defined by the same
+        # class or a subclass. A subclass of a gate redefining only
+        # next_logic must not use the once_logic of the gate
+        mro = type(self).__mro__
+        nextcls = next(cls for cls in mro if 'next_logic' in vars(cls))
+        oncecls = next(cls for cls in mro if 'once_logic' in vars(cls))
+        return issubclass(oncecls, nextcls)
+
     def next(self):
 
         self.lines.temp0[0] = self.b_standardise(self.data0[0])
@@ -25,6 +47,36 @@ class BTBBase(enularlib.IndicatorOperation):
 
         self.next_logic()
 
+    # pointers move like in the next simulation, needed if once falls back
+    preonce = bt.Indicator.preonce_via_prenext
+    oncestart = bt.Indicator.oncestart_via_nextstart
+
+    def once(self, start, end):
+
+        dst = self.lines[0].ndarray()
+        temp0 = self.lines.temp0.ndarray()
+        temp1 = self.lines.temp1.ndarray()
+        src0 = self.data0.lines[0].ndarray()
+        src1 = self.data1.lines[0].ndarray()
+
+        if any(x is None for x in (dst, temp0, temp1, src0, src1)):
+            self.once_via_next(start, end)  # buffers cannot be viewed
+            return
+
+        if not self.once_matches_next():
+            self.once_via_next(start, end)  # no once_logic for next_logic
+            return
+
+        temp0[start:end] = self.b_standardise_once(src0[start:end])
+        temp1[start:end] = self.b_standardise_once(src1[start:end])
+
+        operation = self.once_logic(temp0[start:end], temp1[start:end])
+        if operation is None:
+            self.once_via_next(start, end)  # no vectorized gate
+            return
+
+        dst[start:end] = self.b_standardise_once(operation)
+
 class BTBAnd(BTBBase):
 
     lines = ('btband','temp0','temp1',)
@@ -34,6 +86,11 @@ class BTBAnd(BTBBase):
         operation = (self.lines.temp0[0] + self.lines.temp1[0])/2
         self.lines.btband[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        operation = (temp0 + temp1)/2
+        return operation
+
 class BTBOr(BTBBase):
 
     lines = ('btbor','temp0','temp1',)
@@ -43,6 +100,11 @@ class BTBOr(BTBBase):
         operation = self.lines.temp0[0] + self.lines.temp1[0]
         self.lines.btbor[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        operation = temp0 + temp1
+        return operation
+
 class BTBSo(BTBBase):
 
     lines = ('btbso','temp0','temp1',)
@@ -52,6 +114,11 @@ class BTBSo(BTBBase):
         operation = self.lines.temp0[0]
         self.lines.btbso[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        operation = temp0
+        return operation
+
 class BTBNot(BTBBase):
 
     lines = ('btbnot','temp0','temp1',)
@@ -61,6 +128,11 @@ class BTBNot(BTBBase):
         operation = self.lines.temp0[0] * -1
         self.lines.btbnot[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        operation = temp0 * -1
+        return operation
+
 class BTBXor(BTBBase):
 
     lines = ('btbxor','temp0','temp1',)
@@ -80,6 +152,15 @@ class BTBXor(BTBBase):
 
         self.lines.btbxor[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        # the 2nd if resets the result of the 1st: only -1 or 0, like next
+        operation = numpy.select([
+            (temp0 <= -1) & (temp1 == 0),
+            (temp0 == 0) & (temp1 <= -1),
+        ], [-1, -1], 0)
+        return operation
+
 class BTBXnor(BTBBase):
 
     lines = ('btbxnor','temp0','temp1',)
@@ -97,6 +178,15 @@ class BTBXnor(BTBBase):
 
         self.lines.btbxnor[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        operation = numpy.select([
+            (temp0 >= 1) & (temp1 >= 1),
+            (temp0 == 0) & (temp1 == 0),
+            (temp0 <= -1) & (temp1 <= -1),
+        ], [1, 1, -1], 0)
+        return operation
+
 class BTBNand(BTBBase):
 
     lines = ('btbnand','temp0','temp1',)
@@ -118,6 +208,17 @@ class BTBNand(BTBBase):
 
         self.lines.btbnand[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        operation = numpy.select([
+            (temp0 >= 1) & (temp1 == 0),
+            (temp0 == 0) & (temp1 >= 1),
+            (temp0 <= 0) & (temp1 <= -1),
+            (temp0 == 0) & (temp1 == 0),
+            (temp0 <= -1) & (temp1 <= 0),
+        ], [1, 1, -1, 1, -1], 0)
+        return operation
+
 class BTBNor(BTBBase):
 
     lines = ('btbnor','temp0','temp1',)
@@ -131,6 +232,13 @@ class BTBNor(BTBBase):
 
         self.lines.btbnor[0] = self.b_standardise(operation)
 
+    def once_logic(self, temp0, temp1):
+
+        operation = numpy.select([
+            (temp0 == 0) & (temp1 == 0),
+        ], [1], 0)
+        return operation
+
 
 class VTVCustom(enularlib.IndicatorOperation):
 
@@ -164,4 +272,11 @@ class VTBCustom(BTBBase):
         else:
             operation = 0
 
-        self.lines.vtbcustom[0] = self.b_standardise(operation)
\ No newline at end of file
+        self.lines.vtbcustom[0] = self.b_standardise(operation)
+
+    def once_logic(self, temp0, temp1):
+
+        operation = numpy.select([
+            (temp0 >= 0) & (temp1 >= 0),
+        ], [1], 0)
+        return operation
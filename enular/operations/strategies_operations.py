@@ -1,4 +1,5 @@
 
+import numpy
 import backtrader as bt
 import enularlib
 
@@ -14,6 +15,16 @@ class VTOCrossover(enularlib.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        prev_a = numpy.concatenate(([numpy.nan], a[:-1]))
+        prev_b = numpy.concatenate(([numpy.nan], b[:-1]))
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([
+                (a > b) & (prev_a < prev_b),
+                (a < b) & (prev_a > prev_b),
+            ], [1, -1], 0)
+
 class BTOAnd(enularlib.StrategyOperation):
 
     def trade_logic(self):
@@ -28,6 +39,14 @@ class BTOAnd(enularlib.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([
+                (a >= 1.0) & (b >= 1.0),
+                (a <= -1.0) & (b <= -1.0),
+            ], [1, -1], 0)
+
 class BTOOr(enularlib.StrategyOperation):
 
     def trade_logic(self):
@@ -40,6 +59,14 @@ class BTOOr(enularlib.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([
+                (a >= 1) | (b >= 1),
+                (a <= -1) | (b <= -1),
+            ], [1, -1], 0)
+
 class BTOSo(enularlib.StrategyOperation):
 
     def trade_logic(self):
@@ -52,6 +79,11 @@ class BTOSo(enularlib.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([a >= 1, a <= -1], [1, -1], 0)
+
 class BTONot(enularlib.StrategyOperation):
 
     def trade_logic(self):
@@ -62,4 +94,9 @@ class BTONot(enularlib.StrategyOperation):
             
         elif self.indicator_a[0] >= -1:
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
-            self.order = self.sell()
\ No newline at end of file
+            self.order = self.sell()
+
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([a <= 1, a >= -1], [1, -1], 0)
@@ -24,6 +24,16 @@ class VTOCrossover(enular.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        prev_a = numpy.concatenate(([numpy.nan], a[:-1]))
+        prev_b = numpy.concatenate(([numpy.nan], b[:-1]))
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([
+                (a > b) & (prev_a < prev_b),
+                (a < b) & (prev_a > prev_b),
+            ], [1, -1], 0)
+
 class BTOAnd(enular.StrategyOperation):
 
     def trade_logic(self):
@@ -38,6 +48,14 @@ class BTOAnd(enular.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([
+                (a >= 1.0) & (b >= 1.0),
+                (a <= -1.0) & (b <= -1.0),
+            ], [1, -1], 0)
+
 class BTOOr(enular.StrategyOperation):
 
     def trade_logic(self):
@@ -50,6 +68,14 @@ class BTOOr(enular.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([
+                (a >= 1) | (b >= 1),
+                (a <= -1) | (b <= -1),
+            ], [1, -1], 0)
+
 class BTOSo(enular.StrategyOperation):
 
     def trade_logic(self):
@@ -62,6 +88,11 @@ class BTOSo(enular.StrategyOperation):
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
             self.order = self.sell()
 
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([a >= 1, a <= -1], [1, -1], 0)
+
 class BTONot(enular.StrategyOperation):
 
     def trade_logic(self):
@@ -72,4 +103,9 @@ class BTONot(enular.StrategyOperation):
             
         elif self.indicator_a[0] >= -1:
             self.log(f'SELL CREATE {self.dataclose[0]:2f}')
-            self.order = self.sell()
\ No newline at end of file
+            self.order = self.sell()
+
+    def trade_signal(self, a, b):
+
+        with numpy.errstate(invalid='ignore'):
+            return numpy.select([a <= 1, a >= -1], [1, -1], 0)
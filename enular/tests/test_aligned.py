@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os.path
+import shutil
+import tempfile
+
+import testcommon
+
+import backtrader as bt
+
+
+def writecalendars(tmpdir):
+    # the csv files with bars missing on different days in each, giving
+    # datas with different calendars
+    fnames = []
+    for index, fname in enumerate(testcommon.DATAFILES):
+        with open(fname) as f:
+            header, rows = f.readline(), f.readlines()
+
+        if index == 1:
+            rows = [row for i, row in enumerate(rows) if i % 7 != 3]
+        elif index == 2:
+            rows = rows[100:400] + rows[450:]
+
+        fnames.append(os.path.join(tmpdir, os.path.basename(fname)))
+        with open(fnames[-1], 'w') as f:
+            f.write(header)
+            f.writelines(row.rstrip('\n') + '\n' for row in rows)
+
+    return fnames
+
+
+class AlignedStrategy(bt.Strategy):
+    def __init__(self):
+        self.smas = [bt.ind.SMA(data, period=10) for data in self.datas]
+        self.values = []
+
+    def notify_order(self, order):
+        if order.status == order.Completed:
+            self.values.append((len(self), order.data._name,
+                                order.executed.price, order.executed.size))
+
+    def nextstart_open(self):
+        self.next_open()
+
+    def next_open(self):
+        self.values.append(('open', len(self),
+                            tuple(data.tick_open for data in self.datas)))
+
+    def next(self):
+        self.values.append((self.datetime.datetime(0),
+                            tuple(len(data) for data in self.datas),
+                            tuple(data.tick_close for data in self.datas)))
+        for data, sma in zip(self.datas, self.smas):
+            if not len(data) or not len(sma):
+                continue
+
+            pos = self.getposition(data).size
+            if not pos and data.close[0] > sma[0]:
+                self.buy(data, size=1)
+            elif pos and data.close[0] < sma[0]:
+                self.sell(data, size=1)
+
+
+def runaligned(fnames, **kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.broker.setcash(100000.0)
+    for fname in fnames:
+        data = bt.feeds.YahooFinanceCSVData(dataname=fname)
+        cerebro.adddata(data, name=os.path.basename(fname))
+
+    cerebro.addstrategy(AlignedStrategy)
+    strat = cerebro.run()[0]
+    return strat.values, cerebro.broker.getvalue()
+
+
+def test_aligned():
+    # preloaded datas deliver their bars aligned on a merged timeline (and
+    # strategies run from a flat plan), which must make no difference to
+    # the synchronization of the regular loop (no preload)
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for fnames in (testcommon.DATAFILES, writecalendars(tmpdir)):
+            for cheat_on_open in (False, True):
+                expected = runaligned(fnames, preload=False, nextplan=False,
+                                      runonce=False,
+                                      cheat_on_open=cheat_on_open)
+                for kwargs in (dict(), dict(nextplan=False),
+                               dict(preload=False)):
+                    result = runaligned(fnames, runonce=False,
+                                        cheat_on_open=cheat_on_open,
+                                        **kwargs)
+                    assert result == expected, (cheat_on_open, kwargs)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_aligned_runonce():
+    # the same with the indicators calculated in runonce mode, in one go or
+    # in blocks
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for fnames in (testcommon.DATAFILES, writecalendars(tmpdir)):
+            for cheat_on_open in (False, True):
+                expected = runaligned(fnames, runonce=False,
+                                      cheat_on_open=cheat_on_open)
+                result = runaligned(fnames, cheat_on_open=cheat_on_open)
+                assert result[1] == expected[1], cheat_on_open
+
+                blocks = runaligned(fnames, onceblock=100, oncelookback=10,
+                                    cheat_on_open=cheat_on_open)
+                assert blocks == result, cheat_on_open
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    test_aligned()
+    test_aligned_runonce()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import importlib
+
+import testcommon
+
+import backtrader as bt
+
+# the gates exist in both packages
+MODULES = ('operations.indicators_operations',
+           'indicators.indicators_operations')
+
+
+def makegates(module):
+    mod = importlib.import_module(module)
+
+    class NextGate(mod.BTBBase):
+        # only next_logic: runonce has to calculate the gate with it
+        lines = ('nextgate', 'temp0', 'temp1',)
+        params = (('indicator_a', bt.ind.Momentum),
+                  ('indicator_b', bt.ind.ROC),)
+
+        def next_logic(self):
+            operation = self.lines.temp0[0] - self.lines.temp1[0]
+            self.lines.nextgate[0] = self.b_standardise(operation)
+
+    class AndGate(mod.BTBAnd):
+        params = (('indicator_a', bt.ind.Momentum),
+                  ('indicator_b', bt.ind.ROC),)
+
+    class NextAndGate(AndGate):
+        # redefines only next_logic: the once_logic of BTBAnd does not apply
+        def next_logic(self):
+            operation = self.lines.temp0[0] - self.lines.temp1[0]
+            self.lines.btband[0] = self.b_standardise(operation)
+
+    return NextGate, AndGate, NextAndGate
+
+
+class GatesStrategy(bt.Strategy):
+    params = (('gates', ()),)
+
+    def __init__(self):
+        self.gates = [gate(self.data) for gate in self.p.gates]
+        self.values = [[] for gate in self.gates]
+
+    def next(self):
+        for values, gate in zip(self.values, self.gates):
+            values.append(gate[0])
+
+
+def test_next_logic_only():
+    for module in MODULES:
+        gates = makegates(module)
+
+        class Strategy(GatesStrategy):
+            params = (('gates', gates),)
+
+        (sonce, vonce), (snext, vnext) = testcommon.runmodes(Strategy)
+        assert sonce.values == snext.values, module
+        assert any(sonce.values[0]), module  # the gate did something
+
+
+if __name__ == '__main__':
+    test_next_logic_only()
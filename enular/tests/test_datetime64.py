@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+import random
+import shutil
+import tempfile
+
+import numpy as np
+
+import testcommon
+
+import backtrader as bt
+from backtrader.utils import date2num, num2date
+from backtrader.utils.dateintern import date2numarray, num2datearray
+
+
+def test_datearrays():
+    # the array conversions give the values of the scalar ones
+    rng = random.Random(1)
+    nums = [rng.uniform(700000.0, 750000.0) for i in range(2000)]
+    nums += [736000.0, 736000.5, 736000.0 + 1e-11, 736001.0 - 1e-11]
+    dts = num2datearray(nums + [float('nan')])
+    assert np.isnat(dts[-1])
+    assert dts[:-1].tolist() == [num2date(x) for x in nums]
+
+    pydts = [num2date(x) for x in nums]
+    assert date2numarray(dts[:-1]).tolist() == [date2num(x) for x in pydts]
+    assert num2datearray(date2numarray(dts[:-1])).tolist() == pydts
+
+
+class ViewStrategy(bt.Strategy):
+    def __init__(self):
+        self.checked = 0
+
+    def next(self):
+        # the cached view follows the bars added to the line
+        dtline = self.data.lines.datetime
+        dts = dtline.datetime64()
+        assert len(dts) == len(dtline.ndarray())
+        assert dts[dtline.idx].tolist() == self.data.datetime.datetime(0)
+        self.checked += 1
+
+
+def test_datetime64():
+    for kwargs in (dict(), dict(preload=False)):
+        cerebro = bt.Cerebro(runonce=False, **kwargs)
+        cerebro.adddata(testcommon.getdata())
+        cerebro.addstrategy(ViewStrategy)
+        assert cerebro.run()[0].checked == 1259, kwargs
+
+
+def writeintraday(tmpdir):
+    # the bars of the first data at different times of the day
+    with open(testcommon.DATAFILES[0]) as f:
+        f.readline()  # skip the headers
+        rows = [line.rstrip('\n').split(',') for line in f]
+
+    fname = os.path.join(tmpdir, 'intraday.csv')
+    with open(fname, 'w') as f:
+        f.write('headers\n')
+        for i, r in enumerate(rows):
+            tm = '%02d:%02d:%02d' % (9 + i % 8, (7 * i) % 60, i % 2 * 30)
+            f.write(','.join([r[0] + ' ' + tm] + r[1:5] + [r[6]]) + '\n')
+
+    return fname
+
+
+class TimeStrategy(bt.Strategy):
+    def __init__(self):
+        tm = datetime.time(12, 30)
+        self.cmps = [self.data.datetime > tm, self.data.datetime <= tm,
+                      self.data.datetime == datetime.time(11, 14)]
+        self.values = []
+
+    def next(self):
+        self.values.append(tuple(line[0] for line in self.cmps))
+
+
+class ScalarAnnualReturn(bt.analyzers.AnnualReturn):
+    def _years(self):
+        return None  # one date per bar
+
+
+def test_timecompare():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        fname = writeintraday(tmpdir)
+        results = []
+        for runonce in (True, False):
+            cerebro = bt.Cerebro(runonce=runonce)
+            cerebro.adddata(bt.feeds.GenericCSVData(
+                dataname=fname, timeframe=bt.TimeFrame.Minutes,
+                openinterest=-1))
+            cerebro.addstrategy(TimeStrategy)
+            results.append(cerebro.run()[0].values)
+
+        assert len(results[0]) == 1259
+        assert any(x[0] for x in results[0]) and any(x[2] for x in results[0])
+        assert results[0] == results[1]
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_annualreturn():
+    for kwargs in (dict(), dict(runonce=False), dict(preload=False)):
+        cerebro = bt.Cerebro(**kwargs)
+        cerebro.adddata(testcommon.getdata())
+        cerebro.addstrategy(bt.Strategy)
+        cerebro.addanalyzer(bt.analyzers.AnnualReturn, _name='view')
+        cerebro.addanalyzer(ScalarAnnualReturn, _name='scalar')
+        strat = cerebro.run()[0]
+        view = strat.analyzers.view.get_analysis()
+        assert list(view) == [2017, 2018, 2019, 2020, 2021, 2022], kwargs
+        assert view == strat.analyzers.scalar.get_analysis(), kwargs
+
+
+if __name__ == '__main__':
+    test_datearrays()
+    test_datetime64()
+    test_timecompare()
+    test_annualreturn()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import calendar
+import datetime
+import math
+import os.path
+import shutil
+import tempfile
+
+import pandas as pd
+
+import testcommon
+
+import backtrader as bt
+
+
+def writefiles(tmpdir):
+    # files for the other csv formats with the bars of the first data
+    with open(testcommon.DATAFILES[0]) as f:
+        f.readline()  # skip the headers
+        rows = [line.rstrip('\n').split(',') for line in f]
+
+    fnames = dict()
+
+    def write(name, lines):
+        fnames[name] = os.path.join(tmpdir, name + '.csv')
+        with open(fnames[name], 'w') as f:
+            f.write('headers\n')
+            f.writelines(','.join(tokens) + '\n' for tokens in lines)
+
+    # date and time (at different times of the day) in separate fields
+    write('btcsv', ([r[0], '%02d:%02d:00' % (9 + i % 7, i % 60)] + r[1:5] +
+                    [r[6], '0'] for i, r in enumerate(rows)))
+    write('btcsv-day', ([r[0]] + r[1:5] + [r[6], '0'] for r in rows))
+
+    # some fields left empty: nullvalue
+    write('generic', ([r[0] + ' 10:30:00'] +
+                      ['' if i % 11 == 0 and j == 3 else x
+                       for j, x in enumerate(r[1:5])] + [r[6]]
+                      for i, r in enumerate(rows)))
+    # timestamps instead of dates
+    write('generic-ts', ([str(calendar.timegm(
+        datetime.datetime.strptime(r[0], '%Y-%m-%d').timetuple()))] +
+        r[1:5] + [r[6]] for r in rows))
+    return fnames
+
+
+def getfeeds(fnames):
+    # (feed class, kwargs) of the feeds to be loaded in bulk
+    generic = dict(openinterest=-1, volume=5)
+    return [
+        (bt.feeds.YahooFinanceCSVData, dict(dataname=testcommon.DATAFILES[0])),
+        (bt.feeds.YahooFinanceCSVData, dict(dataname=testcommon.DATAFILES[1],
+                                            adjclose=False, round=False)),
+        (bt.feeds.YahooFinanceCSVData, dict(dataname=testcommon.DATAFILES[2],
+                                            swapcloses=True, decimals=3)),
+        (bt.feeds.BacktraderCSVData, dict(dataname=fnames['btcsv'])),
+        (bt.feeds.BacktraderCSVData, dict(dataname=fnames['btcsv-day'])),
+        (bt.feeds.GenericCSVData, dict(dataname=fnames['generic'],
+                                       **generic)),
+        (bt.feeds.GenericCSVData, dict(dataname=fnames['generic'],
+                                       nullvalue=0.0, **generic)),
+        (bt.feeds.GenericCSVData, dict(dataname=fnames['generic-ts'],
+                                       dtformat=1, **generic)),
+        (bt.feeds.GenericCSVData, dict(dataname=testcommon.DATAFILES[0],
+                                       dtformat='%Y-%m-%d', volume=6,
+                                       openinterest=-1)),
+    ]
+
+
+def loadlines(data, **kwargs):
+    # the values of all lines for all bars (nan as None to compare them)
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.adddata(data)
+    cerebro.addstrategy(bt.Strategy)
+    data = cerebro.run()[0].data
+    return [[None if math.isnan(x) else x for x in line.array]
+            for line in data.lines]
+
+
+def test_csvbulk():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for feedcls, kwargs in getfeeds(writefiles(tmpdir)):
+            expected = loadlines(feedcls(bulk=False, **kwargs))
+            assert len(expected[0]) == 1259, (feedcls, kwargs)
+            assert loadlines(feedcls(**kwargs)) == expected, (feedcls, kwargs)
+            # line by line when not preloading
+            assert loadlines(feedcls(**kwargs), preload=False) == expected
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_pandasbulk():
+    df = pd.read_csv(testcommon.DATAFILES[0], index_col=0, parse_dates=True)
+    df.iloc[::13, 1] = float('nan')  # some missing values in high
+    for kwargs in (dict(), dict(openinterest=None, volume='Volume'),
+                   dict(nocase=False, close='Adj Close')):
+        expected = loadlines(bt.feeds.PandasData(dataname=df, **kwargs),
+                             preload=False)
+        assert len(expected[0]) == 1259, kwargs
+        result = loadlines(bt.feeds.PandasData(dataname=df, **kwargs))
+        assert result == expected, kwargs
+
+
+if __name__ == '__main__':
+    test_csvbulk()
+    test_pandasbulk()
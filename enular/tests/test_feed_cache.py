@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import shutil
+import tempfile
+
+import testcommon
+
+import backtrader as bt
+
+
+class CacheStrategy(bt.Strategy):
+    params = (('period', 15),)
+
+    def __init__(self):
+        self.sma = bt.ind.SMA(self.data, period=self.p.period)
+        self.values = []
+
+    def next(self):
+        self.values.append((self.data.close[0], self.sma[0],
+                            self.broker.getvalue()))
+        if self.data.close[0] > self.sma[0]:
+            self.buy()
+        elif self.position:
+            self.close()
+
+
+def runcache(cache):
+    cerebro = bt.Cerebro()
+    data = testcommon.getdata(cache=cache)
+    cerebro.adddata(data)
+    cerebro.addstrategy(CacheStrategy)
+    strat = cerebro.run()[0]
+    return data, strat.values, cerebro.broker.getvalue()
+
+
+def test_cache():
+    # the bars from the cache give the same values (and types) as the source
+    cachedir = tempfile.mkdtemp()
+    try:
+        data, expected, value = runcache(None)
+        for fromcache in (False, True):  # written, then read
+            data, values, cvalue = runcache(cachedir)
+            assert data._fromcache == fromcache
+            assert values == expected
+            assert cvalue == value
+            assert type(cvalue) is float
+            assert all(type(x) is float for row in values for x in row)
+    finally:
+        shutil.rmtree(cachedir)
+
+
+if __name__ == '__main__':
+    test_cache()
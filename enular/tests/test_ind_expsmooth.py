@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+
+
+class SmoothStrategy(bt.Strategy):
+    def __init__(self):
+        self.inds = []
+        for data in self.datas:  # the same smoothings on several feeds
+            self.inds.extend([
+                bt.ind.EMA(data, period=20),
+                bt.ind.SMMA(data, period=14),
+                bt.ind.DEMA(data, period=10),
+                bt.ind.EMA(bt.ind.Momentum(data), period=20),
+                bt.ind.RSI(data),
+            ])
+        self.values = [[] for ind in self.inds]
+
+    def next(self):
+        for values, ind in zip(self.values, self.inds):
+            values.append(ind[0])
+
+
+def runsmooth(**kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    for index in range(len(testcommon.DATAFILES)):
+        cerebro.adddata(testcommon.getdata(index))
+
+    cerebro.addstrategy(SmoothStrategy)
+    return cerebro.run()[0].values
+
+
+def test_expsmooth():
+    # the recursive filter gives the values of the loop in next mode
+    expected = runsmooth(runonce=False)
+    assert runsmooth() == expected
+    assert runsmooth(onceblock=100, oncelookback=50) == expected
+
+
+if __name__ == '__main__':
+    test_expsmooth()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+import random
+
+import testcommon
+
+import backtrader as bt
+from indicators.basic_ops import _rolling_sum, np
+
+
+class SumsStrategy(bt.Strategy):
+    def __init__(self):
+        self.inds = dict(
+            sma=bt.ind.SMA(self.data, period=15),
+            sma200=bt.ind.SMA(self.data, period=200),
+            sumn=bt.ind.SumN(self.data, period=30),
+            kama=bt.ind.KAMA(self.data),
+            tema=bt.ind.TEMA(self.data, period=20),
+        )
+        self.cross = bt.ind.CrossOver(self.data.close, self.inds['sma'])
+        self.values = dict((name, []) for name in self.inds)
+
+    def next(self):
+        for name, ind in self.inds.items():
+            self.values[name].append(ind[0])
+
+        if self.cross > 0:
+            self.buy()
+        elif self.cross < 0:
+            self.close()
+
+
+def test_runonce_runnext():
+    # the vectorized sums must be those of math.fsum in next mode: a single
+    # rounding difference can flip a crossover
+    for index in range(len(testcommon.DATAFILES)):
+        (sonce, vonce), (snext, vnext) = testcommon.runmodes(SumsStrategy,
+                                                             index)
+        for name, values in sonce.values.items():
+            assert values == snext.values[name], name
+
+        assert vonce == vnext
+
+
+def test_rolling_sum_fsum():
+    if np is None:
+        return
+
+    rnd = random.Random(1)
+    for trial in range(100):
+        size = rnd.randint(1, 1000)
+        period = rnd.randint(1, min(size, 100))
+        scale = 10.0 ** rnd.randint(-10, 10) if trial % 2 else 1.0
+        x = np.array([round(rnd.gauss(100, 5), 2) * scale *
+                      10.0 ** rnd.choice((0, 0, 16, -16))
+                      for i in range(size)])
+
+        expected = [math.fsum(x[i:i + period])
+                    for i in range(size - period + 1)]
+        assert _rolling_sum(x, period, math.fsum).tolist() == expected
+
+
+if __name__ == '__main__':
+    test_runonce_runnext()
+    test_rolling_sum_fsum()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os.path
+import shutil
+import tempfile
+
+import numpy as np
+
+import testcommon
+
+import backtrader as bt
+
+
+class MemMapStrategy(bt.Strategy):
+    def __init__(self):
+        self.sma = bt.ind.SMA(self.data, period=15)
+        self.values = []
+
+    def next(self):
+        self.values.append((self.data.datetime[0], self.data.close[0],
+                            self.sma[0]))
+
+
+def getcolumns():
+    # the values of the csv data feed
+    data = testcommon.getdata()
+    cerebro = bt.Cerebro()
+    cerebro.adddata(data)
+    cerebro.run()
+    return dict((alias, np.array(line.array))
+                for alias, line in zip(data.getlinealiases(), data.lines))
+
+
+def runmemmap(data, **kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.adddata(data)
+    cerebro.addstrategy(MemMapStrategy)
+    return cerebro.run()[0].values
+
+
+def test_memmap():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        fname = os.path.join(tmpdir, 'data.npy')
+        bt.feeds.MemMapData.write(fname, getcolumns())
+        expected = runmemmap(testcommon.getdata())
+        for runonce in (True, False):
+            data = bt.feeds.MemMapData(dataname=fname)
+            assert runmemmap(data, runonce=runonce) == expected
+            # still the read-only views on the file, nothing was copied
+            assert not any(line.array.flags.writeable for line in data.lines)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    test_memmap()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import array
+
+import testcommon
+
+import backtrader as bt
+
+
+class NpStrategy(bt.Strategy):
+    def __init__(self):
+        self.sma = bt.ind.SMA(self.data, period=15)
+        self.values = []
+
+    def next(self):
+        self.values.append((self.data.close[0], self.data.close[-1],
+                            self.sma[0], self.broker.getvalue()))
+        if self.data.close[0] > self.sma[0]:
+            self.buy()
+        elif self.position:
+            self.close()
+
+
+def test_npbuffers():
+    # the numpy storage gives the values (and types) of array.array
+    for runonce in (True, False):
+        results = []
+        for npbuffers in (False, True):
+            cerebro = bt.Cerebro(runonce=runonce, npbuffers=npbuffers)
+            cerebro.adddata(testcommon.getdata())
+            cerebro.addstrategy(NpStrategy)
+            results.append(cerebro.run()[0].values)
+
+        assert results[0] == results[1]
+        assert all(type(x) is float for row in results[1] for x in row)
+
+
+def test_replaced_storage():
+    # indicators (like talib) may replace the storage with an array.array
+    bt.LineBuffer.usenumpy(True)
+    try:
+        line = bt.LineBuffer()
+        line.forward(1.0)
+    finally:
+        bt.LineBuffer.usenumpy(False)
+
+    assert type(line[0]) is float
+    line.array = array.array(str('d'), [2.0])
+    assert line[0] == 2.0 and line.getzeroval() == 2.0
+
+
+if __name__ == '__main__':
+    test_npbuffers()
+    test_replaced_storage()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+
+
+class LookbackStrategy(bt.Strategy):
+    params = (('lookback', 50),)
+
+    def __init__(self):
+        self.sma = bt.ind.SMA(self.data, period=20)
+        self.values = []
+
+    def next(self):
+        if len(self) > self.p.lookback:
+            self.values.append((self.sma[0],
+                                self.data.close[-self.p.lookback]))
+
+
+class TickStrategy(bt.Strategy):
+    def __init__(self):
+        self.values = []
+
+    def next(self):
+        self.values.append(tuple(data.tick_close for data in self.datas))
+
+
+def runblocks(strategy=LookbackStrategy, ndatas=1, **kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    for i in range(ndatas):
+        cerebro.adddata(testcommon.getdata(i))
+    cerebro.addstrategy(strategy)
+    return cerebro.run()[0].values
+
+
+def test_onceblock():
+    expected = runblocks()
+    assert runblocks(onceblock=100, oncelookback=50) == expected
+    assert runblocks(onceblock=100, oncelookback=50,
+                     npbuffers=True) == expected
+
+
+def test_onceblock_ticks():
+    # the last bar of each block has the ticks of the bar too
+    expected = runblocks(TickStrategy, ndatas=2)
+    assert runblocks(TickStrategy, ndatas=2, onceblock=100) == expected
+
+
+def test_onceblock_lookback():
+    # looking back further than kept fails instead of wrapping around
+    try:
+        runblocks(onceblock=100)
+    except IndexError:
+        pass
+    else:
+        assert False, 'IndexError not raised'
+
+
+if __name__ == '__main__':
+    test_onceblock()
+    test_onceblock_ticks()
+    test_onceblock_lookback()
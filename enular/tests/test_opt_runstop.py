@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+
+STOPBAR = 100
+
+
+class BarCount(bt.Analyzer):
+    def start(self):
+        self.bars = 0
+
+    def next(self):
+        self.bars += 1
+
+    def get_analysis(self):
+        return dict(bars=self.bars)
+
+
+class StopStrategy(bt.Strategy):
+    params = (('p1', 0), ('p2', 0),)
+
+    def next(self):
+        # a single combination ends its own run early
+        if (self.p.p1, self.p.p2) == (1, 1) and len(self) == STOPBAR:
+            self.env.runstop()
+
+
+def runopt(optcb=None, **kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.adddata(testcommon.getdata())
+    cerebro.addanalyzer(BarCount, _name='bars')
+    cerebro.optstrategy(StopStrategy, p1=range(4), p2=range(4))
+    if optcb is not None:
+        cerebro.optcallback(lambda runstrat: optcb(cerebro, runstrat))
+    results = cerebro.run()
+    return dict(((r[0].p.p1, r[0].p.p2), r[0].analysis['bars']['bars'])
+                for r in results)
+
+
+def checkbars(bars, nruns=16):
+    assert len(bars) == nruns
+    full = bars[0, 0]
+    assert full > STOPBAR
+    for key, nbars in bars.items():
+        assert nbars == (STOPBAR if key == (1, 1) else full)
+
+
+def test_runstop_pool():
+    # the subprocesses run the next combinations after a runstop
+    checkbars(runopt(maxcpus=2, optanalysis=True, optchunk=4))
+
+
+def test_runstop():
+    # in a single process too
+    checkbars(runopt(maxcpus=1, optanalysis=True))
+
+
+def test_runstop_halving():
+    # the rounds go on and rank the stopped run last
+    optrank = bt.OptRank(BarCount, key='bars')
+    bars = runopt(maxcpus=1, optanalysis=True, optrank=optrank,
+                  opthalving=2, optfraction=0.25)
+    checkbars(bars, nruns=4)
+
+
+def test_cancel():
+    # a runstop outside of the runs ends the optimization
+    def optcb(cerebro, runstrat):
+        if len(cerebro.runstrats) == 3:
+            cerebro.runstop()
+
+    assert len(runopt(optcb, maxcpus=1, optanalysis=True)) == 3
+
+
+if __name__ == '__main__':
+    test_runstop_pool()
+    test_runstop()
+    test_runstop_halving()
+    test_cancel()
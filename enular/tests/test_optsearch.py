@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+
+
+class SearchStrategy(bt.Strategy):
+    params = (('p1', 10), ('p2', 0.5),)
+
+    def __init__(self):
+        self.sma = bt.ind.SMA(self.data, period=self.p.p1)
+
+    def next(self):
+        if self.data.close[0] > self.sma[0] * (1.0 + self.p.p2 / 100.0):
+            self.buy()
+        elif self.position:
+            self.close()
+
+
+def runsearch(search):
+    cerebro = bt.Cerebro(maxcpus=1, optsearch=search,
+                         optrank=bt.analyzers.Returns)
+    cerebro.adddata(testcommon.getdata())
+    cerebro.optstrategy(SearchStrategy, p1=bt.OptInt(5, 30),
+                        p2=[0.0, 0.5, 1.0])
+    return cerebro.run()
+
+
+def test_searches():
+    # the base class samples uniformly like RandomSearch
+    for search in (bt.OptSearch(budget=8, seed=1),
+                   bt.RandomSearch(budget=8, seed=1),
+                   bt.TPESearch(budget=8, seed=1, startup=4)):
+        results = runsearch(search)
+        params = set((r[0].p.p1, r[0].p.p2) for r in results)
+        assert len(results) == len(params) == 8, type(search).__name__
+        for p1, p2 in params:
+            assert 5 <= p1 <= 30 and p2 in (0.0, 0.5, 1.0)
+
+
+if __name__ == '__main__':
+    test_searches()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+
+
+class SelfLag(bt.Indicator):
+    # reads its own (not delivered) line back as far as its minimum period
+    lines = ('out', 'lag',)
+    params = (('period', 10),)
+
+    def __init__(self):
+        self.addminperiod(self.p.period)
+
+    def next(self):
+        lag = self.data[0]
+        if len(self) >= 2 * self.p.period:
+            lag += 0.5 * self.lines.lag[-self.p.period]
+
+        self.lines.lag[0] = lag
+        self.lines.out[0] = lag - self.data[0]
+
+
+class Outer(bt.Indicator):
+    lines = ('out',)
+
+    def __init__(self):
+        unused = bt.ind.SMA(self.data, period=30)  # pruned
+        self.lines.out = SelfLag(self.data).out * 1.0
+
+
+class PruneStrategy(bt.Strategy):
+    def __init__(self):
+        self.outer = Outer(self.data)
+        self.values = []
+
+    def next(self):
+        self.values.append(self.outer[0])
+
+
+def runprune(**kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.adddata(testcommon.getdata())
+    cerebro.addstrategy(PruneStrategy)
+    return cerebro.run()[0].values
+
+
+def test_prune():
+    for runonce in (True, False):  # next: lines read only by SelfLag bound
+        expected = runprune(runonce=runonce)
+        assert runprune(runonce=runonce, prune=True) == expected
+
+
+if __name__ == '__main__':
+    test_prune()
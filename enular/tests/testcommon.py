@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2020 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os.path
+import sys
+
+modpath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(modpath, '..'))  # backtrader, indicators
+
+import backtrader as bt
+
+DATAFILES = [
+    os.path.join(modpath, '..', '..', 'temp', name)
+    for name in ('AAPL.csv', 'TSLA.csv', 'AMZN.csv')
+]
+
+
+def getdata(index=0, **kwargs):
+    return bt.feeds.YahooFinanceCSVData(dataname=DATAFILES[index], **kwargs)
+
+
+def runmodes(strategy, index=0, **kwargs):
+    '''Runs strategy with the data in runonce and in next mode. Returns the
+    pair of (strategy, broker value) results'''
+    results = []
+    for runonce in (True, False):
+        cerebro = bt.Cerebro(runonce=runonce, **kwargs)
+        cerebro.adddata(getdata(index))
+        cerebro.addstrategy(strategy)
+        strat = cerebro.run()[0]
+        results.append((strat, cerebro.broker.getvalue()))
+
+    return results
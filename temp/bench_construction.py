@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+import backtrader as bt
+
+# Cost of creating an indicator (in the __init__ of a strategy), which is paid
+# again for each run of an optimization
+#
+#   python bench_construction.py [count]
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'AAPL.csv')
+
+KINDS = [
+    ('SMA', lambda d: bt.ind.SMA(d, period=20)),
+    ('EMA', lambda d: bt.ind.EMA(d, period=20)),
+    ('RSI', lambda d: bt.ind.RSI(d, period=14)),
+    ('MACD', lambda d: bt.ind.MACD(d)),
+    ('BBands', lambda d: bt.ind.BollingerBands(d, period=20)),
+    ('operation', lambda d: (d.close - d.open) / d.high),
+]
+
+
+class Construction(bt.Strategy):
+    params = (('make', None), ('count', 500),)
+
+    def __init__(self):
+        t0 = time.perf_counter()
+        for i in range(self.p.count):
+            self.p.make(self.data)
+        self.elapsed = (time.perf_counter() - t0) / self.p.count
+
+
+def construction(make, count):
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.YahooFinanceCSVData(dataname=DATA))
+    cerebro.addstrategy(Construction, make=make, count=count)
+    return cerebro.run()[0].elapsed
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for name, make in KINDS:
+        best = min(construction(make, count) for i in range(5))
+        print('%-10s %8.1f us per indicator' % (name, best * 1e6))